@@ -0,0 +1,331 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import ast
+import hashlib
+import io
+import json
+import os
+import sys
+
+from contextlib import contextmanager
+
+from KicadModTree.FileHandler import FileHandler
+from KicadModTree.util.file_util import replaceFile
+
+
+# directory of the build cache, the cache is disabled when this environment variable is not set
+BUILD_CACHE_ENV = 'KICADMODTREE_BUILD_CACHE'
+
+# python sources inside this directory are part of the cache key (KicadModTree as well as scripts/...)
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# directories (relative to REPOSITORY_DIR) whose python files are always part of the cache key, because every
+# generator may use them
+SHARED_SOURCE_DIRS = ['KicadModTree', os.path.join('scripts', 'tools')]
+
+
+def _hashValue(hasher, value):
+    # feed a (nested) value into the hasher, independent of the order of dict keys
+    if isinstance(value, dict):
+        hasher.update(b'{')
+        for key in sorted(value, key=repr):
+            _hashValue(hasher, key)
+            _hashValue(hasher, value[key])
+        hasher.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b'[')
+        for item in value:
+            _hashValue(hasher, item)
+        hasher.update(b']')
+    else:
+        hasher.update(type(value).__name__.encode('utf-8'))
+        hasher.update(repr(value).encode('utf-8'))
+    hasher.update(b';')
+
+
+def _hashFile(path):
+    hasher = hashlib.sha256()
+    with io.open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _findModule(name, search_paths):
+    # file of the module with the given (dotted) name, or None if it is not found in one of the directories
+    relative_path = name.replace('.', os.sep)
+    for directory in search_paths:
+        for path in (os.path.join(directory, relative_path + '.py'),
+                     os.path.join(directory, relative_path, '__init__.py')):
+            if os.path.isfile(path):
+                return os.path.abspath(path)
+    return None
+
+
+def _getImportedFiles(path):
+    r"""Files of all modules imported by a python file, including imports inside of functions
+
+    The modules are searched next to the file first (like the implicit relative imports of python2) and in sys.path
+    afterwards. Names which can not be resolved, like modules of the standard library, are ignored.
+    """
+
+    try:
+        with io.open(path, 'rb') as f:
+            tree = ast.parse(f.read(), path)
+    except (SyntaxError, ValueError):
+        # for example a python3 script which is hashed by python2, its own content is still part of the hash
+        return []
+
+    directory = os.path.dirname(path)
+    search_paths = [directory] + [os.path.abspath(p or os.curdir) for p in sys.path]
+
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend((alias.name, search_paths) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base_paths = [directory]
+                for _ in range(node.level - 1):
+                    base_paths = [os.path.dirname(base_paths[0])]
+            else:
+                base_paths = search_paths
+
+            module = node.module or ''
+            if module:
+                names.append((module, base_paths))
+            # the imported names can be submodules as well
+            names.extend(((module + '.' if module else '') + alias.name, base_paths) for alias in node.names)
+
+    files = []
+    for name, paths in names:
+        module_path = _findModule(name, paths)
+        if module_path is not None:
+            files.append(module_path)
+    return files
+
+
+def getSourceFiles(main_file=None, repository_dir=REPOSITORY_DIR):
+    r"""All python files inside the repository a generator depends on
+
+    These are all files of the shared directories (KicadModTree and ``scripts/tools``), the generator script and
+    everything it imports from the repository, recursively. The imports are found by parsing the files, so helpers
+    which are only imported when a function is called are included as well. Modules which are already loaded from the
+    repository are added, too.
+
+    :param main_file: the generator script (default: the file of the ``__main__`` module)
+    :param repository_dir: only files inside this directory are returned
+    :return: sorted list of absolute paths
+    """
+
+    repository_dir = os.path.abspath(repository_dir)
+
+    def isInRepository(path):
+        return path.startswith(repository_dir + os.sep) and os.path.isfile(path)
+
+    files = set()
+    for source_dir in SHARED_SOURCE_DIRS:
+        for directory, dirs, filenames in os.walk(os.path.join(repository_dir, source_dir)):
+            dirs[:] = sorted(d for d in dirs if d not in ('tests', '__pycache__'))
+            files.update(os.path.join(directory, f) for f in filenames if f.endswith('.py'))
+
+    pending = []
+    if main_file is None:
+        main_file = getattr(sys.modules.get('__main__'), '__file__', None)
+    if main_file:
+        pending.append(os.path.abspath(main_file))
+
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None)
+        if not path:
+            continue
+
+        path = os.path.abspath(path)
+        if path.endswith(('.pyc', '.pyo')) and os.path.isfile(path[:-1]):
+            path = path[:-1]
+        if path.endswith('.py'):
+            pending.append(path)
+
+    # the shared files are complete already, their imports do not need to be followed
+    visited = set(files)
+    while pending:
+        path = pending.pop()
+        if path in visited or not isInRepository(path):
+            continue
+
+        visited.add(path)
+        files.add(path)
+        pending.extend(_getImportedFiles(path))
+
+    return sorted(files)
+
+
+_source_hash = None
+
+
+def getSourceHash():
+    r"""Hash of all python sources in the repository the running generator depends on (see ``getSourceFiles``)
+
+    The hash is only calculated once per process.
+    """
+
+    global _source_hash
+    if _source_hash is None:
+        hasher = hashlib.sha256()
+        for path in getSourceFiles():
+            hasher.update(os.path.relpath(path, REPOSITORY_DIR).encode('utf-8'))
+            hasher.update(_hashFile(path).encode('utf-8'))
+        _source_hash = hasher.hexdigest()
+
+    return _source_hash
+
+
+class BuildCache(object):
+    r"""Skip the generation of footprints whose inputs did not change since the last run
+
+    The key of a footprint is a hash of the python sources (script, helpers and KicadModTree), the given dependencies
+    (like configuration dicts or files) and the parameters of the footprint. For every key, the files written while
+    generating the footprint are stored together with their content hash. When the key is found again and all files are
+    still unchanged on disk, the footprint does not need to be built again.
+
+    :param cache_dir:
+        directory which holds the cache entries. When not given, the ``KICADMODTREE_BUILD_CACHE`` environment
+        variable is used, and the cache is disabled when it is not set either.
+    :type cache_dir: ``str``
+    :param dependencies:
+        values which influence all footprints of the script, like the loaded configuration
+    :param dependency_files:
+        files which influence all footprints of the script, like yaml files which are loaded later
+    :type dependency_files: ``list(str)``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> build_cache = BuildCache(dependencies=[configuration], dependency_files=['../ipc_definitions.yaml'])
+    >>> for name, params in definitions.items():
+    ...     key = build_cache.getKey(name, params)
+    ...     if build_cache.isUpToDate(key):
+    ...         continue
+    ...     with build_cache.record(key):
+    ...         create_footprint(name, params)
+    """
+
+    def __init__(self, cache_dir=None, dependencies=None, dependency_files=None):
+        if cache_dir is None:
+            cache_dir = os.environ.get(BUILD_CACHE_ENV) or None
+
+        self.cache_dir = cache_dir
+        self.dependencies = dependencies
+        self.dependency_files = dependency_files or []
+
+        self._base_hash = None
+
+    @property
+    def enabled(self):
+        return self.cache_dir is not None
+
+    def _getBaseHash(self):
+        if self._base_hash is None:
+            hasher = hashlib.sha256()
+            hasher.update(getSourceHash().encode('utf-8'))
+            _hashValue(hasher, self.dependencies)
+            for path in self.dependency_files:
+                hasher.update(_hashFile(path).encode('utf-8'))
+            self._base_hash = hasher.hexdigest()
+
+        return self._base_hash
+
+    def getKey(self, *parameters):
+        r"""Get the cache key of a single footprint
+
+        :param parameters: everything which describes the footprint (dicts, lists and primitive values)
+        :return: key as hex string, or None if the cache is disabled
+        """
+
+        if not self.enabled:
+            return None
+
+        hasher = hashlib.sha256()
+        hasher.update(self._getBaseHash().encode('utf-8'))
+        _hashValue(hasher, parameters)
+        return hasher.hexdigest()
+
+    def _getEntryPath(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    def isUpToDate(self, key):
+        r"""Check if the footprint with this key was already generated, and its files are still untouched
+
+        :param key: key returned by ``getKey``
+        """
+
+        if key is None:
+            return False
+
+        try:
+            with io.open(self._getEntryPath(key), 'r') as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return False
+
+        for path, file_hash in entry['files'].items():
+            try:
+                if os.path.getsize(path) != entry['sizes'][path] or _hashFile(path) != file_hash:
+                    return False
+            except (IOError, OSError, KeyError):
+                return False
+
+        return True
+
+    @contextmanager
+    def record(self, key):
+        r"""Record all files which are written inside the ``with`` block, and store them as cache entry for the key
+
+        Nothing is stored when the block raises an exception.
+
+        :param key: key returned by ``getKey``
+        """
+
+        if key is None:
+            yield
+            return
+
+        with FileHandler.recordWrittenFiles() as written_files:
+            yield
+
+        if not written_files:
+            # the generator skipped this footprint, so there is nothing to compare with in the next run
+            return
+
+        entry = {'files': {}, 'sizes': {}}
+        for path in written_files:
+            entry['files'][path] = _hashFile(path)
+            entry['sizes'][path] = os.path.getsize(path)
+
+        entry_path = self._getEntryPath(key)
+        if not os.path.isdir(os.path.dirname(entry_path)):
+            try:
+                os.makedirs(os.path.dirname(entry_path))
+            except OSError:
+                # another process created it in the meantime
+                pass
+
+        # write to a temporary file first, so parallel builds never see incomplete entries
+        temporary_path = "{}.{}.tmp".format(entry_path, os.getpid())
+        with io.open(temporary_path, 'wb') as f:
+            f.write(json.dumps(entry, sort_keys=True).encode('utf-8'))
+
+        replaceFile(temporary_path, entry_path)
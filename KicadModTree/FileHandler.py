@@ -13,8 +13,57 @@
 #
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
-import sys
+import hashlib
 import io
+import os
+
+from contextlib import contextmanager
+
+from KicadModTree.util.file_util import replaceFile
+
+
+# when this environment variable is set, the path of every written file is appended to the file it points to
+WRITTEN_FILES_LOG_ENV = 'KICADMODTREE_WRITTEN_FILES_LOG'
+
+# enables the deterministic mode when FileHandler.deterministic is not set, see FileHandler.getDeterministicMode
+DETERMINISTIC_ENV = 'KICADMODTREE_DETERMINISTIC'
+
+# deterministic mode which derives the timestamp from the content of the file
+DETERMINISTIC_CONTENT = 'content'
+
+
+class EncodingWriter(object):
+    r"""File like object which encodes the written text as utf-8, and passes it chunk by chunk to a function
+
+    Serializers write a lot of very small strings, which are collected and encoded together.
+
+    :param output: function which is called with every encoded chunk, like the ``write`` method of a binary file
+    """
+
+    # number of written strings which are collected before they are passed on
+    CHUNK_SIZE = 4096
+
+    def __init__(self, output):
+        self.output = output
+        self.size = 0
+        self._buffer = []
+
+    def write(self, text):
+        self._buffer.append(text)
+        if len(self._buffer) >= EncodingWriter.CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        chunk = "".join(self._buffer)
+        self._buffer = []
+        if not isinstance(chunk, bytes):
+            chunk = chunk.encode('utf-8')
+
+        self.size += len(chunk)
+        self.output(chunk)
 
 
 class FileHandler(object):
@@ -32,12 +81,65 @@ class FileHandler(object):
     >>> file_handler.writeFile('example_footprint.kicad_mod')
     """
 
+    # lists which receive the path of every file written by writeFile, see recordWrittenFiles
+    _written_files_recorders = []
+
+    # deterministic mode of all file handlers: None, DETERMINISTIC_CONTENT or a fixed timestamp
+    deterministic = None
+
     def __init__(self, kicad_mod):
         self.kicad_mod = kicad_mod
 
+    @classmethod
+    def getDeterministicMode(cls):
+        r"""Get the timestamp which should be written into files, when the caller does not give one
+
+        The mode is taken from ``FileHandler.deterministic``, or the ``KICADMODTREE_DETERMINISTIC`` environment variable
+        if it is not set. ``content`` derives the timestamp from the content of the file, so regenerating an unchanged
+        footprint results in an identical file. A number is used as fixed timestamp for all files.
+
+        :return: None (use the current time), ``DETERMINISTIC_CONTENT`` or the fixed timestamp as ``int``
+        """
+
+        mode = cls.deterministic
+        if mode is None:
+            mode = os.environ.get(DETERMINISTIC_ENV) or None
+
+        if mode is None or mode == DETERMINISTIC_CONTENT:
+            return mode
+
+        try:
+            return int(mode)
+        except ValueError:
+            raise ValueError("invalid deterministic mode {!r}, expected '{}' or a timestamp"
+                             .format(mode, DETERMINISTIC_CONTENT))
+
+    @staticmethod
+    @contextmanager
+    def recordWrittenFiles():
+        r"""Collect the paths of all files written by any FileHandler inside the ``with`` block
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> with FileHandler.recordWrittenFiles() as written_files:
+        ...     KicadFileHandler(Footprint("example_footprint")).writeFile('example_footprint.kicad_mod')
+        >>> print(written_files)
+        """
+
+        written_files = []
+        FileHandler._written_files_recorders.append(written_files)
+        try:
+            yield written_files
+        finally:
+            FileHandler._written_files_recorders.remove(written_files)
+
     def writeFile(self, filename, **kwargs):
         r"""Write the output of FileHandler.serialize to a file
 
+        The output is streamed into a temporary file next to the destination, which only replaces the file when the
+        content changed. A file with exactly the same content is not touched.
+
         :param filename:
             path of the output file
         :type filename: ``str``
@@ -50,16 +152,98 @@ class FileHandler(object):
         >>> file_handler.writeFile('example_footprint.kicad_mod')
         """
 
-        with io.open(filename, "w", newline='\n') as f:
-            output = self.serialize(**kwargs)
+        temporary_path = "{}.{}.tmp".format(filename, os.getpid())
+        try:
+            content_hash = hashlib.sha256()
+            with io.open(temporary_path, "wb") as f:
+                def output(chunk):
+                    f.write(chunk)
+                    content_hash.update(chunk)
+
+                writer = EncodingWriter(output)
+                self.writeStream(writer, **kwargs)
+                writer.flush()
+
+            if FileHandler._hasContent(filename, writer.size, content_hash.digest()):
+                os.remove(temporary_path)
+            else:
+                replaceFile(temporary_path, filename)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        for written_files in FileHandler._written_files_recorders:
+            written_files.append(os.path.abspath(filename))
+
+        written_files_log = os.environ.get(WRITTEN_FILES_LOG_ENV)
+        if written_files_log:
+            with io.open(written_files_log, "a") as log:
+                log.write(u"{}\n".format(os.path.abspath(filename)))
+
+    @staticmethod
+    def _hasContent(filename, size, digest):
+        # the size is checked first, so changed files are usually detected without reading them
+        try:
+            if os.path.getsize(filename) != size:
+                return False
 
-            # convert to unicode if running python2
-            if sys.version_info[0] == 2 and type(output) != unicode:
-                output = unicode(output, "utf-8")
+            content_hash = hashlib.sha256()
+            with io.open(filename, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b''):
+                    content_hash.update(chunk)
+            return content_hash.digest() == digest
+        except (IOError, OSError):
+            return False
 
-            f.write(output)
+    def writeStream(self, stream, **kwargs):
+        r"""Write the output of FileHandler.serialize into a file like object
+
+        Implementations can override this method to write their output without building the whole string first
+
+        :param stream:
+            object with a ``write`` method, for example an opened text file
+        :type stream: ``io.TextIOBase``
+
+        :Example:
+
+        >>> import io
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = KicadFileHandler(kicad_mod)  # KicadFileHandler is a implementation of FileHandler
+        >>> stream = io.StringIO()
+        >>> file_handler.writeStream(stream)
+        """
+
+        stream.write(self.serialize(**kwargs))
+
+    @classmethod
+    def readFile(cls, filename):
+        r"""Create a footprint from a file, using FileHandler.deserialize
+
+        :param filename:
+            path of the input file
+        :type filename: ``str``
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = KicadFileHandler.readFile('example_footprint.kicad_mod')
+        """
+
+        with io.open(filename, "r", encoding='utf-8') as f:
+            return cls.deserialize(f.read())
+
+    @classmethod
+    def deserialize(cls, content):
+        r"""Create a footprint from its string representation in the specified format
+
+        :param content:
+            content of a footprint file
+        :type content: ``str``
+        """
 
-            f.close()
+        raise NotImplementedError("deserialize has to be implemented by child class")
 
     def serialize(self, **kwargs):
         r"""Get a valid string representation of the footprint in the specified format
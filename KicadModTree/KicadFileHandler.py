@@ -13,13 +13,19 @@
 #
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
-from KicadModTree.FileHandler import FileHandler
+import hashlib
+
+from KicadModTree.FileHandler import FileHandler, EncodingWriter, DETERMINISTIC_CONTENT
+from KicadModTree.Vector import Vector2D
 from KicadModTree.util.kicad_util import *
 from KicadModTree.nodes.base.Pad import Pad  # TODO: why .KicadModTree is not enough?
 from KicadModTree.nodes.base.Arc import Arc
 from KicadModTree.nodes.base.Circle import Circle
 from KicadModTree.nodes.base.Line import Line
 from KicadModTree.nodes.base.Polygon import Polygon
+from KicadModTree.nodes.base.Text import Text
+from KicadModTree.nodes.base.Model import Model
+from KicadModTree.nodes.Footprint import Footprint
 
 
 DEFAULT_LAYER_WIDTH = {'F.SilkS': 0.12,
@@ -41,6 +47,28 @@ def _get_layer_width(layer, width=None):
         return DEFAULT_LAYER_WIDTH.get(layer, DEFAULT_WIDTH)
 
 
+def _get_attributes(sexpr):
+    # map the name of every sub list to its values, the first occurrence wins
+    attributes = {}
+    for item in sexpr:
+        if type(item) is list and item and item[0] not in attributes:
+            attributes[item[0]] = item[1:]
+    return attributes
+
+
+def _get_floats(values, count=2):
+    return [float(value) for value in values[:count]]
+
+
+def _get_style(attributes):
+    style = {}
+    if 'layer' in attributes:
+        style['layer'] = attributes['layer'][0]
+    if 'width' in attributes:
+        style['width'] = float(attributes['width'][0])
+    return style
+
+
 class KicadFileHandler(FileHandler):
     r"""Implementation of the FileHandler for .kicad_mod files
 
@@ -70,9 +98,63 @@ class KicadFileHandler(FileHandler):
         >>> print(file_handler.serialize())
         """
 
+        tokens = []
+        self.writeStream(tokens, **kwargs)
+        return "".join(tokens)
+
+    def writeStream(self, stream, **kwargs):
+        r"""Write the .kicad_mod representation of the footprint into a file like object
+
+        The tokens are written directly into the stream, without building the whole file as string first.
+
+        :Example:
+
+        >>> import io
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = KicadFileHandler(kicad_mod)
+        >>> stream = io.StringIO()
+        >>> file_handler.writeStream(stream)
+        """
+
+        timestamp = kwargs.get('timestamp')
+        if timestamp is None:
+            timestamp = self.getDeterministicMode()
+
+        serializer = SexprSerializer(self._serializeModule(timestamp))
+        if timestamp != DETERMINISTIC_CONTENT:
+            serializer.write(stream)
+            return
+
+        # the file is serialized once with a zero timestamp, which is replaced by the hash of this content afterwards.
+        # So the timestamp only changes when the footprint changes.
+        tokens = []
+        serializer.write(tokens)
+
+        content_hash = hashlib.sha256()
+        writer = EncodingWriter(content_hash.update)
+        for token in tokens:
+            writer.write(token)
+        writer.flush()
+
+        tokens[self._getTimestampTokenIndex(serializer)] = formatTimestamp(int(content_hash.hexdigest()[:8], 16))
+
+        write = SexprSerializer.getWriter(stream)
+        for token in tokens:
+            write(token)
+
+    @staticmethod
+    def _getTimestampTokenIndex(serializer):
+        # the timestamp is the last value of the header, which is only followed by the end of the tedit and the
+        # module list when serialized on its own
+        header_tokens = []
+        serializer.write_sexpr(header_tokens.append, serializer.sexpr[:4])
+        return len(header_tokens) - 3
+
+    def _serializeModule(self, timestamp):
         sexpr = ['module', self.kicad_mod.name,
                  ['layer', 'F.Cu'],
-                 ['tedit', formatTimestamp(kwargs.get('timestamp'))],
+                 ['tedit', formatTimestamp(timestamp) if timestamp != DETERMINISTIC_CONTENT else '0'],
                  SexprSerializer.NEW_LINE
                 ]  # NOQA
 
@@ -102,21 +184,19 @@ class KicadFileHandler(FileHandler):
 
         sexpr.extend(self._serializeTree())
 
-        return str(SexprSerializer(sexpr))
+        return sexpr
 
     def _serializeTree(self):
-        nodes = self.kicad_mod.serialize()
-
         grouped_nodes = {}
 
-        for single_node in nodes:
+        for single_node in self.kicad_mod.iterNodes():
             node_type = single_node.__class__.__name__
 
-            current_nodes = grouped_nodes.get(node_type, [])
+            current_nodes = grouped_nodes.get(node_type)
+            if current_nodes is None:
+                current_nodes = grouped_nodes[node_type] = []
             current_nodes.append(single_node)
 
-            grouped_nodes[node_type] = current_nodes
-
         sexpr = []
 
         # serialize initial text nodes
@@ -266,19 +346,16 @@ class KicadFileHandler(FileHandler):
         return sexpr
 
     def _serialize_CustomPadPrimitives(self, pad):
-        all_primitives = []
-        for p in pad.primitives:
-            all_primitives.extend(p.serialize())
-
         grouped_nodes = {}
 
-        for single_node in all_primitives:
-            node_type = single_node.__class__.__name__
-
-            current_nodes = grouped_nodes.get(node_type, [])
-            current_nodes.append(single_node)
+        for p in pad.primitives:
+            for single_node in p.iterNodes():
+                node_type = single_node.__class__.__name__
 
-            grouped_nodes[node_type] = current_nodes
+                current_nodes = grouped_nodes.get(node_type)
+                if current_nodes is None:
+                    current_nodes = grouped_nodes[node_type] = []
+                current_nodes.append(single_node)
 
         sexpr_primitives = []
 
@@ -355,13 +432,12 @@ class KicadFileHandler(FileHandler):
         if newline_after_pts:
             node_points.append(SexprSerializer.NEW_LINE)
         points_appended = 0
-        for n in node.nodes:
+        for n_pos in node.getRealPositions(node.nodes):
             if points_appended >= 4:
                 points_appended = 0
                 node_points.append(SexprSerializer.NEW_LINE)
             points_appended += 1
 
-            n_pos = node.getRealPosition(n)
             node_points.append(['xy', n_pos.x, n_pos.y])
 
         return node_points
@@ -376,3 +452,147 @@ class KicadFileHandler(FileHandler):
                 ]  # NOQA
 
         return sexpr
+
+    @classmethod
+    def deserialize(cls, content):
+        r"""Create a footprint from a string in the .kicad_mod format
+
+        All base nodes (``Pad``, ``Line``, ``Arc``, ``Circle``, ``Polygon``, ``Text`` and ``Model``) are added directly
+        to the returned footprint. Tokens which cannot be represented by KicadModTree are ignored.
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = KicadFileHandler.deserialize('(module example_footprint (layer F.Cu) (tedit 0))')
+        """
+
+        sexpr = parseLispString(content)
+        if not sexpr or sexpr[0] not in ('module', 'footprint'):
+            raise ValueError("content is not a KiCad footprint")
+
+        kicad_mod = Footprint(sexpr[1])
+
+        for item in sexpr[2:]:
+            if type(item) is not list or not item:
+                continue
+
+            token, values = item[0], item[1:]
+            if token == 'descr':
+                kicad_mod.setDescription(values[0])
+            elif token == 'tags':
+                kicad_mod.setTags(values[0])
+            elif token == 'attr':
+                kicad_mod.setAttribute(values[0])
+            elif token == 'solder_mask_margin':
+                kicad_mod.setMaskMargin(float(values[0]))
+            elif token == 'solder_paste_margin':
+                kicad_mod.setPasteMargin(float(values[0]))
+            elif token == 'solder_paste_ratio':
+                kicad_mod.setPasteMarginRatio(float(values[0]))
+            else:
+                deserialize_method = getattr(cls, "_deserialize_{}".format(token), None)
+                if deserialize_method is not None:
+                    kicad_mod.append(deserialize_method(item))
+
+        return kicad_mod
+
+    @classmethod
+    def _deserialize_fp_arc(cls, sexpr):
+        # in KiCAD, some file attributes of Arc are named not in the way of their real meaning
+        attributes = _get_attributes(sexpr)
+        return Arc(center=_get_floats(attributes['start']), start=_get_floats(attributes['end']),
+                   angle=float(attributes['angle'][0]), **_get_style(attributes))
+
+    @classmethod
+    def _deserialize_fp_circle(cls, sexpr):
+        attributes = _get_attributes(sexpr)
+        center = Vector2D(_get_floats(attributes['center']))
+        end = Vector2D(_get_floats(attributes['end']))
+        return Circle(center=center, radius=center.distance_to(end), **_get_style(attributes))
+
+    @classmethod
+    def _deserialize_fp_line(cls, sexpr):
+        attributes = _get_attributes(sexpr)
+        return Line(start=_get_floats(attributes['start']), end=_get_floats(attributes['end']),
+                    **_get_style(attributes))
+
+    @classmethod
+    def _deserialize_fp_poly(cls, sexpr):
+        attributes = _get_attributes(sexpr)
+        nodes = [_get_floats(point[1:]) for point in attributes['pts'] if type(point) is list]
+        return Polygon(nodes=nodes, **_get_style(attributes))
+
+    # primitives of custom pads are stored like the graphical items of the footprint, but without layer
+    _deserialize_gr_arc = _deserialize_fp_arc
+    _deserialize_gr_circle = _deserialize_fp_circle
+    _deserialize_gr_line = _deserialize_fp_line
+    _deserialize_gr_poly = _deserialize_fp_poly
+
+    @classmethod
+    def _deserialize_fp_text(cls, sexpr):
+        attributes = _get_attributes(sexpr)
+        effects = _get_attributes(attributes.get('effects', []))
+        font = _get_attributes(effects.get('font', []))
+
+        at = attributes['at']
+        rotation = 0
+        if len(at) > 2 and at[2] != 'unlocked':
+            rotation = float(at[2])
+
+        kwargs = {'type': sexpr[1], 'text': sexpr[2], 'at': _get_floats(at), 'rotation': rotation,
+                  'layer': attributes['layer'][0], 'hide': 'hide' in sexpr,
+                  'mirror': 'mirror' in effects.get('justify', [])}
+        if 'size' in font:
+            kwargs['size'] = _get_floats(font['size'])
+        if 'thickness' in font:
+            kwargs['thickness'] = float(font['thickness'][0])
+
+        return Text(**kwargs)
+
+    @classmethod
+    def _deserialize_model(cls, sexpr):
+        attributes = _get_attributes(sexpr)
+
+        kwargs = {'filename': sexpr[1]}
+        # KiCad 5 calls the position offset
+        for name, token in (('at', 'at'), ('at', 'offset'), ('scale', 'scale'), ('rotate', 'rotate')):
+            if token in attributes:
+                kwargs[name] = _get_floats(attributes[token][0][1:], 3)
+
+        return Model(**kwargs)
+
+    @classmethod
+    def _deserialize_pad(cls, sexpr):
+        attributes = _get_attributes(sexpr)
+
+        at = attributes['at']
+        kwargs = {'number': sexpr[1], 'type': sexpr[2], 'shape': sexpr[3],
+                  'at': _get_floats(at), 'rotation': float(at[2]) if len(at) > 2 else 0,
+                  'size': _get_floats(attributes['size']), 'layers': attributes['layers']}
+
+        if 'drill' in attributes:
+            drill = [value for value in attributes['drill'] if type(value) is not list and value != 'oval']
+            kwargs['drill'] = [float(drill[0]), float(drill[-1])]
+
+            drill_offset = _get_attributes(attributes['drill']).get('offset')
+            if drill_offset:
+                kwargs['offset'] = _get_floats(drill_offset)
+
+        if 'roundrect_rratio' in attributes:
+            kwargs['radius_ratio'] = float(attributes['roundrect_rratio'][0])
+
+        options = _get_attributes(attributes.get('options', []))
+        if 'clearance' in options:
+            kwargs['shape_in_zone'] = options['clearance'][0]
+        if 'anchor' in options:
+            kwargs['anchor_shape'] = options['anchor'][0]
+
+        if 'primitives' in attributes:
+            kwargs['primitives'] = [getattr(cls, "_deserialize_{}".format(primitive[0]))(primitive)
+                                    for primitive in attributes['primitives'] if type(primitive) is list]
+
+        for name in ('solder_mask_margin', 'solder_paste_margin_ratio', 'solder_paste_margin'):
+            if name in attributes:
+                kwargs[name] = float(attributes[name][0])
+
+        return Pad(**kwargs)
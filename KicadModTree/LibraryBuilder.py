@@ -0,0 +1,425 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import argparse
+import fnmatch
+import io
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import yaml
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # python2
+
+from KicadModTree.BuildCache import BUILD_CACHE_ENV
+from KicadModTree.FileHandler import WRITTEN_FILES_LOG_ENV, DETERMINISTIC_ENV, DETERMINISTIC_CONTENT
+from KicadModTree.util.yaml_util import CONFIG_CACHE_ENV, getConfigCacheDir
+
+
+# file extensions of footprint definition files which are passed to the generator scripts
+INPUT_FILE_EXTENSIONS = ('.yaml', '.yml', '.csv')
+
+# sub directories which only contain helper modules
+HELPER_DIRECTORIES = {'tools', 'utils', 'documentation', '__pycache__'}
+
+# file inside the scripts directory with the rules for scripts whose jobs can not be found automatically
+BUILD_RULES_FILE = 'build_rules.yaml'
+
+_IMPORT_REGEX = re.compile(r'^\s*(?:from\s+([\w.]+)\s+import|import\s+([\w., ]+))', re.MULTILINE)
+_FILES_ARGUMENT_REGEX = re.compile(r'''add_argument\(\s*['"]files['"]|ModArgparser\(''')
+
+
+class BuildJob(object):
+    r"""A single run of a generator script
+
+    :param script:
+        path of the generator script
+    :type script: ``str``
+    :param inputs:
+        definition files which are passed as arguments to the script
+    :type inputs: ``list(str)``
+    """
+
+    def __init__(self, script, inputs=None):
+        self.script = os.path.abspath(script)
+        self.inputs = [os.path.abspath(i) for i in inputs] if inputs else []
+
+    @property
+    def cwd(self):
+        # the scripts import their helpers relative to sys.path[0] and expect to be executed from their own directory
+        return os.path.dirname(self.script)
+
+    def getName(self, base_dir=None):
+        name = os.path.relpath(self.script, base_dir) if base_dir else self.script
+        if self.inputs:
+            name += ' ' + ' '.join(os.path.relpath(i, self.cwd) for i in self.inputs)
+        return name
+
+    def getCommand(self):
+        return [sys.executable, os.path.basename(self.script)] + [os.path.relpath(i, self.cwd) for i in self.inputs]
+
+
+class BuildResult(object):
+    r"""Result of a executed BuildJob
+
+    :param job: the executed job
+    :param returncode: exit code of the script, None when it was aborted by a timeout
+    :param wall_time: runtime of the script in seconds
+    :param footprints: list of all files written by the script
+    :param output: stderr output of the script
+    """
+
+    def __init__(self, job, returncode, wall_time, footprints, output):
+        self.job = job
+        self.returncode = returncode
+        self.wall_time = wall_time
+        self.footprints = footprints
+        self.output = output
+
+    @property
+    def failed(self):
+        return self.returncode != 0
+
+
+def _killProcess(process, timed_out):
+    timed_out.append(True)
+    try:
+        process.kill()
+    except OSError:
+        # the process finished in the meantime
+        pass
+
+
+def runBuildJob(job, timeout=None, env=None):
+    r"""Execute a generator script in its own directory and record which files it has written
+
+    :param job: the job to execute
+    :param timeout: abort the script after this many seconds
+    :param env: environment variables of the script (default: ``os.environ``)
+    :return: ``BuildResult``
+    """
+
+    log_fd, log_path = tempfile.mkstemp(prefix='kicadmodtree-build-', suffix='.log')
+    os.close(log_fd)
+
+    try:
+        env = dict(os.environ if env is None else env)
+        env[WRITTEN_FILES_LOG_ENV] = log_path
+
+        start_time = time.time()
+        with io.open(os.devnull, 'wb') as devnull:
+            process = subprocess.Popen(job.getCommand(), cwd=job.cwd, env=env, stdout=devnull, stderr=subprocess.PIPE)
+
+        timed_out = []
+        timer = None
+        if timeout:
+            timer = threading.Timer(timeout, _killProcess, (process, timed_out))
+            timer.start()
+        try:
+            output = process.communicate()[1].decode('utf-8', 'replace')
+        finally:
+            if timer:
+                timer.cancel()
+
+        returncode = process.returncode
+        if timed_out:
+            returncode = None
+            output = "timeout after {} seconds".format(timeout)
+        wall_time = time.time() - start_time
+
+        with io.open(log_path, 'r') as log:
+            footprints = [line.rstrip('\n') for line in log if line.strip()]
+    finally:
+        os.remove(log_path)
+
+    return BuildResult(job, returncode, wall_time, footprints, output)
+
+
+class LibraryBuilder(object):
+    r"""Find all generator scripts of a scripts directory and execute them in parallel
+
+    Every script is executed as separate process inside its own directory, like it would be done by hand. Scripts
+    which expect definition files as arguments are executed once per definition file found next to them (or inside
+    a ``size_definitions`` directory). Definition files which are referenced inside the script source (like
+    configuration files), or which share their name with another script, are not used as input.
+
+    Scripts which do not follow those conventions are configured in ``build_rules.yaml`` inside the scripts
+    directory: ``exclude`` is a list of shell patterns of scripts which are never executed, and ``jobs`` maps a
+    script to the argument lists it is executed with (relative to the directory of the script).
+
+    :param scripts_dir:
+        path of the directory containing the generator scripts
+    :type scripts_dir: ``str``
+    :param rules:
+        rules used instead of the ``build_rules.yaml`` file
+    :type rules: ``dict``
+
+    :Example:
+
+    >>> from KicadModTree.LibraryBuilder import LibraryBuilder
+    >>> builder = LibraryBuilder('scripts')
+    >>> results = builder.build(builder.findJobs(['*Connector_JST*']), jobs=4)
+    >>> builder.printSummary(results)
+    """
+
+    def __init__(self, scripts_dir, rules=None):
+        self.scripts_dir = os.path.abspath(scripts_dir)
+
+        rules_file = os.path.join(self.scripts_dir, BUILD_RULES_FILE)
+        if rules is None and os.path.isfile(rules_file):
+            with io.open(rules_file, 'r', encoding='utf-8') as f:
+                rules = yaml.safe_load(f)
+        rules = rules or {}
+
+        self.exclude = rules.get('exclude') or []
+        self.explicit_jobs = rules.get('jobs') or {}
+
+    def _findScripts(self):
+        scripts = []
+        for root, dirs, files in os.walk(self.scripts_dir):
+            dirs[:] = sorted(d for d in dirs if d not in HELPER_DIRECTORIES and not d.startswith('.'))
+            scripts.extend(os.path.join(root, f) for f in sorted(files) if f.endswith('.py') and f != '__init__.py')
+
+        sources = {}
+        imported_modules = set()
+        for script in scripts:
+            with io.open(script, 'r', encoding='utf-8', errors='replace') as f:
+                source = f.read()
+            sources[script] = source
+
+            for from_import, plain_import in _IMPORT_REGEX.findall(source):
+                for module in (from_import or plain_import).split(','):
+                    if module.strip():
+                        imported_modules.update(module.split()[0].split('.'))
+
+        # modules imported by other scripts are helpers, not generators
+        return [(s, sources[s]) for s in scripts
+                if os.path.splitext(os.path.basename(s))[0] not in imported_modules]
+
+    def _findInputs(self, script, source):
+        script_dir = os.path.dirname(script)
+        script_names = {os.path.splitext(f)[0] for f in os.listdir(script_dir) if f.endswith('.py')}
+
+        candidates = [os.path.join(script_dir, f) for f in sorted(os.listdir(script_dir))]
+        size_definitions_dir = os.path.join(script_dir, 'size_definitions')
+        for root, dirs, files in os.walk(size_definitions_dir):
+            dirs.sort()
+            candidates.extend(os.path.join(root, f) for f in sorted(files))
+
+        script_name = os.path.splitext(os.path.basename(script))[0]
+        inputs = []
+        for candidate in candidates:
+            name, extension = os.path.splitext(os.path.basename(candidate))
+            if extension not in INPUT_FILE_EXTENSIONS or not os.path.isfile(candidate):
+                continue
+
+            # definition files named like the script itself are always its inputs
+            if name == script_name:
+                return [candidate]
+
+            if name in script_names or name.startswith('test') or os.path.basename(candidate) in source:
+                continue
+
+            inputs.append(candidate)
+
+        return inputs
+
+    def findJobs(self, patterns=None):
+        r"""Find all generator scripts and their inputs
+
+        :param patterns:
+            only return jobs for scripts matching one of those shell patterns (relative to the scripts directory)
+        :return: list of ``BuildJob``
+        """
+
+        jobs = []
+        for script, source in self._findScripts():
+            relative_script = os.path.relpath(script, self.scripts_dir).replace(os.sep, '/')
+            if patterns and not any(fnmatch.fnmatch(relative_script, p) for p in patterns):
+                continue
+
+            if any(fnmatch.fnmatch(relative_script, p) for p in self.exclude):
+                continue
+
+            if relative_script in self.explicit_jobs:
+                script_dir = os.path.dirname(script)
+                for arguments in self.explicit_jobs[relative_script]:
+                    jobs.append(BuildJob(script, [os.path.join(script_dir, a) for a in arguments]))
+                continue
+
+            if not _FILES_ARGUMENT_REGEX.search(source):
+                jobs.append(BuildJob(script))
+                continue
+
+            for input_file in self._findInputs(script, source):
+                jobs.append(BuildJob(script, [input_file]))
+
+        return jobs
+
+    def build(self, build_jobs, jobs=None, timeout=None, progress=None, env=None):
+        r"""Execute all jobs in parallel
+
+        :param build_jobs: list of ``BuildJob``
+        :param jobs: number of scripts executed at the same time (default: number of cpu cores)
+        :param timeout: abort a single script after this many seconds
+        :param progress: function which is called with every ``BuildResult`` as soon as it is finished
+        :param env: environment variables of the scripts (default: ``os.environ``)
+        :return: list of ``BuildResult`` in the order of the given jobs
+        """
+
+        env = dict(os.environ if env is None else env)
+
+        # the configuration files are only parsed by the first script, the others load them from this directory
+        config_cache_dir = None
+        if getConfigCacheDir(env) is None:
+            config_cache_dir = tempfile.mkdtemp(prefix='kicadmodtree-config-')
+            env[CONFIG_CACHE_ENV] = config_cache_dir
+
+        pending_jobs = queue.Queue()
+        for job in build_jobs:
+            pending_jobs.put(job)
+        finished_jobs = queue.Queue()
+
+        def worker():
+            while True:
+                try:
+                    job = pending_jobs.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    result = runBuildJob(job, timeout, env)
+                except Exception:
+                    result = BuildResult(job, -1, 0., [], traceback.format_exc())
+                finished_jobs.put((job, result))
+
+        # the real work is done inside the script processes, the threads only wait for them
+        results = {}
+        try:
+            for i in range(min(jobs or multiprocessing.cpu_count(), len(build_jobs))):
+                thread = threading.Thread(target=worker)
+                thread.daemon = True
+                thread.start()
+
+            for i in range(len(build_jobs)):
+                job, result = finished_jobs.get()
+                results[job] = result
+                if progress:
+                    progress(result)
+        finally:
+            if config_cache_dir is not None:
+                shutil.rmtree(config_cache_dir, ignore_errors=True)
+
+        return [results[job] for job in build_jobs]
+
+    def printSummary(self, results, wall_time=None, stream=None):
+        r"""Print a summary of all results: runtime, footprint count and failures per script
+
+        :param results: list of ``BuildResult``
+        :param wall_time: wall time of the whole build
+        :param stream: output stream (default: stdout)
+        """
+
+        if stream is None:
+            stream = sys.stdout
+
+        name_width = max([len(r.job.getName(self.scripts_dir)) for r in results] + [6])
+        stream.write("{name:<{width}} {time:>9} {footprints:>10}  status\n".format(
+            name='script', width=name_width, time='time[s]', footprints='footprints'))
+
+        for result in sorted(results, key=lambda r: r.wall_time, reverse=True):
+            stream.write("{name:<{width}} {time:>9.2f} {footprints:>10}  {status}\n".format(
+                name=result.job.getName(self.scripts_dir), width=name_width, time=result.wall_time,
+                footprints=len(result.footprints), status='FAILED' if result.failed else 'ok'))
+
+        failed = [r for r in results if r.failed]
+        for result in failed:
+            stream.write("\n[!] {name} failed:\n".format(name=result.job.getName(self.scripts_dir)))
+            output_lines = result.output.strip().splitlines()
+            stream.write("\n".join("    " + line for line in output_lines[-10:]) + "\n")
+
+        stream.write("\n{jobs} jobs, {failed} failed, {footprints} footprints written, {cpu_time:.1f}s script time"
+                     .format(jobs=len(results), failed=len(failed), footprints=sum(len(r.footprints) for r in results),
+                             cpu_time=sum(r.wall_time for r in results)))
+        if wall_time is not None:
+            stream.write(", {wall_time:.1f}s wall time".format(wall_time=wall_time))
+        stream.write("\n")
+
+
+def main(argv=None):
+    r"""Entry point of ``kicadmodtree-build``
+    """
+
+    parser = argparse.ArgumentParser(description='Run all footprint generator scripts in parallel')
+    parser.add_argument('patterns', metavar='pattern', type=str, nargs='*',
+                        help='only run scripts matching one of those patterns (relative to the scripts directory)')
+    parser.add_argument('--scripts', type=str, default='scripts',
+                        help='directory which contains the generator scripts (default: scripts)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of scripts executed at the same time (default: number of cpu cores)')
+    parser.add_argument('--timeout', type=float, default=None, help='abort a single script after this many seconds')
+    parser.add_argument('--cache', type=str, default=None,
+                        help='directory of the build cache, footprints with unchanged inputs are not generated again')
+    parser.add_argument('--deterministic', action='store_true',
+                        help='derive the timestamp of the footprints from their content, '
+                             'so unchanged files stay untouched')
+    parser.add_argument('--list', action='store_true', help='only print the jobs which would be executed')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print every finished job')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.scripts):
+        parser.error("scripts directory not found: {}".format(args.scripts))
+
+    # the scripts are picking up the options from their environment
+    env = dict(os.environ)
+    if args.cache:
+        env[BUILD_CACHE_ENV] = os.path.abspath(args.cache)
+
+    if args.deterministic:
+        env[DETERMINISTIC_ENV] = DETERMINISTIC_CONTENT
+
+    builder = LibraryBuilder(args.scripts)
+    build_jobs = builder.findJobs(args.patterns)
+
+    if args.list:
+        for job in build_jobs:
+            print(job.getName(builder.scripts_dir))
+        return 0
+
+    def progress(result):
+        if args.verbose:
+            print("[{status}] {name} ({time:.2f}s)".format(status='FAILED' if result.failed else 'ok',
+                                                           name=result.job.getName(builder.scripts_dir),
+                                                           time=result.wall_time))
+
+    start_time = time.time()
+    results = builder.build(build_jobs, jobs=args.jobs, timeout=args.timeout, progress=progress, env=env)
+    builder.printSummary(results, wall_time=time.time() - start_time)
+
+    return 1 if any(r.failed for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,558 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import argparse
+import bisect
+import io
+import math
+import os
+import re
+import sys
+import time
+
+from KicadModTree.KicadFileHandler import KicadFileHandler
+from KicadModTree.nodes.base.Arc import Arc
+from KicadModTree.nodes.base.Circle import Circle
+from KicadModTree.nodes.base.Line import Line
+from KicadModTree.nodes.base.Model import Model
+from KicadModTree.nodes.base.Pad import Pad
+from KicadModTree.nodes.base.Polygon import Polygon
+from KicadModTree.nodes.base.Text import Text
+
+
+FOOTPRINT_FILE_EXTENSION = '.kicad_mod'
+
+# default tolerance for all lengths and angles, in mm and degree
+DEFAULT_TOLERANCE = 1e-3
+
+# number of added, removed or changed graphic elements which are listed per layer, the rest is only counted
+MAX_REPORTED_ELEMENTS = 20
+
+# changed elements are only paired with their most similar counterpart when there are at most this many possible
+# pairs on a layer, otherwise they are reported as removed and added
+MAX_ELEMENT_PAIRS = 100000
+
+_TIMESTAMP_REGEX = re.compile(r'\(tedit [0-9A-Fa-f]+\)')
+
+
+def _summarizeGraphic(node):
+    # (kind, width, coordinates) in the coordinate system of the footprint. The coordinates are a flat tuple of x, y
+    # pairs, so every element can be compared with the same tolerance check
+    if isinstance(node, Line):
+        start, end = node.getRealPositions([node.start_pos, node.end_pos])
+        return ('line', node.width, (start.x, start.y, end.x, end.y))
+    elif isinstance(node, Circle):
+        center = node.getRealPosition(node.center_pos)
+        # the point at the right of the center stands for the radius
+        return ('circle', node.width, (center.x, center.y, center.x + node.radius, center.y))
+    elif isinstance(node, Arc):
+        center, start = node.getRealPositions([node.center_pos, node.start_pos])
+        radius = math.hypot(start.x - center.x, start.y - center.y)
+        start_angle = math.atan2(start.y - center.y, start.x - center.x)
+        # a mirroring transformation turns the direction of the arc around
+        a, b, c, d = node.getRealTransformation()[0:4]
+        angle = math.radians(node.angle) if a*d - b*c > 0 else -math.radians(node.angle)
+        # the middle point tells the two arcs between the same end points apart
+        end_angle = start_angle + angle
+        middle_angle = start_angle + angle / 2
+        return ('arc', node.width, (center.x, center.y, start.x, start.y,
+                                    center.x + radius*math.cos(end_angle), center.y + radius*math.sin(end_angle),
+                                    center.x + radius*math.cos(middle_angle), center.y + radius*math.sin(middle_angle)))
+    else:
+        coordinates = []
+        for point in node.getRealPositions(node.nodes):
+            coordinates.extend((point.x, point.y))
+        return ('polygon', node.width, tuple(coordinates))
+
+
+def summarizeFootprint(kicad_mod):
+    r"""Extract everything which is compared by the diff from a footprint
+
+    The summary only consists of builtin types, so it can be sent between processes cheaply.
+
+    :param kicad_mod: the footprint to summarize
+    :type kicad_mod: ``KicadModTree.Footprint``
+    :return: ``dict``
+    """
+
+    summary = {
+        'attributes': {
+            'description': kicad_mod.description,
+            'tags': kicad_mod.tags,
+            'attribute': kicad_mod.attribute,
+            'solder mask margin': kicad_mod.maskMargin,
+            'solder paste margin': kicad_mod.pasteMargin,
+            'solder paste ratio': kicad_mod.pasteMarginRatio,
+        },
+        'pads': {},
+        'layers': {},
+        'texts': {},
+        'models': [],
+    }
+
+    for node in kicad_mod.iterNodes():
+        if isinstance(node, Pad):
+            at, rotation = node.getRealPosition(node.at, node.rotation)
+            summary['pads'].setdefault(str(node.number), []).append({
+                'type': node.type,
+                'shape': node.shape,
+                'at': (at.x, at.y),
+                'rotation': rotation,
+                'size': tuple(node.size),
+                'drill': tuple(node.drill) if node.drill is not None else None,
+                'layers': tuple(node.layers),
+            })
+        elif isinstance(node, Text):
+            at, rotation = node.getRealPosition(node.at, node.rotation)
+            summary['texts'].setdefault((node.type, node.text), []).append({
+                'at': (at.x, at.y),
+                'rotation': rotation,
+                'layer': node.layer,
+                'size': tuple(node.size),
+            })
+        elif isinstance(node, Model):
+            summary['models'].append((node.filename, tuple(node.at), tuple(node.scale), tuple(node.rotate)))
+        elif isinstance(node, (Line, Circle, Arc, Polygon)):
+            summary['layers'].setdefault(node.layer, []).append(_summarizeGraphic(node))
+
+    for pads in summary['pads'].values():
+        pads.sort(key=lambda pad: pad['at'])
+    for elements in summary['layers'].values():
+        elements.sort()
+
+    return summary
+
+
+def _readSummary(filename, content):
+    try:
+        return summarizeFootprint(KicadFileHandler.deserialize(content))
+    except Exception as e:
+        # the content is kept, so footprints which can not be read are still compared as text
+        return {'error': "{}: {}".format(type(e).__name__, e), 'content': _TIMESTAMP_REGEX.sub('', content)}
+
+
+def _compareFiles(arguments):
+    # executed in the worker processes
+    old_filename, new_filename, tolerance = arguments
+
+    with io.open(old_filename, 'r', encoding='utf-8') as f:
+        old_content = f.read()
+    with io.open(new_filename, 'r', encoding='utf-8') as f:
+        new_content = f.read()
+
+    # most footprints are unchanged between two runs, and do not need to be parsed at all
+    if _TIMESTAMP_REGEX.sub('', old_content) == _TIMESTAMP_REGEX.sub('', new_content):
+        return []
+
+    return compareFootprints(_readSummary(old_filename, old_content), _readSummary(new_filename, new_content),
+                             tolerance)
+
+
+def _isClose(a, b, tolerance):
+    if a is None or b is None:
+        return a is b
+    if isinstance(a, tuple):
+        return len(a) == len(b) and all(_isClose(x, y, tolerance) for x, y in zip(a, b))
+    return abs(a - b) <= tolerance
+
+
+def _formatVector(vector):
+    return "({})".format(", ".join("{:g}".format(v) for v in vector))
+
+
+def _formatValue(value):
+    if isinstance(value, tuple):
+        return _formatVector(value)
+    elif isinstance(value, float):
+        return "{:g}".format(value)
+    return value
+
+
+def _compareValues(differences, name, old, new, tolerance=None):
+    if tolerance is None:
+        equal = old == new
+    else:
+        equal = _isClose(old, new, tolerance)
+
+    if not equal:
+        differences.append("{} changed from {} to {}".format(name, _formatValue(old), _formatValue(new)))
+
+
+def _comparePads(differences, old_pads, new_pads, tolerance):
+    for number in sorted(set(old_pads) | set(new_pads)):
+        old_group = old_pads.get(number, [])
+        new_group = new_pads.get(number, [])
+
+        name = "pad {}".format(number if number else '""')
+        if len(old_group) != len(new_group):
+            differences.append("{}: count changed from {} to {}".format(name, len(old_group), len(new_group)))
+            continue
+
+        for index, (old, new) in enumerate(zip(old_group, new_group)):
+            pad_name = "{} [{}]".format(name, index + 1) if len(old_group) > 1 else name
+
+            if not _isClose(old['at'], new['at'], tolerance):
+                differences.append("{}: moved by {}".format(
+                    pad_name, _formatVector((new['at'][0] - old['at'][0], new['at'][1] - old['at'][1]))))
+
+            pad_differences = []
+            _compareValues(pad_differences, 'type', old['type'], new['type'])
+            _compareValues(pad_differences, 'shape', old['shape'], new['shape'])
+            _compareValues(pad_differences, 'rotation', old['rotation'], new['rotation'], tolerance)
+            _compareValues(pad_differences, 'size', old['size'], new['size'], tolerance)
+            _compareValues(pad_differences, 'drill', old['drill'], new['drill'], tolerance)
+            _compareValues(pad_differences, 'layers', ' '.join(old['layers']), ' '.join(new['layers']))
+            differences.extend("{}: {}".format(pad_name, d) for d in pad_differences)
+
+
+def _coordinateVariants(kind, coordinates, reference):
+    # the ways the same element can be written down: lines and arcs can be drawn in both directions, polygons in both
+    # directions starting at every point. Only the polygons which start next to the first point of the reference are
+    # returned, any other start point is further away
+    if kind == 'line':
+        return [coordinates, coordinates[2:4] + coordinates[0:2]]
+    elif kind == 'arc':
+        return [coordinates, coordinates[0:2] + coordinates[4:6] + coordinates[2:4] + coordinates[6:8]]
+    elif kind == 'polygon' and coordinates:
+        points = [coordinates[i:i + 2] for i in range(0, len(coordinates), 2)]
+        start = min(range(len(points)), key=lambda i: math.hypot(points[i][0] - reference[0],
+                                                                 points[i][1] - reference[1]))
+        forward = points[start:] + points[:start]
+        backward = forward[:1] + forward[:0:-1]
+        return [sum(forward, ()), sum(backward, ())]
+    return [coordinates]
+
+
+def _elementDistance(old, new):
+    # largest deviation of a coordinate between the closest ways to write down two elements of the same kind, None if
+    # they can not be compared at all
+    if old[0] != new[0] or len(old[2]) != len(new[2]):
+        return None
+    return min(max([abs(o - n) for o, n in zip(variant, new[2])] or [0])
+               for variant in _coordinateVariants(old[0], old[2], new[2]))
+
+
+def _isSameElement(old, new, tolerance):
+    if not _isClose(old[1], new[1], tolerance):
+        return False
+    distance = _elementDistance(old, new)
+    return distance is not None and distance <= tolerance
+
+
+def _matchElements(old_elements, new_elements, tolerance):
+    r"""Pair the elements of a layer which are identical within the tolerance
+
+    :return: (unpaired old elements, unpaired new elements)
+    """
+
+    # the smallest x coordinate of an element moves at most by the tolerance, so the candidates for a pair are found
+    # by a bisection on it
+    new_order = sorted(range(len(new_elements)), key=lambda i: min(new_elements[i][2][0::2] or (0,)))
+    new_keys = [min(new_elements[i][2][0::2] or (0,)) for i in new_order]
+    paired = [False] * len(new_elements)
+
+    old_unpaired = []
+    for old in old_elements:
+        key = min(old[2][0::2] or (0,))
+        first = bisect.bisect_left(new_keys, key - tolerance)
+        last = bisect.bisect_right(new_keys, key + tolerance)
+        for index in new_order[first:last]:
+            if not paired[index] and _isSameElement(old, new_elements[index], tolerance):
+                paired[index] = True
+                break
+        else:
+            old_unpaired.append(old)
+
+    return old_unpaired, [new for new, is_paired in zip(new_elements, paired) if not is_paired]
+
+
+def _formatElement(element):
+    kind, width, coordinates = element
+    points = [_formatVector(coordinates[i:i + 2]) for i in range(0, len(coordinates), 2)]
+    if kind == 'line':
+        text = "line {}-{}".format(*points)
+    elif kind == 'circle':
+        text = "circle at {} with radius {:g}".format(points[0], coordinates[2] - coordinates[0])
+    elif kind == 'arc':
+        text = "arc {}-{} around {}".format(points[1], points[2], points[0])
+    else:
+        text = "polygon {}".format(", ".join(points))
+    if width is not None:
+        text += " width {:g}".format(width)
+    return text
+
+
+def _compareLayers(differences, old_layers, new_layers, tolerance):
+    for layer in sorted(set(old_layers) | set(new_layers)):
+        if layer not in new_layers:
+            differences.append("{}: all {} elements removed".format(layer, len(old_layers[layer])))
+            continue
+        if layer not in old_layers:
+            differences.append("{}: {} elements added".format(layer, len(new_layers[layer])))
+            continue
+
+        removed, added = _matchElements(old_layers[layer], new_layers[layer], tolerance)
+
+        # what is left over on both sides was changed. The most similar elements of the same kind are paired first
+        candidates = []
+        for old_index, old in enumerate(removed if len(removed) * len(added) <= MAX_ELEMENT_PAIRS else []):
+            for new_index, new in enumerate(added):
+                distance = _elementDistance(old, new)
+                if distance is not None:
+                    candidates.append((distance, old_index, new_index))
+
+        changed = []
+        old_paired = [False] * len(removed)
+        new_paired = [False] * len(added)
+        for distance, old_index, new_index in sorted(candidates):
+            if not old_paired[old_index] and not new_paired[new_index]:
+                old_paired[old_index] = new_paired[new_index] = True
+                changed.append((removed[old_index], added[new_index]))
+
+        layer_differences = ["{} changed to {}".format(_formatElement(old), _formatElement(new))
+                             for old, new in sorted(changed)]
+        layer_differences.extend("{} removed".format(_formatElement(old))
+                                 for old, is_paired in zip(removed, old_paired) if not is_paired)
+        layer_differences.extend("{} added".format(_formatElement(new))
+                                 for new, is_paired in zip(added, new_paired) if not is_paired)
+
+        differences.extend("{}: {}".format(layer, d) for d in layer_differences[:MAX_REPORTED_ELEMENTS])
+        if len(layer_differences) > MAX_REPORTED_ELEMENTS:
+            differences.append("{}: {} more elements changed".format(
+                layer, len(layer_differences) - MAX_REPORTED_ELEMENTS))
+
+
+def _compareTexts(differences, old_texts, new_texts, tolerance):
+    for key in sorted(set(old_texts) | set(new_texts)):
+        name = "{} text \"{}\"".format(*key)
+        old_group = old_texts.get(key, [])
+        new_group = new_texts.get(key, [])
+
+        if not new_group:
+            differences.append("{}: removed".format(name))
+        elif not old_group:
+            differences.append("{}: added".format(name))
+        elif len(old_group) != len(new_group):
+            differences.append("{}: count changed from {} to {}".format(name, len(old_group), len(new_group)))
+        else:
+            for old, new in zip(old_group, new_group):
+                text_differences = []
+                _compareValues(text_differences, 'position', old['at'], new['at'], tolerance)
+                _compareValues(text_differences, 'rotation', old['rotation'], new['rotation'], tolerance)
+                _compareValues(text_differences, 'layer', old['layer'], new['layer'])
+                _compareValues(text_differences, 'size', old['size'], new['size'], tolerance)
+                differences.extend("{}: {}".format(name, d) for d in text_differences)
+
+
+def compareFootprints(old, new, tolerance=DEFAULT_TOLERANCE):
+    r"""Compare the summaries of two footprints
+
+    :param old: summary of the old footprint, see ``summarizeFootprint``
+    :param new: summary of the new footprint
+    :param tolerance: maximum difference of two lengths or angles which are still seen as identical
+    :return: list of human readable differences, empty when both footprints are equal
+    """
+
+    if 'error' in old or 'error' in new:
+        if old.get('error') == new.get('error') and old.get('content') == new.get('content'):
+            return []
+        return ["could not be read: {}".format(new.get('error') or old.get('error'))]
+
+    differences = []
+
+    for name in sorted(old['attributes']):
+        _compareValues(differences, name, old['attributes'][name], new['attributes'][name])
+
+    _comparePads(differences, old['pads'], new['pads'], tolerance)
+    _compareLayers(differences, old['layers'], new['layers'], tolerance)
+    _compareTexts(differences, old['texts'], new['texts'], tolerance)
+
+    old_models = [m[0] for m in old['models']]
+    new_models = [m[0] for m in new['models']]
+    if old_models != new_models:
+        differences.append("3D models changed from {} to {}".format(', '.join(old_models) or 'none',
+                                                                    ', '.join(new_models) or 'none'))
+    else:
+        for old_model, new_model in zip(old['models'], new['models']):
+            for index, name in enumerate(('offset', 'scale', 'rotation'), 1):
+                _compareValues(differences, "3D model {}".format(name), old_model[index], new_model[index],
+                               tolerance)
+
+    return differences
+
+
+class FootprintDiff(object):
+    r"""Result of comparing a single footprint
+
+    :param name: path of the footprint relative to the compared directories
+    :param status: one of ``FootprintDiff.ADDED``, ``REMOVED``, ``CHANGED`` or ``UNCHANGED``
+    :param differences: list of human readable differences
+    """
+
+    ADDED = 'added'
+    REMOVED = 'removed'
+    CHANGED = 'changed'
+    UNCHANGED = 'unchanged'
+
+    def __init__(self, name, status, differences=None):
+        self.name = name
+        self.status = status
+        self.differences = differences or []
+
+
+class LibraryDiff(object):
+    r"""Compare all footprints of two directories (for example two versions of the generated library)
+
+    Footprints are matched by their path relative to the compared directories. Both trees are read in parallel and
+    compared geometrically, so differences in the timestamp or in the float formatting are ignored. Files which only
+    differ in their timestamp are not parsed at all.
+
+    :param old_path:
+        directory (or single .kicad_mod file) with the old footprints
+    :type old_path: ``str``
+    :param new_path:
+        directory (or single .kicad_mod file) with the new footprints
+    :type new_path: ``str``
+    :param tolerance:
+        maximum difference of two lengths or angles which are still seen as identical
+    :type tolerance: ``float``
+
+    :Example:
+
+    >>> from KicadModTree.LibraryDiff import LibraryDiff
+    >>> library_diff = LibraryDiff('old/Package_QFP.pretty', 'new/Package_QFP.pretty')
+    >>> library_diff.printReport(library_diff.compare(jobs=4))
+    """
+
+    def __init__(self, old_path, new_path, tolerance=DEFAULT_TOLERANCE):
+        self.old_path = old_path
+        self.new_path = new_path
+        self.tolerance = tolerance
+
+    @staticmethod
+    def findFootprints(path):
+        r"""Find all footprints inside a directory
+
+        :return: ``dict`` which maps the relative path of every footprint to its absolute path
+        """
+
+        if os.path.isfile(path):
+            return {os.path.basename(path): os.path.abspath(path)}
+
+        footprints = {}
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in filenames:
+                if filename.endswith(FOOTPRINT_FILE_EXTENSION):
+                    full_path = os.path.join(dirpath, filename)
+                    footprints[os.path.relpath(full_path, path)] = os.path.abspath(full_path)
+
+        return footprints
+
+    def compare(self, jobs=None):
+        r"""Read and compare all footprints
+
+        :param jobs: number of processes used to read the footprints (default: number of cpu cores, a single one
+                     on python2)
+        :return: list of ``FootprintDiff``, sorted by name
+        """
+
+        old_footprints = self.findFootprints(self.old_path)
+        new_footprints = self.findFootprints(self.new_path)
+        common = sorted(set(old_footprints) & set(new_footprints))
+
+        arguments = [(old_footprints[name], new_footprints[name], self.tolerance) for name in common]
+        if jobs != 1:
+            try:
+                from concurrent.futures import ProcessPoolExecutor
+            except ImportError:
+                # python2 without the futures backport reads all footprints in this process
+                jobs = 1
+
+        if jobs == 1:
+            all_differences = [_compareFiles(a) for a in arguments]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                all_differences = list(executor.map(_compareFiles, arguments, chunksize=16))
+
+        results = [FootprintDiff(name, FootprintDiff.REMOVED) for name in set(old_footprints) - set(new_footprints)]
+        results += [FootprintDiff(name, FootprintDiff.ADDED) for name in set(new_footprints) - set(old_footprints)]
+
+        for name, differences in zip(common, all_differences):
+            status = FootprintDiff.CHANGED if differences else FootprintDiff.UNCHANGED
+            results.append(FootprintDiff(name, status, differences))
+
+        return sorted(results, key=lambda result: result.name)
+
+    def printReport(self, results, wall_time=None, stream=None):
+        r"""Print all differences, followed by a summary
+
+        :param results: list of ``FootprintDiff``
+        :param wall_time: runtime of the comparison in seconds
+        :param stream: output stream (default: ``sys.stdout``)
+        """
+
+        stream = stream or sys.stdout
+
+        for result in results:
+            if result.status == FootprintDiff.UNCHANGED:
+                continue
+
+            stream.write("{}: {}\n".format(result.status, result.name))
+            for difference in result.differences:
+                stream.write("    {}\n".format(difference))
+
+        counts = {status: 0 for status in (FootprintDiff.CHANGED, FootprintDiff.ADDED, FootprintDiff.REMOVED,
+                                           FootprintDiff.UNCHANGED)}
+        for result in results:
+            counts[result.status] += 1
+
+        summary = "{total} footprints compared: {changed} changed, {added} added, {removed} removed, " \
+                  "{unchanged} unchanged".format(total=len(results), **counts)
+        if wall_time is not None:
+            summary += " ({:.1f}s)".format(wall_time)
+        stream.write(summary + "\n")
+
+
+def main(argv=None):
+    r"""Entry point of ``kicadmodtree-diff``
+    """
+
+    parser = argparse.ArgumentParser(description='Compare the footprints of two directories geometrically')
+    parser.add_argument('old', type=str, help='directory (or .kicad_mod file) with the old footprints')
+    parser.add_argument('new', type=str, help='directory (or .kicad_mod file) with the new footprints')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of processes reading footprints (default: number of cpu cores)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='lengths and angles which differ less are seen as identical (default: {})'
+                        .format(DEFAULT_TOLERANCE))
+    args = parser.parse_args(argv)
+
+    for path in (args.old, args.new):
+        if not os.path.exists(path):
+            parser.error("path not found: {}".format(path))
+
+    library_diff = LibraryDiff(args.old, args.new, tolerance=args.tolerance)
+
+    start_time = time.time()
+    results = library_diff.compare(jobs=args.jobs)
+    library_diff.printReport(results, wall_time=time.time() - start_time)
+
+    # exit code like diff: 1 when there are differences
+    return 1 if any(r.status != FootprintDiff.UNCHANGED for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
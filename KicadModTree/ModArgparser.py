@@ -16,9 +16,16 @@
 import sys
 import argparse
 import csv
+import multiprocessing
+import traceback
+
+from collections import deque
+
+from KicadModTree.BuildCache import BuildCache
 
 try:
     import yaml
+    from KicadModTree.util.yaml_util import iterYamlEntries
     YAML_AVAILABLE = True
 except ImportError:
     YAML_AVAILABLE = False
@@ -29,6 +36,40 @@ class ParserException(Exception):
         Exception.__init__(self, *args, **kwargs)
 
 
+class _OutputCollector(object):
+    # replaces stdout and stderr of the worker processes, python2 writes a mix of str and unicode into it
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+
+def _executeFootprint(footprint_function, build_cache, cache_key, parsed_args):
+    # executed in the worker processes, the output is returned so it can be printed in the order of the footprints
+    output = _OutputCollector()
+    error = None
+
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = output
+    try:
+        with build_cache.record(cache_key):
+            footprint_function(parsed_args)
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+
+    return output.getvalue(), error
+
+
 class ModArgparser(object):
     r"""A general data loading class, which allows us to specify parts using .yml or .csv files.
 
@@ -59,6 +100,13 @@ class ModArgparser(object):
     def __init__(self, footprint_function):
         self._footprint_function = footprint_function
         self._params = {}
+        self._build_cache = BuildCache()
+
+        # only set while footprints are generated in parallel, see run()
+        self._executor = None
+        self._max_pending = 0
+        self._pending = deque()
+        self._failed = []
 
     def add_parameter(self, name, **kwargs):
         r"""Add a parameter to the ModArgparser
@@ -97,6 +145,11 @@ class ModArgparser(object):
         This method parses the commandline arguments to determine which actions to take. Beside of parsing .yml and .csv
         files, it also allows us to output example files.
 
+        With ``--jobs N`` the footprints are generated by N processes in parallel. The output is still printed in the
+        order of the footprints, and a failing footprint does not abort the others. When any footprint failed, the
+        script exits with status 1 after all footprints were processed. Python2 requires the ``futures`` backport for
+        this, without it all footprints are generated by the script itself.
+
         >>> from KicadModTree import *
         >>> def footprint_gen(args):
         ...    print("create footprint: {}".format(args['name']))
@@ -111,6 +164,8 @@ class ModArgparser(object):
         parser.add_argument('-v', '--verbose', help='show some additional information', action='store_true')  # TODO
         parser.add_argument('--print_yml', help='print example .yml file', action='store_true')
         parser.add_argument('--print_csv', help='print example .csv file', action='store_true')
+        parser.add_argument('-j', '--jobs', type=int, default=1,
+                            help='number of processes generating footprints (default: 1, 0: number of cpu cores)')
 
         # TODO: allow writing into sub dir
 
@@ -128,41 +183,102 @@ class ModArgparser(object):
             parser.print_help()
             return
 
-        for filepath in args.files:
-            print("use file: {0}".format(filepath))
+        jobs = args.jobs if args.jobs > 0 else multiprocessing.cpu_count()
+        if jobs > 1:
+            try:
+                from concurrent.futures import ProcessPoolExecutor
+            except ImportError:
+                print("concurrent.futures not available, footprints are generated by a single process")
+                jobs = 1
+
+        if jobs == 1:
+            self._parse_and_execute_files(args.files)
+            return
+
+        self._failed = []
+        # enough footprints are queued to keep all processes busy, without parsing all files upfront
+        self._max_pending = 4 * jobs
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            self._executor = executor
+            try:
+                self._parse_and_execute_files(args.files)
+                self._flush_output(0)
+            finally:
+                self._executor = None
+                self._pending.clear()
+
+        if self._failed:
+            print("{0} footprint(s) failed: {1}".format(len(self._failed), ", ".join(self._failed)))
+            sys.exit(1)
+
+    def _parse_and_execute_files(self, files):
+        for filepath in files:
+            self._print("use file: {0}".format(filepath))
             if filepath.endswith('.yml') or filepath.endswith('.yaml'):
                 self._parse_and_execute_yml(filepath)
             elif filepath.endswith('.csv'):
                 self._parse_and_execute_csv(filepath)
             else:
-                print("unexpected filetype: {0}".format(filepath))
+                self._print("unexpected filetype: {0}".format(filepath))
+
+    def _print(self, message):
+        # messages have to wait for the output of all footprints which are still generated in the background
+        if self._pending:
+            self._pending.append(message + "\n")
+        else:
+            print(message)
+
+    def _flush_output(self, max_pending):
+        # print everything in order, until the first footprint which is not finished yet
+        while self._pending:
+            item = self._pending[0]
+            if not isinstance(item, str) and not item[1].done() and \
+                    sum(not isinstance(i, str) for i in self._pending) <= max_pending:
+                break
+
+            self._pending.popleft()
+            if isinstance(item, str):
+                sys.stdout.write(item)
+                continue
+
+            name, future = item
+            try:
+                output, error = future.result()
+            except Exception as e:
+                # the footprint could not be sent to the worker, or the worker died
+                output, error = "", "{0}: {1}\n".format(type(e).__name__, e)
+
+            sys.stdout.write(output)
+            if error is not None:
+                sys.stdout.write("ERROR: {0} failed\n{1}".format(name, error))
+                self._failed.append(name)
+        sys.stdout.flush()
 
     def _parse_and_execute_yml(self, filepath):
         if not YAML_AVAILABLE:
             print("pyyaml not available!")
             sys.exit(1)
 
-        with open(filepath, 'r') as stream:
-            try:
-                parsed = yaml.safe_load(stream)  # parse file
-
-                if parsed is None:
-                    print("empty file!")
-                    return
+        empty = True
+        try:
+            # the footprints are generated while the file is parsed
+            for footprint, kwargs in iterYamlEntries(filepath):
+                empty = False
 
-                for footprint in parsed:
-                    kwargs = parsed.get(footprint)
+                # name is a reserved key
+                if 'name' in kwargs:
+                    self._print("ERROR: name is already used for root name!")
+                    continue
+                kwargs['name'] = footprint
 
-                    # name is a reserved key
-                    if 'name' in kwargs:
-                        print("ERROR: name is already used for root name!")
-                        continue
-                    kwargs['name'] = footprint
+                self._execute_script(**kwargs)  # now we can execute the script
 
-                    self._execute_script(**kwargs)  # now we can execute the script
+        except yaml.YAMLError as exc:
+            self._print(str(exc))
+            return
 
-            except yaml.YAMLError as exc:
-                print(exc)
+        if empty:
+            self._print("empty file!")
 
     def _create_example_data_required(self, **kwargs):
         params = {}
@@ -253,11 +369,24 @@ class ModArgparser(object):
                         parsed_args[k] = type(v.get('default'))
             except (ValueError, ParserException) as e:
                 error = True
-                print("ERROR: {}".format(e))
+                self._print("ERROR: {}".format(e))
 
-        print("  - generate {name}.kicad_mod".format(name=kwargs.get('name', '<anon>')))
+        self._print("  - generate {name}.kicad_mod".format(name=kwargs.get('name', '<anon>')))
 
         if error:
             return
 
-        self._footprint_function(parsed_args)
+        cache_key = self._build_cache.getKey(parsed_args)
+        if self._build_cache.isUpToDate(cache_key):
+            self._print("    unchanged, skipped")
+            return
+
+        if self._executor is not None:
+            future = self._executor.submit(_executeFootprint, self._footprint_function, self._build_cache, cache_key,
+                                           parsed_args)
+            self._pending.append((kwargs.get('name', '<anon>'), future))
+            self._flush_output(self._max_pending)
+            return
+
+        with self._build_cache.record(cache_key):
+            self._footprint_function(parsed_args)
@@ -15,9 +15,15 @@
 # (C) 2018 by Rene Poeschl, github @poeschlr
 
 import warnings
+from array import array
+from bisect import bisect_left
+from math import cos, sin, hypot, radians
 
-from KicadModTree.Vector import Vector2D
-from KicadModTree.nodes.Node import Node
+from KicadModTree.Vector import Vector2D, _vector2d
+from KicadModTree.util.batch_util import NUMPY_AVAILABLE, BATCH_THRESHOLD
+
+if NUMPY_AVAILABLE:
+    import numpy
 
 
 class PolygonPoints(object):
@@ -38,16 +44,18 @@ class PolygonPoints(object):
     >>> from KicadModTree import *
     >>> PolyPoint([(0, 0),(1, 0)])
     >>> PolyPoint([{'x': 0, 'y':0}, {'x': 1, 'y':0}])
+
+    The coordinates are stored in a flat ``array('d')`` as ``x0, y0, x1, y1, ...``. Points which are returned
+    (by iterating, indexing or by ``nodes``) are new ``Vector2D`` instances, changing them does not change the
+    polygon. Transformations of large polygons are done with numpy if it is installed.
     """
     def __init__(self, **kwargs):
         self._initMirror(**kwargs)
         self._initNodes(**kwargs)
 
     def _initNodes(self, **kwargs):
-        self.nodes = []
         if 'nodes' in kwargs:
-            for n in kwargs['nodes']:
-                self.nodes.append(Vector2D(n))
+            nodes = kwargs['nodes']
             if 'polygone' in kwargs:
                 raise KeyError('Use of "nodes" and "polygone" parameter at the same time is not supported.')
         elif 'polygone' in kwargs:
@@ -55,16 +63,20 @@ class PolygonPoints(object):
                 "polygone argument is deprecated, use nodes instead",
                 DeprecationWarning
             )
-            for n in kwargs['polygone']:
-                self.nodes.append(Vector2D(n))
+            nodes = kwargs['polygone']
         else:
             raise KeyError('Either "nodes" or "polygone" parameter is required for creating a PolyPoint instance.')
 
-        for point in self.nodes:
-            if self.mirror[0] is not None:
-                point.x = 2 * self.mirror[0] - point.x
-            if self.mirror[1] is not None:
-                point.y = 2 * self.mirror[1] - point.y
+        self._coordinates = array('d')
+        for n in nodes:
+            n = n if type(n) is Vector2D else Vector2D(n)
+            self._coordinates.append(n.x)
+            self._coordinates.append(n.y)
+
+        if self.mirror[0] is not None:
+            self._coordinates[0::2] = array('d', [2 * self.mirror[0] - x for x in self._coordinates[0::2]])
+        if self.mirror[1] is not None:
+            self._coordinates[1::2] = array('d', [2 * self.mirror[1] - y for y in self._coordinates[1::2]])
 
     def _initMirror(self, **kwargs):
         self.mirror = [None, None]
@@ -73,38 +85,56 @@ class PolygonPoints(object):
         if 'y_mirror' in kwargs and type(kwargs['y_mirror']) in [float, int]:
             self.mirror[1] = kwargs['y_mirror']
 
+    @property
+    def nodes(self):
+        r""" list of the points as ``Vector2D``
+        """
+        return list(self)
+
     def calculateBoundingBox(self):
-        min = max = self.getRealPosition(self.nodes[0])
+        r""" Calculate the bounding box of the points
 
-        for n in self.nodes:
-            min.x = min([min.x, n.x])
-            min.y = min([min.y, n.y])
-            max.x = max([max.x, n.x])
-            max.y = max([max.y, n.y])
+        :return: {'min': Vector2D, 'max': Vector2D}
+        """
+        xs = self._coordinates[0::2]
+        ys = self._coordinates[1::2]
 
-        return Node.calculateBoundingBox({'min': min, 'max': max})
+        return {'min': Vector2D(min(xs), min(ys)), 'max': Vector2D(max(xs), max(ys))}
 
     def findNearestPoints(self, other):
         r""" Find the nearest points for two polygons
 
         Find the two points for both polygons that are nearest to each other.
-
+        The points of the other polygon are sorted by x, so only the points within
+        the best distance found so far have to be checked for every point.
+        For equal distances the result is the same as from checking all pairs in order.
 
         :param other: the polygon points of the other polygon
         :return: a tuble with the indexes of the two points
                  (pint in self, point in other)
         """
 
-        min_distance = self[0].distance_to(other[0])
+        other_points = [(p.x, p.y) for p in other]
+        order = sorted(range(len(other_points)), key=lambda j: other_points[j][0])
+        sorted_x = [other_points[j][0] for j in order]
+
+        min_distance = None
         pi = 0
         pj = 0
+        coordinates = self._coordinates
         for i in range(len(self)):
-            for j in range(len(other)):
-                d = self[i].distance_to(other[j])
-                if d < min_distance:
-                    pi = i
-                    pj = j
-                    min_distance = d
+            x, y = coordinates[2*i], coordinates[2*i+1]
+            start = bisect_left(sorted_x, x)
+            for indices in (range(start, len(order)), range(start-1, -1, -1)):
+                for k in indices:
+                    if min_distance is not None and abs(sorted_x[k] - x) > min_distance:
+                        break
+                    j = order[k]
+                    d = hypot(other_points[j][0] - x, other_points[j][1] - y)
+                    if min_distance is None or d < min_distance or (d == min_distance and i == pi and j < pj):
+                        pi = i
+                        pj = j
+                        min_distance = d
 
         return (pi, pj)
 
@@ -137,11 +167,15 @@ class PolygonPoints(object):
         )
         idx_self, idx_other = self.findNearestPoints(other)
 
-        self.nodes.insert(idx_self+1, self[idx_self])
-        for i in range(len(other)):
-            self.nodes.insert(idx_self+1, other[(i+idx_other) % len(other)])
+        # the other polygon is walked backwards, starting and ending at its nearest point
+        inserted = array('d')
+        for i in [0] + list(range(len(other) - 1, -1, -1)):
+            p = other[(i+idx_other) % len(other)]
+            inserted.append(p.x)
+            inserted.append(p.y)
+        inserted.extend(self._coordinates[2*idx_self:2*idx_self+2])
 
-        self.nodes.insert(idx_self+1, other[idx_other])
+        self._coordinates[2*idx_self+2:2*idx_self+2] = inserted
 
     def rotate(self, angle, origin=(0, 0), use_degrees=True):
         r""" Rotate points around given origin
@@ -155,8 +189,24 @@ class PolygonPoints(object):
                 rotation angle is given in degrees. default:True
         """
 
-        for p in self.nodes:
-            p.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        op = Vector2D(origin)
+        if use_degrees:
+            angle = radians(angle)
+        ca, sa = cos(angle), sin(angle)
+
+        # the same calculation as Vector2D.rotate
+        if NUMPY_AVAILABLE and len(self) >= BATCH_THRESHOLD:
+            xy = numpy.frombuffer(self._coordinates, dtype=float).reshape(-1, 2)
+            dx = xy[:, 0] - op.x
+            dy = xy[:, 1] - op.y
+            xy[:, 0] = op.x + ca * dx - sa * dy
+            xy[:, 1] = op.y + sa * dx + ca * dy
+            return self
+
+        xs = self._coordinates[0::2]
+        ys = self._coordinates[1::2]
+        self._coordinates[0::2] = array('d', [op.x + ca * (x - op.x) - sa * (y - op.y) for x, y in zip(xs, ys)])
+        self._coordinates[1::2] = array('d', [op.y + sa * (x - op.x) + ca * (y - op.y) for x, y in zip(xs, ys)])
         return self
 
     def translate(self, distance_vector):
@@ -167,19 +217,33 @@ class PolygonPoints(object):
                 2D vector defining by how much and in what direction to translate.
         """
 
-        for p in self.nodes:
-            p += distance_vector
+        distance = Vector2D(distance_vector)
+        if NUMPY_AVAILABLE and len(self) >= BATCH_THRESHOLD:
+            xy = numpy.frombuffer(self._coordinates, dtype=float).reshape(-1, 2)
+            xy += (distance.x, distance.y)
+            return self
+
+        self._coordinates[0::2] = array('d', [x + distance.x for x in self._coordinates[0::2]])
+        self._coordinates[1::2] = array('d', [y + distance.y for y in self._coordinates[1::2]])
         return self
 
     def __copy__(self):
-        return PolygonPoints(nodes=self.nodes)
+        return PolygonPoints(nodes=self)
 
     def __iter__(self):
-        for n in self.nodes:
-            yield n
+        coordinates = self._coordinates
+        for i in range(0, len(coordinates), 2):
+            yield _vector2d(coordinates[i], coordinates[i+1])
 
     def __getitem__(self, idx):
-        return self.nodes[idx]
+        if isinstance(idx, slice):
+            return self.nodes[idx]
+
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('Index {} is out of range'.format(idx))
+        return _vector2d(self._coordinates[2*idx], self._coordinates[2*idx+1])
 
     def __len__(self):
-        return len(self.nodes)
+        return len(self._coordinates) // 2
@@ -22,6 +22,23 @@ from KicadModTree.util.kicad_util import formatFloat
 from math import sqrt, sin, cos, hypot, atan2, degrees, radians
 
 
+def _vector2d(x, y):
+    # create a Vector2D without parsing the constructor arguments
+    vector = object.__new__(Vector2D)
+    vector.x = float(x)
+    vector.y = float(y)
+    return vector
+
+
+def _vector3d(x, y, z):
+    # create a Vector3D without parsing the constructor arguments
+    vector = object.__new__(Vector3D)
+    vector.x = float(x)
+    vector.y = float(y)
+    vector.z = float(z)
+    return vector
+
+
 class Vector2D(object):
     r"""Representation of a 2D Vector in space
 
@@ -34,35 +51,41 @@ class Vector2D(object):
     >>> Vector2D({'x': 0, 'y':0})
     >>> Vector2D(Vector2D(0, 0))
     """
+    __slots__ = ('x', 'y')
+
     def __init__(self, coordinates=None, y=None):
-        # parse constructor
-        if coordinates is None:
-            coordinates = {}
-        elif type(coordinates) in [int, float]:
-            if y is not None:
-                coordinates = [coordinates, y]
-            else:
+        coordinates_type = type(coordinates)
+
+        # parse vectors with format: Vector2D(0, 0)
+        if coordinates_type is float or coordinates_type is int:
+            if y is None:
                 raise TypeError('you have to give x and y coordinate')
+            self.x = float(coordinates)
+            self.y = float(y)
+
+        # parse vectors with format: Vector2D(Vector2D(0, 0)) or Vector2D(Vector3D(0, 0, 0))
         elif isinstance(coordinates, Vector2D):
-            # convert Vector2D as well as Vector3D to dict
-            coordinates = coordinates.to_dict()
+            self.x = float(coordinates.x)
+            self.y = float(coordinates.y)
+
+        # parse vectors with format: Vector2D([0, 0]) or Vector2D((0, 0))
+        elif coordinates_type is list or coordinates_type is tuple:
+            if len(coordinates) != 2:
+                raise TypeError('invalid list size (2 elements expected)')
+            self.x = float(coordinates[0])
+            self.y = float(coordinates[1])
 
         # parse vectors with format: Vector2D({'x':0, 'y':0})
-        if type(coordinates) is dict:
+        elif coordinates_type is dict:
             self.x = float(coordinates.get('x', 0.))
             self.y = float(coordinates.get('y', 0.))
-            return
 
-        # parse vectors with format: Vector2D([0, 0]) or Vector2D((0, 0))
-        if type(coordinates) in [list, tuple]:
-            if len(coordinates) == 2:
-                self.x = float(coordinates[0])
-                self.y = float(coordinates[1])
-                return
-            else:
-                raise TypeError('invalid list size (2 elements expected)')
+        elif coordinates is None:
+            self.x = 0.
+            self.y = 0.
 
-        raise TypeError('invalid parameters given')
+        else:
+            raise TypeError('invalid parameters given')
 
     def round_to(self, base):
         r"""Round to a specific base (like it's required for a grid)
@@ -76,7 +99,7 @@ class Vector2D(object):
         if base == 0 or base is None:
             return self.__copy__()
 
-        return Vector2D([round(v / base) * base for v in self])
+        return _vector2d(round(self.x / base) * base, round(self.y / base) * base)
 
     def distance_to(self, value):
         r"""Distance between this and another point
@@ -84,18 +107,22 @@ class Vector2D(object):
         :param value: the other point
         :return: distance between self and other point
         """
-        other = Vector2D.__arithmetic_parse(value)
-        d = other - self
-        return hypot(d.x, d.y)
+        other_x, other_y = Vector2D.__arithmetic_parse(value)
+        return hypot(float(other_x - self.x), float(other_y - self.y))
 
     @staticmethod
     def __arithmetic_parse(value):
+        # get the (x, y) values of the second operand without creating temporary vectors if possible
         if isinstance(value, Vector2D):
-            return value
-        elif type(value) in [int, float]:
-            return Vector2D([value, value])
-        else:
-            return Vector2D(value)
+            return value.x, value.y
+
+        value_type = type(value)
+        if value_type is float or value_type is int:
+            value = float(value)
+            return value, value
+
+        other = Vector2D(value)
+        return other.x, other.y
 
     def __eq__(self, other):
         if not isinstance(self, other.__class__):
@@ -106,45 +133,37 @@ class Vector2D(object):
         return not self.__eq__(other)
 
     def __add__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-
-        return Vector2D({'x': self.x + other.x,
-                         'y': self.y + other.y})
+        other_x, other_y = Vector2D.__arithmetic_parse(value)
+        return _vector2d(self.x + other_x, self.y + other_y)
 
     def __iadd__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-        self.x += other.x
-        self.y += other.y
+        other_x, other_y = Vector2D.__arithmetic_parse(value)
+        self.x += other_x
+        self.y += other_y
 
         return self
 
     def __neg__(self):
-        return Vector2D({'x': -self.x, 'y': -self.y})
+        return _vector2d(-self.x, -self.y)
 
     def __sub__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-
-        return Vector2D({'x': self.x - other.x,
-                         'y': self.y - other.y})
+        other_x, other_y = Vector2D.__arithmetic_parse(value)
+        return _vector2d(self.x - other_x, self.y - other_y)
 
     def __isub__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-        self.x -= other.x
-        self.y -= other.y
+        other_x, other_y = Vector2D.__arithmetic_parse(value)
+        self.x -= other_x
+        self.y -= other_y
 
         return self
 
     def __mul__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-
-        return Vector2D({'x': self.x * other.x,
-                         'y': self.y * other.y})
+        other_x, other_y = Vector2D.__arithmetic_parse(value)
+        return _vector2d(self.x * other_x, self.y * other_y)
 
     def __div__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-
-        return Vector2D({'x': self.x / other.x,
-                         'y': self.y / other.y})
+        other_x, other_y = Vector2D.__arithmetic_parse(value)
+        return _vector2d(self.x / other_x, self.y / other_y)
 
     def __truediv__(self, obj):
         return self.__div__(obj)
@@ -161,10 +180,10 @@ class Vector2D(object):
                                  y=formatFloat(self.y))
 
     def __repr__(self):
-        return "Vector2D (x={x}, y={y})".format(**self.to_dict())
+        return "Vector2D (x={x}, y={y})".format(x=self.x, y=self.y)
 
     def __str__(self):
-        return "(x={x}, y={y})".format(**self.to_dict())
+        return "(x={x}, y={y})".format(x=self.x, y=self.y)
 
     def __getitem__(self, key):
         if key == 0 or key == 'x':
@@ -190,7 +209,7 @@ class Vector2D(object):
         yield self.y
 
     def __copy__(self):
-        return Vector2D(self.x, self.y)
+        return _vector2d(self.x, self.y)
 
     def rotate(self, angle, origin=(0, 0), use_degrees=True):
         r""" Rotate vector around given origin
@@ -257,13 +276,13 @@ class Vector2D(object):
         x = radius * cos(angle)
         y = radius * sin(angle)
 
-        return Vector2D({'x': x, 'y': y})+Vector2D(origin)
+        return _vector2d(x, y) + Vector2D(origin)
 
     def to_homogeneous(self):
         r""" Get homogeneous representation
         """
 
-        return Vector3D(self.x, self.y, 1)
+        return _vector3d(self.x, self.y, 1)
 
     @staticmethod
     def from_homogeneous(source):
@@ -291,39 +310,34 @@ class Vector3D(Vector2D):
     >>> Vector3D(Vector3D(0, 0, 0))
     """
 
+    __slots__ = ('z',)
+
     def __init__(self, coordinates=None, y=None, z=None):
         # we don't need a super constructor here
+        coordinates_type = type(coordinates)
 
-        # parse constructor
-        if coordinates is None:
-            coordinates = {}
-        elif type(coordinates) in [int, float]:
-            if y is not None:
-                if z is not None:
-                    coordinates = [coordinates, y, z]
-                else:
-                    coordinates = [coordinates, y]
-            else:
+        # parse vectors with format: Vector3D(0, 0) or Vector3D(0, 0, 0)
+        if coordinates_type is float or coordinates_type is int:
+            if y is None:
                 raise TypeError('you have to give at least x and y coordinate')
-        elif isinstance(coordinates, Vector2D):
-            # convert Vector2D as well as Vector3D to dict
-            coordinates = coordinates.to_dict()
+            self.x = float(coordinates)
+            self.y = float(y)
+            self.z = 0. if z is None else float(z)
 
-        # parse vectors with format: Vector2D({'x':0, 'y':0})
-        if type(coordinates) is dict:
-            self.x = float(coordinates.get('x', 0.))
-            self.y = float(coordinates.get('y', 0.))
-            self.z = float(coordinates.get('z', 0.))
-            return
+        # parse vectors with format: Vector3D(Vector2D(0, 0)) or Vector3D(Vector3D(0, 0, 0))
+        elif isinstance(coordinates, Vector2D):
+            self.x = float(coordinates.x)
+            self.y = float(coordinates.y)
+            self.z = float(coordinates.z) if isinstance(coordinates, Vector3D) else 0.
 
         # parse vectors with format: Vector3D([0, 0]), Vector3D([0, 0, 0]) or Vector3D((0, 0)), Vector3D((0, 0, 0))
-        if type(coordinates) in [list, tuple]:
-            if len(coordinates) >= 2:
-                self.x = float(coordinates[0])
-                self.y = float(coordinates[1])
-            else:
+        elif coordinates_type is list or coordinates_type is tuple:
+            if len(coordinates) < 2:
                 raise TypeError('invalid list size (to small)')
 
+            self.x = float(coordinates[0])
+            self.y = float(coordinates[1])
+
             if len(coordinates) == 3:
                 self.z = float(coordinates[2])
             else:
@@ -332,6 +346,17 @@ class Vector3D(Vector2D):
             if len(coordinates) > 3:
                 raise TypeError('invalid list size (to big)')
 
+        # parse vectors with format: Vector3D({'x':0, 'y':0, 'z':0})
+        elif coordinates_type is dict:
+            self.x = float(coordinates.get('x', 0.))
+            self.y = float(coordinates.get('y', 0.))
+            self.z = float(coordinates.get('z', 0.))
+
+        elif coordinates is None:
+            self.x = 0.
+            self.y = 0.
+            self.z = 0.
+
         else:
             raise TypeError('dict or list type required')
 
@@ -347,29 +372,33 @@ class Vector3D(Vector2D):
         if base == 0 or base is None:
             return self.__copy__()
 
-        return Vector3D([round(v / base) * base for v in self])
+        return _vector3d(round(self.x / base) * base, round(self.y / base) * base, round(self.z / base) * base)
 
     def cross_product(self, other):
-        other = Vector3D.__arithmetic_parse(other)
+        other_x, other_y, other_z = Vector3D.__arithmetic_parse(other)
 
-        return Vector3D({
-                    'x': self.y*other.z - self.z*other.y,
-                    'y': self.z*other.x - self.x*other.z,
-                    'z': self.x*other.y - self.y*other.x})
+        return _vector3d(self.y*other_z - self.z*other_y,
+                         self.z*other_x - self.x*other_z,
+                         self.x*other_y - self.y*other_x)
 
     def dot_product(self, other):
-        other = Vector3D.__arithmetic_parse(other)
+        other_x, other_y, other_z = Vector3D.__arithmetic_parse(other)
 
-        return self.x*other.x + self.y*other.y + self.z*other.z
+        return self.x*other_x + self.y*other_y + self.z*other_z
 
     @staticmethod
     def __arithmetic_parse(value):
+        # get the (x, y, z) values of the second operand without creating temporary vectors if possible
         if isinstance(value, Vector3D):
-            return value
-        elif type(value) in [int, float]:
-            return Vector3D([value, value, value])
-        else:
-            return Vector3D(value)
+            return value.x, value.y, value.z
+
+        value_type = type(value)
+        if value_type is float or value_type is int:
+            value = float(value)
+            return value, value, value
+
+        other = Vector3D(value)
+        return other.x, other.y, other.z
 
     def __eq__(self, other):
         if not isinstance(self, other.__class__):
@@ -380,53 +409,39 @@ class Vector3D(Vector2D):
         return not self.__eq__(other)
 
     def __add__(self, value):
-        other = Vector3D.__arithmetic_parse(value)
-
-        return Vector3D({'x': self.x + other.x,
-                         'y': self.y + other.y,
-                         'z': self.z + other.z})
+        other_x, other_y, other_z = Vector3D.__arithmetic_parse(value)
+        return _vector3d(self.x + other_x, self.y + other_y, self.z + other_z)
 
     def __iadd__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-        self.x += other.x
-        self.y += other.y
-        self.z += other.z
+        other_x, other_y, other_z = Vector3D.__arithmetic_parse(value)
+        self.x += other_x
+        self.y += other_y
+        self.z += other_z
 
         return self
 
     def __neg__(self):
-        return Vector2D({'x': -self.x,
-                         'y': -self.y,
-                         'z': -self.z})
+        return _vector2d(-self.x, -self.y)
 
     def __sub__(self, value):
-        other = Vector3D.__arithmetic_parse(value)
-
-        return Vector3D({'x': self.x - other.x,
-                         'y': self.y - other.y,
-                         'z': self.z - other.z})
+        other_x, other_y, other_z = Vector3D.__arithmetic_parse(value)
+        return _vector3d(self.x - other_x, self.y - other_y, self.z - other_z)
 
     def __isub__(self, value):
-        other = Vector2D.__arithmetic_parse(value)
-        self.x -= other.x
-        self.y -= other.y
-        self.z -= other.z
+        other_x, other_y, other_z = Vector3D.__arithmetic_parse(value)
+        self.x -= other_x
+        self.y -= other_y
+        self.z -= other_z
 
         return self
 
     def __mul__(self, value):
-        other = Vector3D.__arithmetic_parse(value)
-
-        return Vector3D({'x': self.x * other.x,
-                         'y': self.y * other.y,
-                         'z': self.z * other.z})
+        other_x, other_y, other_z = Vector3D.__arithmetic_parse(value)
+        return _vector3d(self.x * other_x, self.y * other_y, self.z * other_z)
 
     def __div__(self, value):
-        other = Vector3D.__arithmetic_parse(value)
-
-        return Vector3D({'x': self.x / other.x,
-                         'y': self.y / other.y,
-                         'z': self.z / other.z})
+        other_x, other_y, other_z = Vector3D.__arithmetic_parse(value)
+        return _vector3d(self.x / other_x, self.y / other_y, self.z / other_z)
 
     def __truediv__(self, obj):
         return self.__div__(obj)
@@ -444,10 +459,10 @@ class Vector3D(Vector2D):
                                  z=formatFloat(self.z))
 
     def __repr__(self):
-        return "Vector3D (x={x}, y={y}, z={z})".format(**self.to_dict())
+        return "Vector3D (x={x}, y={y}, z={z})".format(x=self.x, y=self.y, z=self.z)
 
     def __str__(self):
-        return "(x={x}, y={y}, z={z})".format(**self.to_dict())
+        return "(x={x}, y={y}, z={z})".format(x=self.x, y=self.y, z=self.z)
 
     def __getitem__(self, key):
         if key == 0 or key == 'x':
@@ -478,4 +493,4 @@ class Vector3D(Vector2D):
         yield self.z
 
     def __copy__(self):
-        return Vector3D(self.x, self.y, self.z)
+        return _vector3d(self.x, self.y, self.z)
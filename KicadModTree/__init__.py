@@ -22,5 +22,8 @@ from KicadModTree.nodes import *
 # File Handlers
 from KicadModTree.KicadFileHandler import KicadFileHandler
 
+# Incremental builds
+from KicadModTree.BuildCache import BuildCache
+
 # Argparser
 from KicadModTree.ModArgparser import ModArgparser
@@ -51,6 +51,88 @@ class Footprint(Node):
         self.pasteMargin = None
         self.pasteMarginRatio = None
 
+    @staticmethod
+    def fromFile(filename):
+        r"""Read a footprint from a .kicad_mod file
+
+        :param filename:
+            path of the .kicad_mod file
+        :type filename: ``str``
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint.fromFile('example_footprint.kicad_mod')
+        """
+
+        # imported here, because the file handler depends on the nodes
+        from KicadModTree.KicadFileHandler import KicadFileHandler
+        return KicadFileHandler.readFile(filename)
+
+    def clipSilkscreen(self, clearance=0.2, layers=None):
+        r"""Remove all silkscreen which is closer than the clearance to the copper of a pad
+
+        Should be called after the footprint is complete, see
+        :func:`KicadModTree.util.silkscreen_util.clipSilkscreen` for details.
+
+        :param clearance:
+            distance between the edge of the silkscreen lines and the copper (default: 0.2)
+        :type clearance: ``float``
+        :param layers:
+            silkscreen layers to clip (default: ['F.SilkS', 'B.SilkS'])
+        :type layers: ``list(str)``
+
+        :return: number of clipped nodes
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> kicad_mod.clipSilkscreen(clearance=0.2)
+        0
+        """
+
+        # imported here, because the silkscreen util depends on the nodes
+        from KicadModTree.util.silkscreen_util import clipSilkscreen
+        return clipSilkscreen(self, clearance=clearance, layers=layers)
+
+    def generateCourtyard(self, clearance=0.25, grid=0.01, layer='F.CrtYd', width=0.05, body_layers=None):
+        r"""Add a courtyard around the pads and the body of the footprint
+
+        Should be called after the pads and the body are complete, see
+        :func:`KicadModTree.util.courtyard_util.generateCourtyard` for details.
+
+        :param clearance:
+            distance between the courtyard and the pads and the body (default: 0.25)
+        :type clearance: ``float``
+        :param grid:
+            grid of the courtyard lines (default: 0.01)
+        :type grid: ``float``
+        :param layer:
+            layer of the courtyard (default: 'F.CrtYd')
+        :type layer: ``str``
+        :param width:
+            width of the courtyard lines (default: 0.05)
+        :type width: ``float``
+        :param body_layers:
+            layers whose extents are the body of the part (default: ['F.Fab'])
+        :type body_layers: ``list(str)``
+
+        :return: list of the added ``Line`` nodes
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> kicad_mod.generateCourtyard(clearance=0.25, grid=0.01)
+        []
+        """
+
+        # imported here, because the courtyard util depends on the nodes
+        from KicadModTree.util.courtyard_util import generateCourtyard
+        return generateCourtyard(self, clearance=clearance, grid=grid, layer=layer, width=width,
+                                 body_layers=body_layers)
+
     def setName(self, name):
         self.name = name
 
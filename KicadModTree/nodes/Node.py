@@ -14,6 +14,8 @@
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 from copy import copy, deepcopy
+from fnmatch import fnmatchcase
+from itertools import chain
 
 from KicadModTree.Vector import *
 
@@ -32,10 +34,41 @@ class RecursionDetectedError(RuntimeError):
         super(RecursionDetectedError, self).__init__(message)
 
 
+class BoundingBoxParameter(object):
+    '''
+    Attribute of a node its own bounding box depends on, assigning a new value clears the cached bounding boxes
+
+    The value is stored in the instance, so reading the attribute is as fast as reading any other one.
+    '''
+
+    def __init__(self, name):
+        self.name = name
+
+    def __set__(self, node, value):
+        node.__dict__[self.name] = value
+        node.invalidateBoundingBox()
+
+
 class Node(object):
+    # affine transformation (a, b, c, d, tx, ty, rotation) which describes how a point in the coordinate system of
+    # this node is mapped into the coordinate system of the root node:
+    #   x' = a*x + b*y + tx, y' = c*x + d*y + ty, rotation' = rotation + rotation_offset
+    IDENTITY_TRANSFORMATION = (1., 0., 0., 1., 0., 0., 0)
+
+    # cache of the composed transformation, None if not calculated yet
+    _real_transformation = None
+
+    # cache of the virtual childs created by _createVirtualChilds, None if not created yet
+    _virtual_childs = None
+
+    # cache of the bounding boxes of this node and all of its childs as (min_x, min_y, max_x, max_y) or None,
+    # by the (frozen) set of layers they are filtered with. None if nothing was calculated yet
+    _bounding_boxes = None
+
     def __init__(self):
         self._parent = None
         self._childs = []
+        self._real_transformation = None
 
     def append(self, node):
         '''
@@ -50,6 +83,8 @@ class Node(object):
         self._childs.append(node)
 
         node._parent = self
+        node._invalidateTransformation()
+        self.invalidateBoundingBox()
 
     def extend(self, nodes):
         '''
@@ -68,8 +103,10 @@ class Node(object):
         # when all went smooth by now, we can set the parent nodes to ourself
         for node in new_nodes:
             node._parent = self
+            node._invalidateTransformation()
 
         self._childs.extend(new_nodes)
+        self.invalidateBoundingBox()
 
     def remove(self, node):
         '''
@@ -82,6 +119,8 @@ class Node(object):
             self._childs.remove(node)
 
         node._parent = None
+        node._invalidateTransformation()
+        self.invalidateBoundingBox()
 
     def insert(self, node):
         '''
@@ -99,13 +138,34 @@ class Node(object):
     def copy(self):
         copy = deepcopy(self)
         copy._parent = None
+        copy._invalidateTransformation()
         return copy
 
     def serialize(self):
-        nodes = [self]
-        for child in self.getAllChilds():
-            nodes += child.serialize()
-        return nodes
+        return list(self.iterNodes())
+
+    def iterNodes(self, virtual=True):
+        '''
+        iterate over this node and all of its childs, depth first with the normal childs before the virtual ones
+
+        The tree is walked with an explicit stack, so neither deep trees nor large ones build intermediate lists.
+
+        :param virtual: include virtual childs (and their childs)
+        '''
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+
+            # pushed in reverse order, so the first child is the next node which is returned
+            if virtual:
+                virtual_childs = node.getVirtualChilds()
+                if virtual_childs:
+                    stack.extend(reversed(virtual_childs))
+
+            normal_childs = node.getNormalChilds()
+            if normal_childs:
+                stack.extend(reversed(normal_childs))
 
     def getNormalChilds(self):
         '''
@@ -116,12 +176,35 @@ class Node(object):
     def getVirtualChilds(self):
         '''
         Get virtual childs of this node
+
+        The childs are created by _createVirtualChilds when they are requested for the first time, and are reused
+        until invalidateVirtualChilds is called.
+        '''
+        virtual_childs = self._virtual_childs
+        if virtual_childs is None:
+            virtual_childs = self._virtual_childs = self._createVirtualChilds()
+        return virtual_childs
+
+    def _createVirtualChilds(self):
+        '''
+        Create the virtual childs of this node, overwritten by nodes which generate childs from their parameters
         '''
         return []
 
+    def invalidateVirtualChilds(self):
+        '''
+        Create the virtual childs again on the next request
+
+        Has to be called whenever a parameter of the node is changed after the childs could have been requested.
+        '''
+        self._virtual_childs = None
+        self.invalidateBoundingBox()
+
     def getAllChilds(self):
         '''
         Get virtual and normal childs of this node
+
+        Builds a new list, the tree walks of this module iterate over both lists with itertools.chain instead.
         '''
         return self.getNormalChilds() + self.getVirtualChilds()
 
@@ -142,38 +225,192 @@ class Node(object):
 
         return self.getParent().getRootNode()
 
+    def getTransformation(self):
+        '''
+        get the transformation which is applied by this node to all of its childs
+
+        :return: affine transformation as tuple (a, b, c, d, tx, ty, rotation), or None if nothing is transformed
+        '''
+        return None
+
+    def getRealTransformation(self):
+        '''
+        get the composed transformation of this node and all of its parents
+
+        The result is cached, and invalidated as soon as the node (or one of its parents) is moved in the tree.
+
+        :return: affine transformation as tuple (a, b, c, d, tx, ty, rotation)
+        '''
+        real_transformation = self._real_transformation
+        if real_transformation is not None:
+            return real_transformation
+
+        own = self.getTransformation()
+        if self._parent is None:
+            parent = Node.IDENTITY_TRANSFORMATION
+        else:
+            parent = self._parent.getRealTransformation()
+
+        if own is None:
+            real_transformation = parent
+        elif parent is Node.IDENTITY_TRANSFORMATION:
+            real_transformation = own
+        else:
+            pa, pb, pc, pd, ptx, pty, prot = parent
+            a, b, c, d, tx, ty, rot = own
+            real_transformation = (pa*a + pb*c, pa*b + pb*d,
+                                   pc*a + pd*c, pc*b + pd*d,
+                                   pa*tx + pb*ty + ptx, pc*tx + pd*ty + pty,
+                                   rot + prot)
+
+        self._real_transformation = real_transformation
+        return real_transformation
+
+    def _invalidateTransformation(self):
+        '''
+        clear the cached transformation of this node and all of its childs
+        '''
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+
+            # when a node has no cached transformation, none of its childs can have one (or a cached bounding box)
+            if node._real_transformation is None:
+                continue
+
+            node._real_transformation = None
+            node._bounding_boxes = None
+            nodes.extend(node._childs)
+
+            # virtual childs which do not exist yet can not have cached transformations either
+            if node._virtual_childs:
+                nodes.extend(node._virtual_childs)
+
+    def _transformationChanged(self):
+        '''
+        called by nodes whose own transformation was changed, the childs are placed again on the next request
+        '''
+        self._invalidateTransformation()
+        self.invalidateBoundingBox()
+
     def getRealPosition(self, coordinate, rotation=None):
         '''
         return position of point after applying all transformation and rotation operations
         '''
-        if not self._parent:
-            if rotation is None:
-                # TODO: most of the points are 2D Nodes
-                return Vector3D(coordinate)
-            else:
-                return Vector3D(coordinate), rotation
+        transformation = self.getRealTransformation()
+
+        if transformation is Node.IDENTITY_TRANSFORMATION:
+            # TODO: most of the points are 2D Nodes
+            position = Vector3D(coordinate)
+        else:
+            if not isinstance(coordinate, Vector2D):
+                coordinate = Vector2D(coordinate)
+
+            a, b, c, d, tx, ty, rotation_offset = transformation
+            x, y = coordinate.x, coordinate.y
+            position = Vector3D(a*x + b*y + tx, c*x + d*y + ty)
+
+            if rotation is not None:
+                rotation += rotation_offset
+
+        if rotation is None:
+            return position
+        else:
+            return position, rotation
+
+    def getRealPositions(self, coordinates):
+        '''
+        return positions of multiple points after applying all transformation and rotation operations
+
+        The transformation is only calculated once for all points.
+        '''
+        transformation = self.getRealTransformation()
+
+        if transformation is Node.IDENTITY_TRANSFORMATION:
+            return [Vector3D(coordinate) for coordinate in coordinates]
+
+        a, b, c, d, tx, ty, _ = transformation
+        positions = []
+        for coordinate in coordinates:
+            if not isinstance(coordinate, Vector2D):
+                coordinate = Vector2D(coordinate)
+
+            x, y = coordinate.x, coordinate.y
+            positions.append(Vector3D(a*x + b*y + tx, c*x + d*y + ty))
+
+        return positions
+
+    def calculateBoundingBox(self, outline=None, layers=None):
+        '''
+        calculate the bounding box of this node and all of its childs, in the coordinate system of the root node
 
-        return self._parent.getRealPosition(coordinate, rotation)
+        The result is cached for every node of the tree, so repeated requests (also for parts of the tree) are cheap.
+        The cache is cleared when the tree is changed, when a node is rotated or translated, and when one of the
+        parameters of the geometry is assigned (for example ``line.start_pos = Vector2D(1, 0)`` or
+        ``translation.offset_x = 1``). Changes in place, like ``line.start_pos.x = 1`` or ``polygon.nodes.append(p)``,
+        are not detected. Whoever changes a node this way has to call invalidateBoundingBox afterwards.
 
-    def calculateBoundingBox(self, outline=None):
-        min_x, min_y = 0, 0
-        max_x, max_y = 0, 0
+        :param outline: additional outline {'min': Vector2D, 'max': Vector2D} which is included in the result
+        :param layers: only consider nodes on one of those layers (a single layer name is accepted as well)
+        :return: {'min': Vector2D, 'max': Vector2D}, or None if there is nothing (on the requested layers)
+        '''
+        if isinstance(layers, str):
+            layers = [layers]
+        key = None if layers is None else frozenset(layers)
 
+        box = self._getBoundingBox(key)
         if outline:
-            min_x = outline['min']['x']
-            min_y = outline['min']['y']
-            max_x = outline['max']['x']
-            max_y = outline['max']['y']
+            box = _mergeBoundingBoxes(box, (outline['min']['x'], outline['min']['y'],
+                                            outline['max']['x'], outline['max']['y']))
+
+        if box is None:
+            return None
+        return {'min': Vector2D(box[0], box[1]), 'max': Vector2D(box[2], box[3])}
+
+    def _getBoundingBox(self, key):
+        # post-order walk with an explicit stack, childs with a cached box are not visited again
+        stack = [(self, False)]
+        while stack:
+            node, childs_done = stack.pop()
+            if node._bounding_boxes is not None and key in node._bounding_boxes:
+                continue
+
+            if not childs_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in chain(node.getNormalChilds(), node.getVirtualChilds()))
+                continue
+
+            # the cached transformation is required to invalidate the box when the node is moved
+            node.getRealTransformation()
+            box = node._calculateOwnBoundingBox(key)
+            for child in chain(node.getNormalChilds(), node.getVirtualChilds()):
+                box = _mergeBoundingBoxes(box, child._bounding_boxes[key])
+
+            if node._bounding_boxes is None:
+                node._bounding_boxes = {}
+            node._bounding_boxes[key] = box
+
+        return self._bounding_boxes[key]
+
+    def _calculateOwnBoundingBox(self, layers):
+        '''
+        Bounding box of the node itself without its childs, overwritten by nodes which are drawn
 
-        for child in self.getAllChilds():
-            child_outline = child.calculateBoundingBox()
+        :param layers: frozenset of layers the node has to be on to be considered, or None for all layers
+        :return: (min_x, min_y, max_x, max_y) in the coordinate system of the root node, or None
+        '''
+        return None
 
-            min_x = min([min_x, child_outline['min']['x']])
-            min_y = min([min_y, child_outline['min']['y']])
-            max_x = max([max_x, child_outline['max']['x']])
-            max_y = max([max_y, child_outline['max']['y']])
+    def invalidateBoundingBox(self):
+        '''
+        Calculate the bounding box of this node and of all of its parents again on the next request
 
-        return {'min': Vector2D(min_x, min_y), 'max': Vector2D(max_x, max_y)}
+        Has to be called whenever a parameter of the node is changed after the bounding box could have been requested.
+        '''
+        node = self
+        while node is not None:
+            node._bounding_boxes = None
+            node = node._parent
 
     def _getRenderTreeText(self):
         '''
@@ -222,8 +459,42 @@ class Node(object):
         rendered_nodes.add(self)
 
         tree_str = "{0} {1}".format(self._getRenderTreeSymbol(), self._getRenderTreeText())
-        for child in self.getAllChilds():
+        for child in chain(self.getNormalChilds(), self.getVirtualChilds()):
             tree_str += '\n  '
             tree_str += '  '.join(child.getCompleteRenderTree(rendered_nodes).splitlines(True))
 
         return tree_str
+
+
+def _mergeBoundingBoxes(box, other):
+    if box is None:
+        return other
+    if other is None:
+        return box
+    return (min(box[0], other[0]), min(box[1], other[1]), max(box[2], other[2]), max(box[3], other[3]))
+
+
+def _isOnLayers(node_layers, layers):
+    '''
+    check if one of the layers of a node is in the set of requested layers, None requests all layers
+
+    Wildcards like "*.Cu" are handled on both sides, "F&B.Cu" stands for "F.Cu" and "B.Cu".
+    '''
+    if layers is None:
+        return True
+
+    for node_layer in node_layers:
+        if node_layer in layers:
+            return True
+        for layer in layers:
+            if fnmatchcase(layer, node_layer) or fnmatchcase(node_layer, layer):
+                return True
+            if node_layer == 'F&B.Cu' and layer in ('F.Cu', 'B.Cu'):
+                return True
+    return False
+
+
+def _pointsBoundingBox(points):
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return (min(xs), min(ys), max(xs), max(ys))
@@ -14,7 +14,7 @@
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 from KicadModTree.Vector import *
-from KicadModTree.nodes.Node import Node
+from KicadModTree.nodes.Node import Node, BoundingBoxParameter, _isOnLayers, _pointsBoundingBox
 import math
 from KicadModTree.util.geometric_util import geometricArc, BaseNodeIntersection
 
@@ -52,6 +52,11 @@ class Arc(Node, geometricArc):
     >>> Arc(center=[0, 0], start=[-1, 0], angle=180, layer='F.SilkS')
     """
 
+    center_pos = BoundingBoxParameter('center_pos')
+    start_pos = BoundingBoxParameter('start_pos')
+    angle = BoundingBoxParameter('angle')
+    layer = BoundingBoxParameter('layer')
+
     def __init__(self, **kwargs):
         Node.__init__(self)
         geometricArc.__init__(self, **kwargs)
@@ -68,6 +73,34 @@ class Arc(Node, geometricArc):
             layer=self.layer, width=self.width
             )
 
+    def rotate(self, angle, origin=(0, 0), use_degrees=True):
+        r""" Rotate arc around given origin
+
+        :params:
+            * *angle* (``float``)
+                rotation angle
+            * *origin* (``Vector2D``)
+                origin point for the rotation. default: (0, 0)
+            * *use_degrees* (``boolean``)
+                rotation angle is given in degrees. default:True
+        """
+
+        geometricArc.rotate(self, angle=angle, origin=origin, use_degrees=use_degrees)
+        self.invalidateBoundingBox()
+        return self
+
+    def translate(self, distance_vector):
+        r""" Translate arc
+
+        :params:
+            * *distance_vector* (``Vector2D``)
+                2D vector defining by how much and in what direction to translate.
+        """
+
+        geometricArc.translate(self, distance_vector)
+        self.invalidateBoundingBox()
+        return self
+
     def cut(self, *other):
         r""" cut line with given other element
 
@@ -82,30 +115,27 @@ class Arc(Node, geometricArc):
 
         return result
 
-    def calculateBoundingBox(self):
-        # TODO: finish implementation
-        min_x = min(self.start_pos.x, self._calulateEndPos().x)
-        min_y = min(self.start_pos.x, self._calulateEndPos().y)
-        max_x = max(self.start_pos.x, self._calulateEndPos().x)
-        max_y = max(self.start_pos.x, self._calulateEndPos().y)
-
-        '''
-        for angle in range(4):
-            float_angle = angle * math.pi/2.
-
-            start_angle = _calculateStartAngle(self)
-            end_angle = start_angle + math.radians(self.angle)
-
-            # TODO: +- pi border
-            if float_angle < start_angle:
-                continue
-            if float_angle > end_angle:
-                continue
-
-            print("TODO: add angle side: {1}".format(float_angle))
-        '''
-
-        return Node.calculateBoundingBox({'min': Vector2D((min_x, min_y)), 'max': Vector2D((max_x, max_y))})
+    def _calculateOwnBoundingBox(self, layers):
+        if not _isOnLayers([self.layer], layers):
+            return None
+
+        center, start = self.getRealPositions([self.center_pos, self.start_pos])
+        radius = math.hypot(start.x - center.x, start.y - center.y)
+        start_angle = math.atan2(start.y - center.y, start.x - center.x)
+        # a mirroring transformation turns the direction of the arc around
+        a, b, c, d = self.getRealTransformation()[0:4]
+        end_angle = start_angle + (math.radians(self.angle) if a*d - b*c > 0 else -math.radians(self.angle))
+
+        # the extrema are the end points, and the points where the arc crosses one of the axes through the center
+        points = [(start.x, start.y), (center.x + radius*math.cos(end_angle), center.y + radius*math.sin(end_angle))]
+        low, high = sorted((start_angle, end_angle))
+        quadrant = math.ceil(low / (math.pi/2))
+        while quadrant * (math.pi/2) < high:
+            axis_angle = quadrant * (math.pi/2)
+            points.append((center.x + radius*math.cos(axis_angle), center.y + radius*math.sin(axis_angle)))
+            quadrant += 1
+
+        return _pointsBoundingBox(points)
 
     def _getRenderTreeText(self):
         render_strings = ['fp_arc']
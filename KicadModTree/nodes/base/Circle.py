@@ -14,7 +14,8 @@
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 from KicadModTree.Vector import *
-from KicadModTree.nodes.Node import Node
+from KicadModTree.nodes.Node import Node, BoundingBoxParameter, _isOnLayers
+from KicadModTree.nodes.base.Arc import Arc
 from KicadModTree.util.geometric_util import geometricCircle, BaseNodeIntersection
 
 
@@ -40,6 +41,10 @@ class Circle(Node, geometricCircle):
     >>> Circle(center=[0, 0], radius=1.5, layer='F.SilkS')
     """
 
+    center_pos = BoundingBoxParameter('center_pos')
+    radius = BoundingBoxParameter('radius')
+    layer = BoundingBoxParameter('layer')
+
     def __init__(self, **kwargs):
         Node.__init__(self)
         geometricCircle.__init__(self, Vector2D(kwargs['center']), float(kwargs['radius']))
@@ -60,6 +65,7 @@ class Circle(Node, geometricCircle):
         """
 
         self.center_pos.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        self.invalidateBoundingBox()
         return self
 
     def translate(self, distance_vector):
@@ -71,21 +77,36 @@ class Circle(Node, geometricCircle):
         """
 
         self.center_pos += distance_vector
+        self.invalidateBoundingBox()
         return self
 
+    def copyReplaceGeometry(self, geometry):
+        if isinstance(geometry, geometricCircle):
+            return Circle(center=geometry.center_pos, radius=geometry.radius, layer=self.layer, width=self.width)
+        return Arc(geometry=geometry, layer=self.layer, width=self.width)
+
     def cut(self, *other):
-        raise NotImplemented("cut for circles not yet implemented")
+        r""" cut circle with given other element
+
+        :params:
+            * *other* (``Line``, ``Circle``, ``Arc``)
+                cut the element on any intersection with the given geometric element
+        """
+        result = []
+        for g in geometricCircle.cut(self, *other):
+            result.append(self.copyReplaceGeometry(g))
+
+        return result
 
     def getRadius(self):
         return self.radius
 
-    def calculateBoundingBox(self):
-        min_x = self.center_pos.x-self.radius
-        min_y = self.center_pos.y-self.radius
-        max_x = self.center_pos.x+self.radius
-        max_y = self.center_pos.y+self.radius
+    def _calculateOwnBoundingBox(self, layers):
+        if not _isOnLayers([self.layer], layers):
+            return None
 
-        return Node.calculateBoundingBox({'min': ParseXY(min_x, min_y), 'max': ParseXY(max_x, max_y)})
+        center = self.getRealPosition(self.center_pos)
+        return (center.x - self.radius, center.y - self.radius, center.x + self.radius, center.y + self.radius)
 
     def _getRenderTreeText(self):
         render_strings = ['fp_circle']
@@ -14,7 +14,7 @@
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 from KicadModTree.Vector import *
-from KicadModTree.nodes.Node import Node
+from KicadModTree.nodes.Node import Node, BoundingBoxParameter, _isOnLayers, _pointsBoundingBox
 from KicadModTree.util.geometric_util import geometricLine, BaseNodeIntersection
 
 
@@ -40,6 +40,10 @@ class Line(Node, geometricLine):
     >>> Line(start=[1, 0], end=[-1, 0], layer='F.SilkS')
     """
 
+    start_pos = BoundingBoxParameter('start_pos')
+    end_pos = BoundingBoxParameter('end_pos')
+    layer = BoundingBoxParameter('layer')
+
     def __init__(self, **kwargs):
         Node.__init__(self)
         if 'geometry' in kwargs:
@@ -67,6 +71,34 @@ class Line(Node, geometricLine):
             layer=self.layer, width=self.width
             )
 
+    def rotate(self, angle, origin=(0, 0), use_degrees=True):
+        r""" Rotate line around given origin
+
+        :params:
+            * *angle* (``float``)
+                rotation angle
+            * *origin* (``Vector2D``)
+                origin point for the rotation. default: (0, 0)
+            * *use_degrees* (``boolean``)
+                rotation angle is given in degrees. default:True
+        """
+
+        geometricLine.rotate(self, angle=angle, origin=origin, use_degrees=use_degrees)
+        self.invalidateBoundingBox()
+        return self
+
+    def translate(self, distance_vector):
+        r""" Translate line
+
+        :params:
+            * *distance_vector* (``Vector2D``)
+                2D vector defining by how much and in what direction to translate.
+        """
+
+        geometricLine.translate(self, distance_vector)
+        self.invalidateBoundingBox()
+        return self
+
     def cut(self, *other):
         r""" cut line with given other element
 
@@ -93,13 +125,8 @@ class Line(Node, geometricLine):
 
         return render_text
 
-    def calculateBoundingBox(self):
-        render_start_pos = self.getRealPosition(self.start_pos)
-        render_end_pos = self.getRealPosition(self.end_pos)
-
-        min_x = min([render_start_pos.x, render_end_pos.x])
-        min_y = min([render_start_pos.y, render_end_pos.y])
-        max_x = max([render_start_pos.x, render_end_pos.x])
-        max_y = max([render_start_pos.y, render_end_pos.y])
+    def _calculateOwnBoundingBox(self, layers):
+        if not _isOnLayers([self.layer], layers):
+            return None
 
-        return Node.calculateBoundingBox({'min': Vector2D(min_x, min_y), 'max': Vector2D(max_x, max_y)})
+        return _pointsBoundingBox([(p.x, p.y) for p in self.getRealPositions([self.start_pos, self.end_pos])])
@@ -16,7 +16,7 @@
 
 from KicadModTree.util.paramUtil import *
 from KicadModTree.Vector import *
-from KicadModTree.nodes.Node import Node
+from KicadModTree.nodes.Node import Node, BoundingBoxParameter, _isOnLayers, _mergeBoundingBoxes
 from KicadModTree.util.kicad_util import lispString
 from KicadModTree.nodes.base.Arc import Arc
 from KicadModTree.nodes.base.Circle import Circle
@@ -193,6 +193,16 @@ class Pad(Node):
     ...     at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT)
     """
 
+    at = BoundingBoxParameter('at')
+    rotation = BoundingBoxParameter('rotation')
+    size = BoundingBoxParameter('size')
+    offset = BoundingBoxParameter('offset')
+    shape = BoundingBoxParameter('shape')
+    anchor_shape = BoundingBoxParameter('anchor_shape')
+    primitives = BoundingBoxParameter('primitives')
+    round_radius_handler = BoundingBoxParameter('round_radius_handler')
+    layers = BoundingBoxParameter('layers')
+
     TYPE_THT = 'thru_hole'
     TYPE_SMT = 'smd'
     TYPE_CONNECT = 'connect'
@@ -364,6 +374,7 @@ class Pad(Node):
 
         # subtraction because kicad text field rotation is the wrong way round
         self.rotation -= a
+        self.invalidateBoundingBox()
         return self
 
     def translate(self, distance_vector):
@@ -375,11 +386,20 @@ class Pad(Node):
         """
 
         self.at += distance_vector
+        self.invalidateBoundingBox()
         return self
 
-    # calculate the outline of a pad
-    def calculateBoundingBox(self):
-        return Node.calculateBoundingBox(self)
+    def _calculateOwnBoundingBox(self, layers):
+        if not _isOnLayers(self.layers, layers):
+            return None
+
+        # the outline of the copper, including the primitives of custom pads
+        from KicadModTree.util.silkscreen_util import padKeepouts
+        box = None
+        for keepout in padKeepouts(self, 0):
+            min_x, max_x, min_y, max_y = keepout.bounding_box
+            box = _mergeBoundingBoxes(box, (min_x, min_y, max_x, max_y))
+        return box
 
     def _getRenderTreeText(self):
         render_strings = ['pad']
@@ -15,7 +15,7 @@
 
 from KicadModTree.PolygonPoints import *
 from KicadModTree.Vector import *
-from KicadModTree.nodes.Node import Node
+from KicadModTree.nodes.Node import Node, BoundingBoxParameter, _isOnLayers, _pointsBoundingBox
 
 
 class Polygon(Node):
@@ -42,6 +42,9 @@ class Polygon(Node):
     >>> Polygon(nodes=[[-2, 0], [0, -2], [4, 0], [0, 2]], layer='F.SilkS')
     """
 
+    nodes = BoundingBoxParameter('nodes')
+    layer = BoundingBoxParameter('layer')
+
     def __init__(self, **kwargs):
         Node.__init__(self)
         self.nodes = PolygonPoints(**kwargs)
@@ -62,6 +65,7 @@ class Polygon(Node):
         """
 
         self.nodes.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        self.invalidateBoundingBox()
         return self
 
     def translate(self, distance_vector):
@@ -73,10 +77,14 @@ class Polygon(Node):
         """
 
         self.nodes.translate(distance_vector)
+        self.invalidateBoundingBox()
         return self
 
-    def calculateBoundingBox(self):
-        return nodes.calculateBoundingBox()
+    def _calculateOwnBoundingBox(self, layers):
+        if not _isOnLayers([self.layer], layers) or not len(self.nodes):
+            return None
+
+        return _pointsBoundingBox([(p.x, p.y) for p in self.getRealPositions(self.nodes)])
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -106,3 +114,4 @@ class Polygon(Node):
         :param other: the other polygon
         """
         self.nodes.cut(other.nodes)
+        self.invalidateBoundingBox()
@@ -14,7 +14,7 @@
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
 from KicadModTree.Vector import *
-from KicadModTree.nodes.Node import Node
+from KicadModTree.nodes.Node import Node, BoundingBoxParameter, _isOnLayers, _pointsBoundingBox
 
 
 class Text(Node):
@@ -51,6 +51,12 @@ class Text(Node):
     >>> Text(type='user', text='test', at=[0, 0], layer='Cmts.User')
     """
 
+    text = BoundingBoxParameter('text')
+    at = BoundingBoxParameter('at')
+    rotation = BoundingBoxParameter('rotation')
+    size = BoundingBoxParameter('size')
+    layer = BoundingBoxParameter('layer')
+
     TYPE_REFERENCE = 'reference'
     TYPE_VALUE = 'value'
     TYPE_USER = 'user'
@@ -93,6 +99,7 @@ class Text(Node):
 
         # subtraction because kicad text field rotation is the wrong way round
         self.rotation -= a
+        self.invalidateBoundingBox()
         return self
 
     def translate(self, distance_vector):
@@ -104,18 +111,20 @@ class Text(Node):
         """
 
         self.at += distance_vector
+        self.invalidateBoundingBox()
         return self
 
-    def calculateBoundingBox(self):
-        width = len(self.text)*self.size['x']
-        height = self.size['y']
+    def _calculateOwnBoundingBox(self, layers):
+        if not _isOnLayers([self.layer], layers):
+            return None
 
-        min_x = self.at['x']-width/2.
-        min_y = self.at['y']-height/2.
-        max_x = self.at['x']+width/2.
-        max_y = self.at['y']+height/2.
+        # estimated size of the text, every character is assumed to be as wide as the font size
+        width = len(self.text)*self.size.x
+        height = self.size.y
 
-        return Node.calculateBoundingBox({'min': Vector2D(min_x, min_y), 'max': Vector2D(max_x, max_y)})
+        at, rotation = self.getRealPosition(self.at, self.rotation)
+        corners = [Vector2D(x*width/2., y*height/2.).rotate(-rotation) for x, y in ((-1, -1), (1, -1), (1, 1), (-1, 1))]
+        return _pointsBoundingBox([(at.x + p.x, at.y + p.y) for p in corners])
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
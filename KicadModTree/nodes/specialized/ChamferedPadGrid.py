@@ -291,6 +291,7 @@ class ChamferedPadGrid(Node):
         )
         self.chamfer_size = temp_pad.chamferAvoidCircle(
             center=relative_center, diameter=diameter, clearance=clearance)
+        self.invalidateVirtualChilds()
         return self.chamfer_size
 
     def __padCornerSelection(self, idx_x, idx_y):
@@ -351,7 +352,7 @@ class ChamferedPadGrid(Node):
                     ))
         return pads
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         return self._generatePads()
 
     def __copy__(self):
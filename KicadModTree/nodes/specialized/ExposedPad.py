@@ -172,6 +172,7 @@ class ExposedPad(Node):
         self.via_layout = toIntArray(layout, min_value=0)
         if self.via_layout[0] == 0 or self.via_layout[1] == 0:
             self.has_vias = False
+        self.invalidateVirtualChilds()
         return self.has_vias
 
     def __initViaGrid(self, **kwargs):
@@ -551,7 +552,7 @@ class ExposedPad(Node):
 
         return pads
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         # traceback.print_stack()
         if self.has_vias:
             self.round_radius_handler.limitMaxRadius(self.via_size/2)
@@ -59,7 +59,7 @@ class FilledRect(Node):
 
         self.virtual_childs = [rect_line, rect_fill]
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         return self.virtual_childs
 
     def _getRenderTreeText(self):
@@ -294,5 +294,5 @@ class PadArray(Node):
 
         return pads
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         return self.virtual_childs
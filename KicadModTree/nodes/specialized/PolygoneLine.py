@@ -62,7 +62,7 @@ class PolygoneLine(Node):
 
         return nodes
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         return self.virtual_childs
 
     def _getRenderTreeText(self):
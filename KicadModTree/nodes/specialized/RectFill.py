@@ -69,7 +69,7 @@ class RectFill(Node):
 
         return nodes
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         return self.virtual_childs
 
     def _getRenderTreeText(self):
@@ -19,6 +19,7 @@ from copy import copy
 from KicadModTree.nodes.Node import Node
 from KicadModTree.util.paramUtil import *
 from KicadModTree.util.geometric_util import geometricArc, geometricLine, BaseNodeIntersection
+from KicadModTree.util.batch_util import intersectLinesWithCircles
 from KicadModTree.Vector import *
 from KicadModTree.nodes.base.Pad import Pad
 from KicadModTree.nodes.base.Circle import Circle
@@ -61,7 +62,7 @@ class RingPadPrimitive(Node):
                     number=self.number
                     )
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         return [Pad(number=self.number,
                     type=Pad.TYPE_SMT, shape=Pad.SHAPE_CUSTOM,
                     at=(self.at+Vector2D(self.radius, 0)),
@@ -116,6 +117,8 @@ class ArcPadPrimitive(Node):
         self.setLimitingLines(**kwargs)
 
     def setRoundRadius(self, **kwargs):
+        self.invalidateVirtualChilds()
+
         if 'round_radius' in kwargs:
             self.round_radius = kwargs['round_radius']
             return
@@ -127,6 +130,8 @@ class ArcPadPrimitive(Node):
             self.round_radius = min(r, max_round_radius)
 
     def setLimitingLines(self, **kwargs):
+        self.invalidateVirtualChilds()
+
         if kwargs.get('start_line') is not None:
             self.start_line = geometricLine(geometry=kwargs.get('start_line'))
         else:
@@ -165,6 +170,7 @@ class ArcPadPrimitive(Node):
             self.start_line.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
         if self.end_line is not None:
             self.end_line.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        self.invalidateVirtualChilds()
         return self
 
     def translate(self, distance_vector):
@@ -180,6 +186,7 @@ class ArcPadPrimitive(Node):
             self.start_line.translate(distance_vector)
         if self.end_line is not None:
             self.end_line.translate(distance_vector)
+        self.invalidateVirtualChilds()
         return self
 
     def _getStep(self):
@@ -218,16 +225,20 @@ class ArcPadPrimitive(Node):
     def __cutArcs(self, arcs, line, index_to_keep):
         if line is None:
             return arcs
+        intersections = [[] for arc in arcs]
+        for i, j, point in intersectLinesWithCircles([line], arcs):
+            intersections[j].append(point)
+
         result = []
-        for current_arc in arcs:
+        for current_arc, points in zip(arcs, intersections):
             try:
-                result.append(current_arc.cut(line)[index_to_keep])
+                result.append(current_arc.copyReplaceGeometry(current_arc.cutAtPoints(points)[index_to_keep]))
             except IndexError as e:
                 raise ValueError("Cutting the arc primitive with one of its endlines " +
                                  "did not result in the expected number of arcs.")
         return result
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         at = self.reference_arc.getMidPoint()
         primitives = self._getArcPrimitives()
         for p in primitives:
@@ -454,5 +465,5 @@ class RingPad(Node):
                                  layers=['F.Cu'],
                                  ))
 
-    def getVirtualChilds(self):
+    def _createVirtualChilds(self):
         return self.pads
@@ -37,20 +37,27 @@ class Translation(Node):
         self.offset_x = x
         self.offset_y = y
 
-    def getRealPosition(self, coordinate, rotation=None):
-        parsed_coordinate = Vector2D(coordinate)
-
-        # calculate translation
-        translation_coordinate = {'x': parsed_coordinate.x + self.offset_x,
-                                  'y': parsed_coordinate.y + self.offset_y}
-
-        if not self._parent:
-            if rotation is None:
-                return translation_coordinate
-            else:
-                return translation_coordinate, rotation
-        else:
-            return self._parent.getRealPosition(translation_coordinate, rotation)
+    @property
+    def offset_x(self):
+        return self._offset_x
+
+    @offset_x.setter
+    def offset_x(self, x):
+        # the cached positions and bounding boxes of the childs depend on the offset
+        self._offset_x = x
+        self._transformationChanged()
+
+    @property
+    def offset_y(self):
+        return self._offset_y
+
+    @offset_y.setter
+    def offset_y(self, y):
+        self._offset_y = y
+        self._transformationChanged()
+
+    def getTransformation(self):
+        return (1., 0., 0., 1., self.offset_x, self.offset_y, 0)
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -49,6 +49,29 @@ class Vector2DTests(unittest.TestCase):
         # TODO: invalid type tests
         # TODO: tests if int is always converted to float
 
+    def test_init_types(self):
+        p1 = Vector2D(1, 2)
+        self.assertIs(type(p1.x), float)
+        self.assertIs(type(p1.y), float)
+
+        p2 = Vector2D(Vector3D(1, 2, 3))
+        self.assertIs(type(p2), Vector2D)
+        self.assertEqual((p2.x, p2.y), (1, 2))
+
+        p3 = Vector2D()
+        self.assertEqual((p3.x, p3.y), (0, 0))
+
+        with self.assertRaises(TypeError):
+            Vector2D(1)
+        with self.assertRaises(TypeError):
+            Vector2D([1, 2, 3])
+        with self.assertRaises(TypeError):
+            Vector2D("1, 2")
+
+        # vectors use __slots__, so typos in attribute names are not silently accepted
+        with self.assertRaises(AttributeError):
+            p1.z = 3
+
     def test_round_to(self):
         p1 = Vector2D([1.234, 5.678]).round_to(0)
         self.assertAlmostEqual(p1.x, 1.234)
@@ -93,6 +116,38 @@ class Vector2DTests(unittest.TestCase):
 
         # TODO: invalid type tests
 
+    def test_arithmetic_operands(self):
+        p1 = Vector2D(1, 2)
+        for operand in [Vector2D(3, 4), Vector3D(3, 4, 5), [3, 4], (3, 4), {'x': 3, 'y': 4}]:
+            p2 = p1 + operand
+            self.assertIs(type(p2), Vector2D)
+            self.assertEqual((p2.x, p2.y), (4, 6))
+            self.assertIs(type(p2.x), float)
+
+        # the operands are not modified
+        self.assertEqual((p1.x, p1.y), (1, 2))
+
+        p3 = p1
+        p3 += [1, 1]
+        p3 -= 0.5
+        self.assertIs(p3, p1)
+        self.assertEqual((p1.x, p1.y), (1.5, 2.5))
+
+        p4 = -p1
+        self.assertEqual((p4.x, p4.y), (-1.5, -2.5))
+
+        p5 = p1.__copy__()
+        p5.x = 0
+        self.assertEqual(p1.x, 1.5)
+
+        self.assertAlmostEqual(Vector2D(1, 1).distance_to([4, 5]), 5)
+        self.assertAlmostEqual(Vector2D(1, 1).distance_to(Vector2D(4, 5)), 5)
+        self.assertAlmostEqual(Vector2D(1, 1).distance_to(5), math.sqrt(32))
+
+        p6 = Vector2D(1, 2).to_homogeneous()
+        self.assertIs(type(p6), Vector3D)
+        self.assertEqual((p6.x, p6.y, p6.z), (1, 2, 1))
+
     def test_sub(self):
         p1 = Vector2D([1, 2])
         self.assertEqual(p1.x, 1)
@@ -75,6 +75,24 @@ class Vector3DTests(unittest.TestCase):
         # TODO: invalid type tests
         # TODO: tests if int is always converted to float
 
+    def test_init_types(self):
+        p1 = Vector3D(1, 2, 3)
+        self.assertIs(type(p1.x), float)
+        self.assertIs(type(p1.z), float)
+
+        p2 = Vector3D(Vector2D(1, 2))
+        self.assertEqual((p2.x, p2.y, p2.z), (1, 2, 0))
+
+        p3 = Vector3D()
+        self.assertEqual((p3.x, p3.y, p3.z), (0, 0, 0))
+
+        with self.assertRaises(TypeError):
+            Vector3D(1)
+        with self.assertRaises(TypeError):
+            Vector3D([1])
+        with self.assertRaises(TypeError):
+            Vector3D([1, 2, 3, 4])
+
     def test_round_to(self):
         p1 = Vector3D([1.234, 5.678, 9.012]).round_to(0)
         self.assertAlmostEqual(p1.x, 1.234)
@@ -129,6 +147,30 @@ class Vector3DTests(unittest.TestCase):
 
         # TODO: invalid type tests
 
+    def test_arithmetic_operands(self):
+        p1 = Vector3D(1, 2, 3)
+        for operand in [Vector3D(3, 4, 5), [3, 4, 5], (3, 4, 5), {'x': 3, 'y': 4, 'z': 5}]:
+            p2 = p1 + operand
+            self.assertIs(type(p2), Vector3D)
+            self.assertEqual((p2.x, p2.y, p2.z), (4, 6, 8))
+
+        p3 = p1 - Vector2D(1, 1)
+        self.assertEqual((p3.x, p3.y, p3.z), (0, 1, 3))
+
+        # the operands are not modified
+        self.assertEqual((p1.x, p1.y, p1.z), (1, 2, 3))
+
+        p4 = p1
+        p4 += 1
+        p4 += [1, 1]
+        p4 -= Vector2D(1, 1)
+        self.assertIs(p4, p1)
+        self.assertEqual((p1.x, p1.y, p1.z), (2, 3, 4))
+
+        p5 = Vector3D(1, 0, 0).cross_product([0, 1, 0])
+        self.assertEqual((p5.x, p5.y, p5.z), (0, 0, 1))
+        self.assertEqual(Vector3D(1, 2, 3).dot_product((4, 5, 6)), 32)
+
     def test_sub(self):
         p1 = Vector3D([1, 2, 3])
         self.assertEqual(p1.x, 1)
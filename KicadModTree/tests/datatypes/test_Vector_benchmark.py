@@ -0,0 +1,86 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import sys
+import timeit
+import unittest
+
+from KicadModTree.Vector import *
+
+
+# the benchmark takes a while and verifies nothing, it only runs when this environment variable is set.
+# Executing this file as a script runs it as well
+BENCHMARK_ENABLED = os.environ.get('KICADMODTREE_BENCHMARK')
+
+BENCHMARK_OPERATIONS = [
+    ('Vector2D(x, y)', 'Vector2D(1.5, 2.5)'),
+    ('Vector2D(list)', 'Vector2D([1.5, 2.5])'),
+    ('Vector2D(Vector2D)', 'Vector2D(v2)'),
+    ('Vector2D + Vector2D', 'v2 + v2'),
+    ('Vector2D + list', 'v2 + [1, 2]'),
+    ('Vector2D * float', 'v2 * 1.5'),
+    ('Vector2D += Vector2D', 'v2 += v2_step'),
+    ('Vector2D.distance_to', 'v2.distance_to(v2_step)'),
+    ('Vector3D(x, y, z)', 'Vector3D(1.5, 2.5, 3.5)'),
+    ('Vector3D(Vector2D)', 'Vector3D(v2)'),
+    ('Vector3D + Vector3D', 'v3 + v3'),
+    ('Vector3D - float', 'v3 - 1.5'),
+]
+
+BENCHMARK_SETUP = 'from KicadModTree.Vector import Vector2D, Vector3D\n' \
+                  'v2 = Vector2D(1.5, 2.5)\n' \
+                  'v2_step = Vector2D(0.001, 0.001)\n' \
+                  'v3 = Vector3D(1.5, 2.5, 3.5)'
+
+
+def measureOperationsPerSecond(statement, number=20000, repeat=3):
+    r"""Measure how many times per second a statement can be executed
+
+    :param statement: python statement which is measured
+    :param number: number of executions per measurement
+    :param repeat: number of measurements (the fastest one is used)
+    :return: operations per second
+    """
+    best = min(timeit.repeat(statement, setup=BENCHMARK_SETUP, number=number, repeat=repeat))
+    return number / best
+
+
+def runBenchmark(output=None):
+    r"""Measure all operations and print the results
+
+    :param output: stream the results are written to (default: sys.stderr)
+    :return: list of (name, operations per second)
+    """
+    output = sys.stderr if output is None else output
+    results = []
+    for name, statement in BENCHMARK_OPERATIONS:
+        ops = measureOperationsPerSecond(statement)
+        output.write('{name:<24} {ops:>12.0f} ops/s\n'.format(name=name, ops=ops))
+        results.append((name, ops))
+    return results
+
+
+@unittest.skipUnless(BENCHMARK_ENABLED, "set KICADMODTREE_BENCHMARK to run the benchmarks")
+class VectorBenchmarkTests(unittest.TestCase):
+
+    def test_benchmark(self):
+        sys.stderr.write('\n')
+        for name, ops in runBenchmark():
+            self.assertGreater(ops, 0)
+
+
+if __name__ == '__main__':
+    runBenchmark(sys.stdout)
@@ -18,3 +18,18 @@ from .test_kicad5_padshapes import Kicad5PadsTests
 from .test_exposed_pad import ExposedPadTests
 from .test_arc import ArcTests
 from .test_rotation import RotationTests
+from .test_library_builder import LibraryBuilderTests
+from .test_build_cache import BuildCacheTests
+from .test_read_footprint import ReadFootprintTests
+from .test_library_diff import LibraryDiffTests
+from .test_keepout_util import KeepoutUtilTests
+from .test_silkscreen_util import SilkscreenUtilTests
+from .test_batch_util import BatchUtilTests
+from .test_bounding_box import BoundingBoxTests
+from .test_courtyard_util import CourtyardUtilTests
+from .test_polygon_points import PolygonPointsTests
+from .test_mod_argparser import ModArgparserTests
+from .test_yaml_util import YamlUtilTests
+from .test_pin_socket_strips import PinSocketStripsTests
+from .test_ipc_pad_size_calculators import IpcPadSizeCalculatorsTests
+from .test_serializer_benchmark import SerializerBenchmarkTests
@@ -0,0 +1,104 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import math
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util.batch_util import *
+from KicadModTree.util.geometric_util import geometricCircle, geometricLine, BaseNodeIntersection
+
+
+class BatchUtilTests(unittest.TestCase):
+
+    def assertPointsAlmostEqual(self, points, expected):
+        self.assertEqual(len(points), len(expected))
+        for point, expected_point in zip(points, expected):
+            self.assertAlmostEqual(point.x, expected_point[0])
+            self.assertAlmostEqual(point.y, expected_point[1])
+
+    def assertIntersectionsAlmostEqual(self, intersections, expected):
+        self.assertEqual([(i, j) for i, j, p in intersections], [(i, j) for i, j, p in expected])
+        self.assertPointsAlmostEqual([p for i, j, p in intersections], [p for i, j, p in expected])
+
+    def testTransformPoints(self):
+        points = [Vector2D(1, 0), (0, 2), {'x': -1, 'y': 1}]
+
+        self.assertPointsAlmostEqual(translatePoints(points, (1, -1), use_numpy=False), [(2, -1), (1, 1), (0, 0)])
+        self.assertPointsAlmostEqual(mirrorPoints(points, x_mirror=1, use_numpy=False), [(1, 0), (2, 2), (3, 1)])
+        self.assertPointsAlmostEqual(mirrorPoints(points, y_mirror=0, use_numpy=False), [(1, 0), (0, -2), (-1, -1)])
+
+        rotated = rotatePoints(points, 90, origin=(1, 1), use_numpy=False)
+        self.assertPointsAlmostEqual(rotated, [Vector2D(p).rotate(90, origin=(1, 1)) for p in points])
+        self.assertEqual(rotatePoints([], 90), [])
+
+    def testIntersectLines(self):
+        lines = [((0, 0), (1, 0)), geometricLine(start=(0, 0), end=(1, 1))]
+        others = [((2, -1), (2, 1)), ((0, 1), (1, 1))]
+
+        self.assertIntersectionsAlmostEqual(intersectLines(lines, others, use_numpy=False), [
+            (0, 0, (2, 0)), (1, 0, (2, 2)), (1, 1, (1, 1))])
+
+        for i, j, point in intersectLines(lines, others, use_numpy=False):
+            self.assertEqual(point, BaseNodeIntersection.intersectTwoNodes(
+                geometricLine(start=lines[i][0], end=lines[i][1]), *others[j])[0])
+
+    def testIntersectLinesWithCircles(self):
+        lines = [((-2, 0), (2, 0)), ((-2, 1), (2, 1)), ((-2, 3), (2, 3))]
+        circles = [geometricCircle(center=(0, 0), radius=1), ((0, 1), 2)]
+
+        self.assertIntersectionsAlmostEqual(intersectLinesWithCircles(lines, circles, use_numpy=False), [
+            (0, 0, (1, 0)), (0, 0, (-1, 0)), (0, 1, (math.sqrt(3), 0)), (0, 1, (-math.sqrt(3), 0)),
+            (1, 0, (0, 1)), (1, 1, (2, 1)), (1, 1, (-2, 1)), (2, 1, (0, 3))])
+
+    def testIntersectCircles(self):
+        circles = [((0, 0), 1), geometricCircle(center=(3, 0), radius=1)]
+        others = [((1, 0), 1), ((2, 0), 1), ((0, 0), 2)]
+
+        s = math.sqrt(3) / 2
+        self.assertIntersectionsAlmostEqual(intersectCircles(circles, others, use_numpy=False), [
+            (0, 0, (0.5, -s)), (0, 0, (0.5, s)), (0, 1, (1, 0)),
+            (1, 0, (2, 0)), (1, 1, (2.5, s)), (1, 1, (2.5, -s)), (1, 2, (2, 0))])
+
+    def testCutWithCircles(self):
+        circle = Circle(center=(0, 0), radius=1, layer='F.Fab', width=0.1)
+        arcs = circle.cut(Circle(center=(1, 0), radius=1))
+        self.assertEqual([a.layer for a in arcs], ['F.Fab', 'F.Fab'])
+        self.assertPointsAlmostEqual([a.start_pos for a in arcs], [(0.5, math.sqrt(3) / 2), (0.5, -math.sqrt(3) / 2)])
+        self.assertEqual([round(a.angle, 6) for a in arcs], [240, 120])
+        self.assertIsInstance(circle.cut(Circle(center=(5, 0), radius=1))[0], Circle)
+
+        arcs = Arc(center=(0, 0), start=(1, 0), angle=180).cut(Circle(center=(0, 1), radius=1))
+        self.assertEqual([round(a.angle, 6) for a in arcs], [30, 120, 30])
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, 'numpy is not installed')
+    def testNumpyMatchesFallback(self):
+        points = [(math.cos(i) * i, math.sin(i * 2) - i / 3) for i in range(100)]
+        lines = [(points[i], points[i + 1]) for i in range(0, 40, 2)] + [((0, 0), (1, 0)), ((0, 1), (1, 1))]
+        circles = [(points[i], i / 10) for i in range(0, 100, 5)] + [((0, 0), 1)]
+
+        for function, args in [(rotatePoints, (points, 33, (1, 2))), (mirrorPoints, (points, 1, -2)),
+                               (intersectLines, (lines, lines)), (intersectLinesWithCircles, (lines, circles)),
+                               (intersectCircles, (circles, circles))]:
+            result = function(*args, use_numpy=True)
+            expected = function(*args, use_numpy=False)
+            if function in (intersectLines, intersectLinesWithCircles, intersectCircles):
+                self.assertIntersectionsAlmostEqual(result, expected)
+            else:
+                self.assertPointsAlmostEqual(result, [(p.x, p.y) for p in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree import *
+
+
+class BoundingBoxTests(unittest.TestCase):
+
+    def assertBoxAlmostEqual(self, box, expected):
+        self.assertIsNotNone(box)
+        for value, expected_value in zip([box['min'].x, box['min'].y, box['max'].x, box['max'].y], expected):
+            self.assertAlmostEqual(value, expected_value)
+
+    def testPrimitives(self):
+        self.assertBoxAlmostEqual(Line(start=[1, 1], end=[2, 3]).calculateBoundingBox(), [1, 1, 2, 3])
+        self.assertBoxAlmostEqual(Circle(center=[1, 1], radius=2).calculateBoundingBox(), [-1, -1, 3, 3])
+        self.assertBoxAlmostEqual(Polygon(nodes=[[1, 0], [3, 1], [2, 2]]).calculateBoundingBox(), [1, 0, 3, 2])
+
+        # the extrema of arcs are found on the axes through the center, in both directions
+        self.assertBoxAlmostEqual(Arc(center=[0, 0], start=[1, 0], angle=180).calculateBoundingBox(), [-1, 0, 1, 1])
+        self.assertBoxAlmostEqual(Arc(center=[0, 0], start=[0, 1], angle=-270).calculateBoundingBox(), [-1, -1, 1, 1])
+        self.assertBoxAlmostEqual(Arc(center=[0, 0], start=[1, 1], angle=90).calculateBoundingBox(),
+                                  [-1, 1, 1, 2 ** 0.5])
+
+        text = Text(type='reference', text='ABCD', at=[0, 0], size=[1, 2], rotation=90)
+        self.assertBoxAlmostEqual(text.calculateBoundingBox(), [-1, -2, 1, 2])
+
+        self.assertIsNone(Node().calculateBoundingBox())
+
+    def testTransformations(self):
+        kicad_mod = Footprint("test")
+        rotation = Rotation(90)
+        rotation.append(Line(start=[1, 0], end=[2, 0], layer='F.Fab'))
+        translation = Translation(10, 0)
+        translation.append(rotation)
+        kicad_mod.append(translation)
+        kicad_mod.append(Pad(type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT, at=[0, 0], size=[1, 2], rotation=90, drill=0.5,
+                             layers=Pad.LAYERS_THT))
+
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [-1, -2, 10, 0.5])
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(layers='F.Fab'), [10, -2, 10, -1])
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(layers=['F.Cu']), [-1, -0.5, 1, 0.5])
+        self.assertIsNone(kicad_mod.calculateBoundingBox(layers=['F.SilkS']))
+
+        # virtual childs are considered as well
+        kicad_mod.append(RectLine(start=[0, 0], end=[20, 1], layer='F.SilkS'))
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(layers=['F.SilkS']), [0, 0, 20, 1])
+
+    def testCache(self):
+        kicad_mod = Footprint("test")
+        line = Line(start=[0, 0], end=[1, 1])
+        kicad_mod.append(line)
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [0, 0, 1, 1])
+        self.assertEqual(kicad_mod._bounding_boxes, {None: (0, 0, 1, 1)})
+
+        line.translate(Vector2D(1, 0))
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [1, 0, 2, 1])
+
+        translation = Translation(0, 5)
+        kicad_mod.append(translation)
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [1, 0, 2, 1])
+        kicad_mod.remove(line)
+        translation.append(line)
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [1, 5, 2, 6])
+
+        line.end_pos = Vector2D(4, 4)
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [1, 5, 4, 9])
+
+        # changes in place are not detected
+        line.end_pos.x = 6
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [1, 5, 4, 9])
+        line.invalidateBoundingBox()
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [1, 5, 6, 9])
+
+    def testParametersChanged(self):
+        kicad_mod = Footprint("test")
+        circle = Circle(center=[0, 0], radius=1, layer='F.SilkS')
+        kicad_mod.append(circle)
+        pad = Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[10, 0], size=[1, 1], layers=Pad.LAYERS_SMT)
+        kicad_mod.append(pad)
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(layers='F.SilkS'), [-1, -1, 1, 1])
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [-1, -1, 10.5, 1])
+
+        circle.radius = 2
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(layers='F.SilkS'), [-2, -2, 2, 2])
+        circle.layer = 'F.Fab'
+        self.assertIsNone(kicad_mod.calculateBoundingBox(layers='F.SilkS'))
+
+        pad.size = Vector2D(1, 6)
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [-2, -3, 10.5, 3])
+        pad.at = Vector2D(20, 0)
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [-2, -3, 20.5, 3])
+
+    def testTransformationChanged(self):
+        kicad_mod = Footprint("test")
+        translation = Translation(1, 0)
+        kicad_mod.append(translation)
+        rotation = Rotation(0)
+        translation.append(rotation)
+        line = Line(start=[0, 0], end=[2, 0])
+        rotation.append(line)
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [1, 0, 3, 0])
+
+        # the cached positions follow changes of the transformations
+        translation.offset_x = 10
+        translation.offset_y = 1
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [10, 1, 12, 1])
+        self.assertEqual(line.getRealPosition(line.start_pos), Vector3D(10, 1))
+
+        rotation.rotation = 90
+        self.assertBoxAlmostEqual(kicad_mod.calculateBoundingBox(), [10, -1, 10, 1])
+        self.assertEqual(rotation.getTransformation()[6], 90)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree import *
+from KicadModTree.BuildCache import getSourceFiles
+
+
+class BuildCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.footprint_file = os.path.join(self.tmp_dir, 'test.kicad_mod')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def generate(self, build_cache, key):
+        with build_cache.record(key):
+            kicad_mod = Footprint("test")
+            kicad_mod.append(Text(type='reference', text='REF**', at=[0, 0], layer='F.SilkS'))
+            KicadFileHandler(kicad_mod).writeFile(self.footprint_file)
+
+    def testDisabled(self):
+        build_cache = BuildCache(cache_dir=None)
+        if build_cache.enabled:
+            self.skipTest("build cache is enabled by the environment")
+
+        key = build_cache.getKey({'name': 'test'})
+        self.assertIsNone(key)
+        self.generate(build_cache, key)
+        self.assertFalse(build_cache.isUpToDate(key))
+
+    def testKey(self):
+        build_cache = BuildCache(cache_dir=self.cache_dir, dependencies={'a': 1, 'b': 2})
+
+        self.assertEqual(build_cache.getKey({'x': 1, 'y': [1, 2]}), build_cache.getKey({'y': [1, 2], 'x': 1}))
+        self.assertNotEqual(build_cache.getKey({'x': 1}), build_cache.getKey({'x': 1.}))
+        self.assertNotEqual(build_cache.getKey({'x': 1}), build_cache.getKey({'x': 2}))
+
+        other_dependencies = BuildCache(cache_dir=self.cache_dir, dependencies={'a': 1, 'b': 3})
+        self.assertNotEqual(build_cache.getKey({'x': 1}), other_dependencies.getKey({'x': 1}))
+
+    def testUpToDate(self):
+        build_cache = BuildCache(cache_dir=self.cache_dir)
+        key = build_cache.getKey({'name': 'test'})
+
+        self.assertFalse(build_cache.isUpToDate(key))
+        self.generate(build_cache, key)
+        self.assertTrue(build_cache.isUpToDate(key))
+        self.assertFalse(build_cache.isUpToDate(build_cache.getKey({'name': 'other'})))
+
+        # modifying the output invalidates the entry
+        with io.open(self.footprint_file, 'a') as f:
+            f.write(u'\n')
+        self.assertFalse(build_cache.isUpToDate(key))
+
+        self.generate(build_cache, key)
+        self.assertTrue(build_cache.isUpToDate(key))
+
+        os.remove(self.footprint_file)
+        self.assertFalse(build_cache.isUpToDate(key))
+
+    def testFailedBuild(self):
+        build_cache = BuildCache(cache_dir=self.cache_dir)
+        key = build_cache.getKey({'name': 'test'})
+
+        with self.assertRaises(RuntimeError):
+            with build_cache.record(key):
+                KicadFileHandler(Footprint("test")).writeFile(self.footprint_file)
+                raise RuntimeError("generator failed")
+
+        self.assertFalse(build_cache.isUpToDate(key))
+
+    def testSourceFiles(self):
+        files = {
+            'KicadModTree/__init__.py': u'',
+            'KicadModTree/tests/test.py': u'',
+            'scripts/tools/shared.py': u'',
+            'scripts/family/generator.py': u'import os\nfrom helpers import draw\n\n\ndef create():\n'
+                                           u'    import lazy_helper\n    from pkg import mod\n',
+            'scripts/family/helpers/__init__.py': u'from . import draw\n',
+            'scripts/family/helpers/draw.py': u'',
+            'scripts/family/lazy_helper.py': u'import nested_helper\n',
+            'scripts/family/nested_helper.py': u'',
+            'scripts/family/pkg/__init__.py': u'',
+            'scripts/family/pkg/mod.py': u'',
+            'scripts/family/unused.py': u''
+        }
+        repository_dir = os.path.join(self.tmp_dir, 'repository')
+        for name, content in files.items():
+            path = os.path.join(repository_dir, *name.split('/'))
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with io.open(path, 'w') as f:
+                f.write(content)
+
+        source_files = getSourceFiles(main_file=os.path.join(repository_dir, 'scripts', 'family', 'generator.py'),
+                                      repository_dir=repository_dir)
+        expected = sorted(os.path.join(repository_dir, *name.split('/')) for name in files
+                          if not name.endswith(('unused.py', 'test.py')))
+        self.assertEqual(source_files, expected)
@@ -0,0 +1,67 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util.courtyard_util import unionOutline
+
+RESULT_COURTYARD = """(module test (layer F.Cu) (tedit 0)
+  (fp_line (start -2 -1) (end -2 1) (layer F.Fab) (width 0.1))
+  (fp_line (start -2 1) (end 2 1) (layer F.Fab) (width 0.1))
+  (fp_line (start 2 1) (end 2 -1) (layer F.Fab) (width 0.1))
+  (fp_line (start 2 -1) (end -2 -1) (layer F.Fab) (width 0.1))
+  (fp_line (start -2.25 -1.25) (end 2.25 -1.25) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 2.25 0.8) (end 3.5 0.8) (layer F.CrtYd) (width 0.05))
+  (fp_line (start -2.25 1.25) (end 1.5 1.25) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 1.5 2.8) (end 3.5 2.8) (layer F.CrtYd) (width 0.05))
+  (fp_line (start -2.25 -1.25) (end -2.25 1.25) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 1.5 1.25) (end 1.5 2.8) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 2.25 -1.25) (end 2.25 0.8) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 3.5 0.8) (end 3.5 2.8) (layer F.CrtYd) (width 0.05))
+  (pad 1 smd rect (at 2.5 1.8) (size 1.499 1.5) (layers F.Cu F.Mask F.Paste))
+)"""
+
+
+class CourtyardUtilTests(unittest.TestCase):
+
+    def testUnionOutline(self):
+        self.assertEqual(unionOutline([]), [])
+        self.assertEqual(unionOutline([(0, 0, 2, 1), (1, 0, 3, 1)]),
+                         [(0, 0, 3, 0), (0, 1, 3, 1), (0, 0, 0, 1), (3, 0, 3, 1)])
+
+        # L shape
+        self.assertEqual(sorted(unionOutline([(0, 0, 2, 1), (0, 0, 1, 2)])), sorted([
+            (0, 0, 2, 0), (1, 1, 2, 1), (0, 2, 1, 2), (0, 0, 0, 2), (1, 1, 1, 2), (2, 0, 2, 1)]))
+
+        # a ring of rectangles is filled
+        self.assertEqual(unionOutline([(0, 0, 4, 1), (0, 3, 4, 4), (0, 0, 1, 4), (3, 0, 4, 4)]), [
+            (0, 0, 4, 0), (0, 4, 4, 4), (0, 0, 0, 4), (4, 0, 4, 4)])
+
+    def testGenerateCourtyard(self):
+        kicad_mod = Footprint("test")
+        kicad_mod.append(RectLine(start=[-2, -1], end=[2, 1], layer='F.Fab'))
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[2.5, 1.8], size=[1.499, 1.5],
+                             layers=Pad.LAYERS_SMT))
+
+        lines = kicad_mod.generateCourtyard(clearance=0.25, grid=0.05)
+        self.assertEqual(len(lines), 8)
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_COURTYARD)
+
+
+if __name__ == '__main__':
+    unittest.main()
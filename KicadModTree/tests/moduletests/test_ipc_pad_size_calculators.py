@@ -0,0 +1,149 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import math
+import os
+import random
+import sys
+import unittest
+
+import yaml
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'scripts')
+TOOLS_DIR = os.path.join(SCRIPTS_DIR, 'tools')
+
+# the calculators are only used by the python3 generators
+PYTHON3 = sys.version_info[0] >= 3
+
+if PYTHON3:
+    sys.path.insert(0, TOOLS_DIR)
+    try:
+        import ipc_pad_size_calculators as ipc
+    finally:
+        sys.path.remove(TOOLS_DIR)
+    NUMPY_AVAILABLE = ipc.NUMPY_AVAILABLE
+else:
+    NUMPY_AVAILABLE = False
+
+DEVICE_COUNT = 200
+
+
+def loadIpcSpecs():
+    with io.open(os.path.join(SCRIPTS_DIR, 'Packages', 'ipc_definitions.yaml'), encoding='utf-8') as f:
+        definitions = yaml.safe_load(f)
+    return [spec for name, spec in sorted(definitions.items()) if name.startswith('ipc_spec_')]
+
+
+def randomSize(rng, nominal, tolerance):
+    nominal = round(rng.uniform(*nominal), 2)
+    tolerance = round(rng.uniform(0, tolerance), 2)
+    return ipc.TolerancedSize(minimum=nominal - tolerance, maximum=nominal + tolerance)
+
+
+@unittest.skipUnless(PYTHON3, "ipc_pad_size_calculators requires python3")
+class IpcPadSizeCalculatorsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(1)
+        self.specs = loadIpcSpecs()
+        self.manf_tol = {'manufacturing_tolerance': 0.1, 'placement_tolerance': 0.05}
+        self.addCleanup(setattr, ipc, 'NUMPY_AVAILABLE', ipc.NUMPY_AVAILABLE)
+
+    def createDevices(self):
+        rng = self.rng
+        devices = {
+            'body_size': [randomSize(rng, (6, 8), 0.2) for i in range(DEVICE_COUNT)],
+            'lead_width': [randomSize(rng, (0.2, 0.5), 0.1) for i in range(DEVICE_COUNT)],
+            'lead_len': [randomSize(rng, (0.4, 0.8), 0.15) for i in range(DEVICE_COUNT)],
+            'pull_back': [randomSize(rng, (0, 0.1), 0.05) for i in range(DEVICE_COUNT)],
+            'center_position': [randomSize(rng, (2, 3), 0.1) for i in range(DEVICE_COUNT)],
+            'heel_reduction': [rng.choice([0, 0.05, 0.1]) for i in range(DEVICE_COUNT)]
+            }
+        devices['lead_outside'] = [randomSize(rng, (size.nominal + 1, size.nominal + 2), 0.2)
+                                   for size in devices['body_size']]
+        return devices
+
+    def scalarTable(self, function, spec, rows):
+        # the expected result, calculated device by device
+        result = {}
+        for density in ipc.IPC_DENSITIES:
+            values = [function(spec[density], spec['round_base'], self.manf_tol, **row) for row in rows]
+            result[density] = tuple(list(column) for column in zip(*values))
+        return result
+
+    def assertTablesEqual(self, table, expected):
+        # identical, not only almost equal. The sign of zero has to match as well
+        self.assertEqual(sorted(table.keys()), sorted(expected.keys()))
+        for density in expected:
+            self.assertEqual(table[density], expected[density])
+            for values, expected_values in zip(table[density], expected[density]):
+                self.assertEqual([math.copysign(1, v) for v in values], [math.copysign(1, v) for v in expected_values])
+
+    def checkTables(self, use_numpy):
+        ipc.NUMPY_AVAILABLE = use_numpy
+        devices = self.createDevices()
+        keys = range(DEVICE_COUNT)
+
+        for spec in self.specs:
+            table = ipc.ipc_gull_wing_table(spec, self.manf_tol, devices['lead_width'], devices['lead_outside'],
+                                            lead_len=devices['lead_len'], heel_reduction=devices['heel_reduction'])
+            expected = self.scalarTable(ipc.ipc_gull_wing, spec, [
+                dict(lead_width=devices['lead_width'][i], lead_outside=devices['lead_outside'][i],
+                     lead_len=devices['lead_len'][i], heel_reduction=devices['heel_reduction'][i]) for i in keys])
+            self.assertTablesEqual(table, expected)
+
+            table = ipc.ipc_body_edge_inside_table(spec, self.manf_tol, devices['body_size'], devices['lead_width'],
+                                                   lead_len=devices['lead_len'], heel_reduction=0.05)
+            expected = self.scalarTable(ipc.ipc_body_edge_inside, spec, [
+                dict(body_size=devices['body_size'][i], lead_width=devices['lead_width'][i],
+                     lead_len=devices['lead_len'][i], heel_reduction=0.05) for i in keys])
+            self.assertTablesEqual(table, expected)
+
+            table = ipc.ipc_body_edge_inside_pull_back_table(
+                spec, self.manf_tol, devices['body_size'], devices['lead_width'], lead_len=devices['lead_len'],
+                pull_back=devices['pull_back'])
+            expected = self.scalarTable(ipc.ipc_body_edge_inside_pull_back, spec, [
+                dict(body_size=devices['body_size'][i], lead_width=devices['lead_width'][i],
+                     lead_len=devices['lead_len'][i], pull_back=devices['pull_back'][i]) for i in keys])
+            self.assertTablesEqual(table, expected)
+
+            table = ipc.ipc_pad_center_plus_size_table(spec, self.manf_tol, devices['center_position'],
+                                                       devices['lead_len'], devices['lead_width'])
+            expected = self.scalarTable(ipc.ipc_pad_center_plus_size, spec, [
+                dict(center_position=devices['center_position'][i], lead_length=devices['lead_len'][i],
+                     lead_width=devices['lead_width'][i]) for i in keys])
+            self.assertTablesEqual(table, expected)
+
+    def testScalarTables(self):
+        self.checkTables(use_numpy=False)
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy is not installed")
+    def testNumpyTables(self):
+        self.checkTables(use_numpy=True)
+
+    def testDensities(self):
+        spec = self.specs[0]
+        size = ipc.TolerancedSize(minimum=6.8, maximum=7.2)
+        table = ipc.ipc_gull_wing_table(spec, self.manf_tol, [ipc.TolerancedSize(nominal=0.4)], [size],
+                                        lead_len=[ipc.TolerancedSize(nominal=0.6)], densities=['nominal'])
+        self.assertEqual(list(table.keys()), ['nominal'])
+        self.assertEqual(len(table['nominal'][0]), 1)
+
+        self.assertRaises(KeyError, ipc.ipc_gull_wing_table, spec, self.manf_tol, [], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
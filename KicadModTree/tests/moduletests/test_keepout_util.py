@@ -0,0 +1,149 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import math
+import unittest
+
+from KicadModTree.util.keepout_util import *
+
+
+def signedArea(points):
+    return sum(xa * yb - xb * ya for (xa, ya), (xb, yb) in zip(points, points[1:] + points[:1])) / 2
+
+
+class KeepoutUtilTests(unittest.TestCase):
+
+    def assertIntervalsAlmostEqual(self, intervals, expected):
+        self.assertEqual(len(intervals), len(expected))
+        for interval, expected_interval in zip(intervals, expected):
+            for value, expected_value in zip(interval, expected_interval):
+                self.assertAlmostEqual(value, expected_value)
+
+    def testRect(self):
+        ko = toKeepout([1, -1, 0.5, -0.5])
+        self.assertEqual(ko.bounding_box, [-1, 1, -0.5, 0.5])
+        self.assertTrue(ko.containsPoint(1, 0.5))
+        self.assertFalse(ko.containsPoint(1.1, 0))
+        self.assertIntervalsAlmostEqual(ko.segmentIntervals(-2, 0, 2, 0), [(0.25, 0.75)])
+        self.assertEqual(ko.segmentIntervals(-2, 1, 2, 1), [])
+        self.assertEqual(ko.axisIntervals(2, 0.5), [(-0.5, 0.5)])
+
+    def testCircle(self):
+        ko = KeepoutCircle(0, 0, 1)
+        self.assertIntervalsAlmostEqual(ko.segmentIntervals(0, -2, 0, 0), [(0.5, 1)])
+        self.assertIntervalsAlmostEqual(ko.axisIntervals(0, 0.6), [(-0.8, 0.8)])
+        self.assertEqual(ko.segmentIntervals(-2, 1.5, 2, 1.5), [])
+        crossings = sorted(a % (2 * math.pi) for a in ko.circleCrossings(1, 0, 1))
+        self.assertIntervalsAlmostEqual([crossings], [(2 * math.pi / 3, 4 * math.pi / 3)])
+
+    def testComposedShapes(self):
+        obround = KeepoutObround(0, 0, 4, 2)
+        self.assertEqual(obround.bounding_box, [-2, 2, -1, 1])
+        self.assertTrue(obround.containsPoint(1.9, 0))
+        self.assertFalse(obround.containsPoint(1.9, 0.9))
+        self.assertIntervalsAlmostEqual(obround.axisIntervals(0, 0), [(-2, 2)])
+
+        roundrect = KeepoutRoundRect(0, 0, 4, 2, 0.5)
+        self.assertTrue(roundrect.containsPoint(1.9, 0.4))
+        self.assertFalse(roundrect.containsPoint(1.9, 0.9))
+        self.assertIntervalsAlmostEqual(roundrect.axisIntervals(0, 1), [(-1.5, 1.5)])
+
+        # concave polygon: U shape open to the top
+        polygon = KeepoutPolygon([(0, 0), (3, 0), (3, 3), (2, 3), (2, 1), (1, 1), (1, 3), (0, 3)])
+        self.assertTrue(polygon.containsPoint(0.5, 2))
+        self.assertFalse(polygon.containsPoint(1.5, 2))
+        self.assertIntervalsAlmostEqual(polygon.segmentIntervals(-1, 2, 4, 2), [(0.2, 0.4), (0.6, 0.8)])
+
+    def testClipSegment(self):
+        keepouts = [KeepoutCircle(0, 0, 1), toKeepout([1.5, 2.5, -1, 1])]
+        self.assertIntervalsAlmostEqual(clipSegment(-2, 0, 3, 0, keepouts), [(0, 0.2), (0.6, 0.7), (0.9, 1)])
+        self.assertEqual(clipSegment(-2, 2, 3, 2, keepouts), [(0, 1)])
+        self.assertEqual(clipSegment(-0.5, 0, 0.5, 0, keepouts), [])
+
+    def testClipArc(self):
+        self.assertEqual(clipArc(0, 0, 1, 0, 2 * math.pi, [KeepoutCircle(5, 0, 1)]), [(0, 2 * math.pi)])
+
+        # a keepout on the start point of a full circle leaves a single arc running over the start point
+        pieces = clipArc(0, 0, 1, 0, 2 * math.pi, [KeepoutCircle(0, 1, 1)])
+        self.assertIntervalsAlmostEqual(pieces, [(math.pi / 2 + math.pi / 3, 2 * math.pi - 2 * math.pi / 3)])
+        pieces = clipArc(0, 0, 1, 0, 2 * math.pi, [KeepoutCircle(1, 0, 1)])
+        self.assertIntervalsAlmostEqual(pieces, [(math.pi / 3, 2 * math.pi - 2 * math.pi / 3)])
+
+        # the direction of the arc is kept
+        pieces = clipArc(0, 0, 1, math.pi, -math.pi, [toKeepout([-0.1, 0.1, 0.5, 1.5])])
+        self.assertEqual(len(pieces), 2)
+        self.assertAlmostEqual(pieces[0][0], math.pi)
+        self.assertTrue(all(angle < 0 for start, angle in pieces))
+        self.assertAlmostEqual(sum(angle for start, angle in pieces), -math.pi + 2 * math.asin(0.1))
+
+        self.assertEqual(clipArc(0, 0, 1, 0, math.pi, [KeepoutCircle(0, 0, 2)]), [])
+
+    def testSubtractPolygon(self):
+        square = [(-2, -2), (2, -2), (2, 2), (-2, 2)]
+
+        pieces = subtractPolygon(square, [toKeepout([-3, 3, -0.5, 0.5])])
+        self.assertEqual(len(pieces), 2)
+        self.assertEqual(sorted(min(y for x, y in piece) for piece in pieces), [-2, 0.5])
+
+        # a keepout inside of the polygon splits it, as holes can not be drawn
+        pieces = subtractPolygon(square, [KeepoutCircle(0, 0, 1)])
+        self.assertEqual(len(pieces), 2)
+        self.assertAlmostEqual(sum(abs(signedArea(piece)) for piece in pieces), 16 - math.pi, places=1)
+        self.assertFalse(any(math.hypot(x, y) < 1 for piece in pieces for x, y in piece))
+
+        self.assertEqual(subtractPolygon(square, [KeepoutRoundRect(0, 0, 5, 5, 1)]), [])
+
+        # a closed polygon keeps its direction, the repeated point is dropped
+        pieces = subtractPolygon(square[::-1] + square[-1:], [KeepoutCapsule(2, 2, 2, 4, 1)])
+        self.assertEqual(len(pieces), 1)
+        self.assertNotIn((2, 2), pieces[0])
+        self.assertLess(signedArea(pieces[0]), 0)
+
+    def testKeepoutSet(self):
+        keepouts = KeepoutSet([KeepoutCircle(0, 0, 1), toKeepout([1.5, 2.5, -1, 1]), KeepoutCircle(10, 10, 1)])
+        self.assertEqual(len(keepouts.query(-0.5, 0.5, -0.5, 0.5)), 1)
+        self.assertEqual(len(keepouts.queryAxis(0, 0.9, 1.6)), 2)
+        self.assertTrue(keepouts.containsPoint(2, 0))
+        self.assertFalse(keepouts.containsPoint(5, 5))
+
+        # lines keep their direction
+        pieces = keepouts.clipLine(3, 0, -2, 0)
+        self.assertIntervalsAlmostEqual(pieces, [(3, 0, 2.5, 0), (1.5, 0, 1, 0), (-1, 0, -2, 0)])
+        self.assertEqual(keepouts.clipLine(-2, 2, 3, 2), [[-2, 2, 3, 2]])
+
+        lines = keepouts.clipAxisLines([[-2, 3]], 0, 0)
+        self.assertIntervalsAlmostEqual(sorted(lines), [(-2, -1), (1, 1.5), (2.5, 3)])
+
+        polygons = keepouts.clipPolygon([(-0.5, 1.5), (3, 1.5), (3, 3), (-0.5, 3)])
+        self.assertEqual(polygons, [[(-0.5, 1.5), (3.0, 1.5), (3.0, 3.0), (-0.5, 3.0)]])
+
+        keepouts.append(KeepoutCircle(5, 5, 1))
+        self.assertTrue(keepouts.containsPoint(5, 5))
+        self.assertIs(asKeepoutSet(keepouts), keepouts)
+
+    def testAsKeepoutSet(self):
+        keepouts = [[-1, 1, -1, 1], KeepoutCircle(5, 5, 1)]
+        keepout_set = asKeepoutSet(keepouts)
+        self.assertEqual(len(keepout_set), 2)
+        self.assertTrue(keepout_set.containsPoint(5, 5))
+
+        # lists are not remembered, a changed list gets a new set
+        keepouts[0][1] = 3
+        self.assertTrue(asKeepoutSet(keepouts).containsPoint(2, 0))
+        self.assertFalse(keepout_set.containsPoint(2, 0))
+        self.assertIs(asKeepoutSet(keepout_set), keepout_set)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree.LibraryBuilder import LibraryBuilder
+
+
+KICADMODTREE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+SCRIPT_HELPER = """
+def footprint_name(name):
+    return name.upper()
+"""
+
+SCRIPT_WITHOUT_INPUTS = """
+import sys
+sys.path.append({path!r})
+from KicadModTree import *
+from helper import footprint_name
+
+for name in ['a', 'b']:
+    KicadFileHandler(Footprint(footprint_name(name))).writeFile(footprint_name(name) + '.kicad_mod')
+"""
+
+SCRIPT_WITH_INPUTS = """
+import argparse
+import sys
+sys.path.append({path!r})
+from KicadModTree import *
+
+parser = argparse.ArgumentParser()
+parser.add_argument('files', metavar='file', type=str, nargs='+')
+parser.add_argument('--config', type=str, default='config.yaml')
+args = parser.parse_args()
+
+for filepath in args.files:
+    if 'broken' in filepath:
+        raise RuntimeError('broken input')
+    KicadFileHandler(Footprint('c')).writeFile(filepath + '.kicad_mod')
+"""
+
+SCRIPT_SLOW = """
+import time
+time.sleep(10)
+"""
+
+
+class SummaryStream(object):
+    # collects the written text, which is a mix of str and unicode on python2
+
+    def __init__(self, output):
+        self.write = output.append
+
+
+class LibraryBuilderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.scripts_dir = tempfile.mkdtemp()
+
+        for filename, content in [('helper.py', SCRIPT_HELPER),
+                                  ('simple.py', SCRIPT_WITHOUT_INPUTS.format(path=KICADMODTREE_PATH)),
+                                  ('sub/with_inputs.py', SCRIPT_WITH_INPUTS.format(path=KICADMODTREE_PATH)),
+                                  ('sub/config.yaml', ''),
+                                  ('sub/size_definitions/broken.yaml', ''),
+                                  ('sub/size_definitions/parts.yaml', '')]:
+            self.writeFile(filename, content)
+
+    def writeFile(self, filename, content):
+        path = os.path.join(self.scripts_dir, filename)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with io.open(path, 'wb') as f:
+            f.write(content.encode('utf-8'))
+
+    def tearDown(self):
+        shutil.rmtree(self.scripts_dir)
+
+    def testFindJobs(self):
+        builder = LibraryBuilder(self.scripts_dir)
+
+        jobs = builder.findJobs()
+        self.assertEqual([os.path.relpath(job.script, self.scripts_dir) for job in jobs],
+                         ['simple.py', os.path.join('sub', 'with_inputs.py'), os.path.join('sub', 'with_inputs.py')])
+        self.assertEqual([[os.path.basename(i) for i in job.inputs] for job in jobs],
+                         [[], ['broken.yaml'], ['parts.yaml']])
+
+        jobs = [job.getName(self.scripts_dir) for job in builder.findJobs(['sub/*'])]
+        self.assertEqual(len(jobs), 2)
+
+    def testBuildRules(self):
+        self.writeFile('build_rules.yaml', "exclude: ['simple.py']\n"
+                                           "jobs:\n"
+                                           "  sub/with_inputs.py:\n"
+                                           "    - [size_definitions/parts.yaml, config.yaml]\n")
+        builder = LibraryBuilder(self.scripts_dir)
+
+        jobs = builder.findJobs()
+        self.assertEqual([os.path.relpath(job.script, self.scripts_dir) for job in jobs],
+                         [os.path.join('sub', 'with_inputs.py')])
+        self.assertEqual([os.path.relpath(i, self.scripts_dir) for i in jobs[0].inputs],
+                         [os.path.join('sub', 'size_definitions', 'parts.yaml'), os.path.join('sub', 'config.yaml')])
+
+        # rules given by the caller replace the file
+        self.assertEqual(len(LibraryBuilder(self.scripts_dir, rules={}).findJobs()), 3)
+
+    def testBuild(self):
+        builder = LibraryBuilder(self.scripts_dir)
+        results = builder.build(builder.findJobs(), jobs=2)
+
+        self.assertEqual([len(r.footprints) for r in results], [2, 0, 1])
+        self.assertEqual([r.failed for r in results], [False, True, False])
+        self.assertIn('broken input', results[1].output)
+        self.assertTrue(os.path.isfile(os.path.join(self.scripts_dir, 'A.kicad_mod')))
+
+        summary = []
+        builder.printSummary(results, stream=SummaryStream(summary))
+        self.assertIn('3 jobs, 1 failed, 3 footprints written', ''.join(summary))
+
+    def testTimeout(self):
+        self.writeFile('slow.py', SCRIPT_SLOW)
+        builder = LibraryBuilder(self.scripts_dir)
+
+        results = builder.build(builder.findJobs(['slow.py']), timeout=0.5)
+        self.assertEqual(len(results), 1)
+        self.assertIsNone(results[0].returncode)
+        self.assertTrue(results[0].failed)
+        self.assertLess(results[0].wall_time, 5)
@@ -0,0 +1,152 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree import *
+from KicadModTree.LibraryDiff import LibraryDiff, FootprintDiff, compareFootprints, summarizeFootprint
+
+
+def create_footprint(pad_x=0, courtyard=2.25, layers=Pad.LAYERS_THT):
+    kicad_mod = Footprint("test")
+    kicad_mod.setDescription("A example footprint")
+    kicad_mod.append(Text(type='reference', text='REF**', at=[0, -3], layer='F.SilkS'))
+    kicad_mod.append(RectLine(start=[-courtyard, -courtyard], end=[courtyard, courtyard], layer='F.CrtYd'))
+    kicad_mod.append(Arc(center=[0, 0], start=[1, 0], angle=90, layer='F.Fab'))
+    kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
+                         at=[pad_x, 0], size=[2, 2], drill=1.2, layers=layers))
+    return kicad_mod
+
+
+class ReportStream(object):
+    # collects the written text, which is a mix of str and unicode on python2
+
+    def __init__(self, output):
+        self.write = output.append
+
+
+class LibraryDiffTests(unittest.TestCase):
+
+    def compare(self, old, new, **kwargs):
+        return compareFootprints(summarizeFootprint(old), summarizeFootprint(new), **kwargs)
+
+    def testUnchanged(self):
+        self.assertEqual(self.compare(create_footprint(), create_footprint()), [])
+        self.assertEqual(self.compare(create_footprint(), create_footprint(pad_x=0.01), tolerance=0.1), [])
+
+    def testElements(self):
+        summary = summarizeFootprint(create_footprint())
+        self.assertEqual(len(summary['layers']['F.CrtYd']), 4)
+        kind, width, coordinates = summary['layers']['F.Fab'][0]
+        self.assertEqual((kind, width), ('arc', None))
+        for value, expected in zip(coordinates, (0, 0, 1, 0, 0, 1, math.sqrt(0.5), math.sqrt(0.5))):
+            self.assertAlmostEqual(value, expected)
+
+    def testDifferences(self):
+        self.assertEqual(self.compare(create_footprint(), create_footprint(pad_x=0.5)),
+                         ["pad 1: moved by (0.5, 0)"])
+        self.assertEqual(self.compare(create_footprint(), create_footprint(layers=['*.Cu'])),
+                         ["pad 1: layers changed from *.Cu *.Mask to *.Cu"])
+        self.assertEqual(self.compare(create_footprint(), create_footprint(courtyard=2.5))[0],
+                         "F.CrtYd: line (-2.25, -2.25)-(-2.25, 2.25) changed to line (-2.5, -2.5)-(-2.5, 2.5)")
+
+        other = create_footprint()
+        other.setDescription("other")
+        other.append(Line(start=[0, 0], end=[1, 1], layer='F.SilkS'))
+        self.assertEqual(self.compare(create_footprint(), other),
+                         ["description changed from A example footprint to other", "F.SilkS: 1 elements added"])
+
+    def testMatching(self):
+        old = Footprint("test")
+        old.append(Line(start=[0, -1.33], end=[1.33, -1.33], layer='F.SilkS', width=0.12))
+        old.append(Line(start=[0, 1.33], end=[1.33, 1.33], layer='F.SilkS', width=0.12))
+        old.append(Arc(center=[0, 0], start=[1, 0], angle=90, layer='F.Fab', width=0.1))
+        old.append(Polygon(nodes=[(0, 0), (1, 0), (1, 1)], layer='F.Fab', width=0.1))
+        old.append(Circle(center=[0, 0], radius=2, layer='F.Fab', width=0.1))
+
+        # the same elements in another order and direction, moved less than the tolerance
+        new = Footprint("test")
+        new.append(Circle(center=[0, 0.0005], radius=2, layer='F.Fab', width=0.1))
+        new.append(Polygon(nodes=[(1, 1), (1, 0), (0, 0)], layer='F.Fab', width=0.1))
+        new.append(Arc(center=[0, 0], start=[0, 1], angle=-90, layer='F.Fab', width=0.1))
+        new.append(Line(start=[1.33, 1.33], end=[0, 1.33], layer='F.SilkS', width=0.12))
+        new.append(Line(start=[1.33, -1.33], end=[0, -1.33], layer='F.SilkS', width=0.12))
+        self.assertEqual(self.compare(old, new), [])
+
+        # the same number of elements with the same outline, but one of them moved
+        old.append(Line(start=[0, -1.33], end=[1.33, -1.33], layer='F.SilkS', width=0.12))
+        old.append(Line(start=[-2.54, 1.33], end=[0, 1.33], layer='F.SilkS', width=0.12))
+        new.append(Line(start=[-2.54, -1.33], end=[1.33, -1.33], layer='F.SilkS', width=0.12))
+        new.append(Line(start=[-2.54, 1.33], end=[0, 1.33], layer='F.SilkS', width=0.12))
+        self.assertEqual(self.compare(old, new), ["F.SilkS: line (0, -1.33)-(1.33, -1.33) width 0.12 changed to "
+                                                  "line (-2.54, -1.33)-(1.33, -1.33) width 0.12"])
+
+        old.append(Line(start=[0, 0], end=[1, 1], layer='F.SilkS', width=0.12))
+        new.append(Line(start=[0, 0], end=[1, 1], layer='F.SilkS', width=0.15))
+        self.assertIn("F.SilkS: line (0, 0)-(1, 1) width 0.12 changed to line (0, 0)-(1, 1) width 0.15",
+                      self.compare(old, new))
+
+    def testUnreadable(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            for library, contents in (('old', {'a': u"(module a (tedit 1) (fp_line (start 0 0)",
+                                               'b': u"(module b (tedit 1) (fp_line (start 0 0)"}),
+                                      ('new', {'a': u"(module a (tedit 2) (fp_line (start 0 0)",
+                                               'b': u"(module b (tedit 2) (fp_line (start 1 0)"})):
+                os.makedirs(os.path.join(tmp_dir, library))
+                for name, content in contents.items():
+                    with io.open(os.path.join(tmp_dir, library, name + '.kicad_mod'), 'w', encoding='utf-8') as f:
+                        f.write(content)
+
+            results = LibraryDiff(os.path.join(tmp_dir, 'old'), os.path.join(tmp_dir, 'new')).compare(jobs=1)
+
+            # files which can not be read are still compared as text
+            self.assertEqual([(r.name, r.status) for r in results],
+                             [('a.kicad_mod', FootprintDiff.UNCHANGED), ('b.kicad_mod', FootprintDiff.CHANGED)])
+            self.assertEqual(results[1].differences, ["could not be read: RuntimeError: missing closing brackets"])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def testLibraryDiff(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            for library, footprints in (('old', {'a': create_footprint(), 'b': create_footprint(), 'c': None}),
+                                        ('new', {'a': create_footprint(), 'b': create_footprint(pad_x=1),
+                                                 'd': None})):
+                os.makedirs(os.path.join(tmp_dir, library, 'test.pretty'))
+                for name, kicad_mod in footprints.items():
+                    filename = os.path.join(tmp_dir, library, 'test.pretty', name + '.kicad_mod')
+                    KicadFileHandler(kicad_mod or create_footprint()).writeFile(filename, timestamp=ord(library[0]))
+
+            library_diff = LibraryDiff(os.path.join(tmp_dir, 'old'), os.path.join(tmp_dir, 'new'))
+            results = library_diff.compare(jobs=1)
+
+            self.assertEqual([(r.name, r.status) for r in results],
+                             [(os.path.join('test.pretty', 'a.kicad_mod'), FootprintDiff.UNCHANGED),
+                              (os.path.join('test.pretty', 'b.kicad_mod'), FootprintDiff.CHANGED),
+                              (os.path.join('test.pretty', 'c.kicad_mod'), FootprintDiff.REMOVED),
+                              (os.path.join('test.pretty', 'd.kicad_mod'), FootprintDiff.ADDED)])
+            self.assertEqual(results[1].differences, ["pad 1: moved by (1, 0)"])
+
+            report = []
+            library_diff.printReport(results, stream=ReportStream(report))
+            self.assertIn("4 footprints compared: 1 changed, 1 added, 1 removed, 1 unchanged", ''.join(report))
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,123 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from KicadModTree import *
+
+try:
+    import concurrent.futures
+    FUTURES_AVAILABLE = True
+except ImportError:
+    # python2 without the futures backport
+    FUTURES_AVAILABLE = False
+
+
+def createFootprint(args):
+    # module level, so it can be sent to the worker processes
+    if args['name'] == 'broken':
+        raise RuntimeError("can not create footprint")
+
+    print("pincount {}".format(args['pincount']))
+
+
+class OutputStream(object):
+    # collects the printed text, which is a mix of str and unicode on python2
+
+    def __init__(self, output):
+        self.write = output.append
+
+    def flush(self):
+        pass
+
+
+class ModArgparserTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_file = os.path.join(self.tmp_dir, 'footprints.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def writeCsv(self, names):
+        with io.open(self.csv_file, 'w') as f:
+            f.write(u"name,pincount\n")
+            for i, name in enumerate(names):
+                f.write(u"{},{}\n".format(name, i + 1))
+
+    def runParser(self, *arguments):
+        parser = ModArgparser(createFootprint)
+        parser.add_parameter("name", type=str, required=True)
+        parser.add_parameter("pincount", type=int, required=True)
+
+        output = []
+        exit_code = 0
+        argv, stdout = sys.argv, sys.stdout
+        sys.argv, sys.stdout = ['script.py'] + list(arguments), OutputStream(output)
+        try:
+            parser.run()
+        except SystemExit as e:
+            exit_code = e.code
+        finally:
+            sys.argv, sys.stdout = argv, stdout
+        return "".join(output), exit_code
+
+    def testYaml(self):
+        yaml_file = os.path.join(self.tmp_dir, 'footprints.yaml')
+        with io.open(yaml_file, 'w') as f:
+            f.write(u"first:\n  pincount: 2\nsecond:\n  name: reserved\n  pincount: 3\nthird: [\n")
+
+        output, exit_code = self.runParser(yaml_file)
+        lines = output.splitlines()
+        self.assertEqual(lines[:4], ["use file: {}".format(yaml_file), "  - generate first.kicad_mod", "pincount 2",
+                                     "ERROR: name is already used for root name!"])
+        self.assertEqual(lines[4], "while parsing a flow node")  # the syntax error of the last footprint
+        self.assertEqual(exit_code, 0)
+
+    @unittest.skipIf(not FUTURES_AVAILABLE, "concurrent.futures not available")
+    def testParallelOutputOrder(self):
+        self.writeCsv(["fp_{}".format(i) for i in range(20)])
+
+        expected, exit_code = self.runParser(self.csv_file)
+        self.assertEqual(exit_code, 0)
+        self.assertIn("  - generate fp_19.kicad_mod\npincount 20\n", expected)
+        self.assertEqual(self.runParser('--jobs', '3', self.csv_file, self.csv_file), (expected + expected, 0))
+
+    @unittest.skipIf(not FUTURES_AVAILABLE, "concurrent.futures not available")
+    def testParallelErrors(self):
+        self.writeCsv(["first", "broken", "last"])
+
+        with self.assertRaises(RuntimeError):
+            self.runParser(self.csv_file)
+
+        # the failing footprint does not stop the others
+        output, exit_code = self.runParser('-j', '2', self.csv_file)
+        self.assertEqual(exit_code, 1)
+
+        lines = output.splitlines()
+        self.assertEqual(lines[:5], ["use file: {}".format(self.csv_file), "  - generate first.kicad_mod",
+                                     "pincount 1", "  - generate broken.kicad_mod", "ERROR: broken failed"])
+        self.assertIn("RuntimeError: can not create footprint", lines)
+        self.assertEqual(lines[-3:], ["  - generate last.kicad_mod", "pincount 3", "1 footprint(s) failed: broken"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'scripts',
+                          'Connector_PinSocket')
+
+# the pin 1 marker of the double row sockets ends above the first pad, it must not cross the second pin column
+PIN1_MARKER_2x03 = u"(fp_line (start 0 -1.33) (end 1.33 -1.33) (layer F.SilkS) (width 0.12))"
+
+
+class OutputStream(object):
+    # swallows the progress which is printed by the generator
+
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+
+class PinSocketStripsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        sys.path.insert(0, SCRIPT_DIR)
+
+    def tearDown(self):
+        sys.path.remove(SCRIPT_DIR)
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def createFootprint(self, model_class, name):
+        from parameters import params
+
+        models = params().getAllModels([model_class])
+        stdout = sys.stdout
+        sys.stdout = OutputStream()
+        try:
+            models[name].model(models[name].params).make()
+        finally:
+            sys.stdout = stdout
+
+        lib_name = "Connector_PinSocket_{0:03.2f}mm".format(models[name].params.pin_pitch)
+        with io.open(os.path.join(lib_name + ".pretty", name + ".kicad_mod"), encoding='utf-8') as f:
+            return f.read()
+
+    def testPin1Marker(self):
+        import socket_strips
+
+        # the pads are placed inside a translation, the marker is drawn in its coordinates
+        content = self.createFootprint(socket_strips.pinSocketVerticalTHT, 'PinSocket_2x03_P2.54mm_Vertical')
+        self.assertIn(PIN1_MARKER_2x03, content)
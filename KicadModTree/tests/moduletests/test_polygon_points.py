@@ -0,0 +1,65 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+import warnings
+
+from KicadModTree import *
+from KicadModTree.PolygonPoints import PolygonPoints
+
+
+def coordinates(points):
+    return [(p.x, p.y) for p in points]
+
+
+class PolygonPointsTests(unittest.TestCase):
+
+    def testContainer(self):
+        points = PolygonPoints(nodes=[(0, 0), [1, 0], {'x': 1, 'y': 2}, Vector2D(0, 2)], x_mirror=1)
+        self.assertEqual(len(points), 4)
+        self.assertEqual(coordinates(points), [(2, 0), (1, 0), (1, 2), (2, 2)])
+        self.assertEqual(coordinates(points[1:3]), [(1, 0), (1, 2)])
+        self.assertEqual((points[-1].x, points[-1].y), (2, 2))
+        with self.assertRaises(IndexError):
+            points[4]
+
+        # the returned points are copies
+        points[0].x = 5
+        self.assertEqual(points[0].x, 2)
+
+    def testTransformations(self):
+        nodes = [(0.1 * i, 0.3 * i - 1) for i in range(100)]
+        points = PolygonPoints(nodes=nodes).rotate(33, origin=(1, 2)).translate((0.5, -1))
+
+        expected = [Vector2D(n).rotate(33, origin=(1, 2)) + (0.5, -1) for n in nodes]
+        self.assertEqual(coordinates(points), coordinates(expected))
+
+    def testNearestPoints(self):
+        square = PolygonPoints(nodes=[(0, 0), (4, 0), (4, 4), (0, 4)])
+        inner = PolygonPoints(nodes=[(1, 1), (3, 1), (3, 3), (1, 3)])
+
+        # all corners have the same distance, the first pair wins
+        self.assertEqual(square.findNearestPoints(inner), (0, 0))
+        self.assertEqual(inner.findNearestPoints(PolygonPoints(nodes=[(5, 0), (3.5, 3.5), (0, 5)])), (2, 1))
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            square.cut(PolygonPoints(nodes=[(1, 1), (2, 1), (2, 2), (1, 2)]))
+        self.assertEqual(coordinates(square), [(0, 0), (1, 1), (1, 2), (2, 2), (2, 1), (1, 1), (0, 0), (4, 0),
+                                               (4, 4), (0, 4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util.kicad_util import lispTokenizer, parseLispString, parseTimestamp
+
+from .test_simple_footprints import RESULT_SIMPLE_FOOTPRINT
+from .test_arc import RESULT_kx90DEG
+from .test_rotation import RESULT_rotText
+from .test_exposed_pad import RESULT_SIMPLE_EP_FP
+from .test_kicad5_padshapes import RESULT_ROUNDRECT_FP, RESULT_SIMPLE_POLYGON_PAD, RESULT_SIMPLE_OTHER_CUSTOM_PAD
+
+
+class ReadFootprintTests(unittest.TestCase):
+
+    def testTokenizer(self):
+        self.assertEqual(lispTokenizer('(fp_text user "a (b)" (at 0 1))'),
+                         ['(', 'fp_text', 'user', 'a (b)', '(', 'at', '0', '1', ')', ')'])
+        self.assertEqual(parseLispString('(descr "" (tags "say \\"hi\\""))'),
+                         ['descr', '', ['tags', 'say "hi"']])
+        self.assertEqual(parseTimestamp('5A'), 0x5A)
+
+        self.assertRaises(RuntimeError, parseLispString, '(module "test)')
+        self.assertRaises(RuntimeError, parseLispString, '(module (layer F.Cu)')
+        self.assertRaises(RuntimeError, parseLispString, '(module test))')
+
+    def testRoundTrip(self):
+        for result in [RESULT_SIMPLE_FOOTPRINT, RESULT_kx90DEG, RESULT_rotText, RESULT_SIMPLE_EP_FP,
+                       RESULT_ROUNDRECT_FP, RESULT_SIMPLE_POLYGON_PAD, RESULT_SIMPLE_OTHER_CUSTOM_PAD]:
+            kicad_mod = KicadFileHandler.deserialize(result)
+            self.assertEqual(KicadFileHandler(kicad_mod).serialize(timestamp=0), result)
+
+    def testNodes(self):
+        kicad_mod = KicadFileHandler.deserialize(RESULT_SIMPLE_FOOTPRINT)
+
+        self.assertEqual(kicad_mod.name, "test")
+        self.assertEqual(kicad_mod.description, "A example footprint")
+        self.assertEqual(kicad_mod.tags, "example")
+
+        node_types = sorted(type(node).__name__ for node in kicad_mod.getNormalChilds())
+        self.assertEqual(node_types, ['Line'] * 8 + ['Model', 'Pad', 'Pad', 'Text', 'Text'])
+
+        pad = [node for node in kicad_mod.getNormalChilds() if isinstance(node, Pad)][1]
+        self.assertEqual(pad.number, '2')
+        self.assertEqual(pad.shape, Pad.SHAPE_CIRCLE)
+        self.assertEqual(pad.at, Vector2D(3, 0))
+        self.assertEqual(pad.drill, Vector2D(1.2, 1.2))
+
+    def testReadFile(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmp_dir, 'test.kicad_mod')
+            with io.open(filename, 'wb') as f:
+                f.write(RESULT_SIMPLE_FOOTPRINT.encode('utf-8'))
+
+            kicad_mod = Footprint.fromFile(filename)
+            self.assertEqual(KicadFileHandler(kicad_mod).serialize(timestamp=0), RESULT_SIMPLE_FOOTPRINT)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        self.assertRaises(ValueError, KicadFileHandler.deserialize, '(kicad_pcb (version 4))')
@@ -0,0 +1,143 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import re
+import sys
+import timeit
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util import kicad_util
+
+
+# the benchmark takes a while and verifies nothing, it only runs when this environment variable is set.
+# Executing this file as a script runs it as well
+BENCHMARK_ENABLED = os.environ.get('KICADMODTREE_BENCHMARK')
+
+
+def uncachedFormatFloat(val):
+    # the implementation before the results were cached
+    result = ('%f' % val).rstrip('0').rstrip('.')
+    if result == '-0':
+        result = '0'
+    return result
+
+
+def uncachedLispString(string):
+    if type(string) not in (str, type(u'')):
+        string = str(string)
+
+    if len(string) == 0 or re.match(r".*\s.*", string):
+        return '"{}"'.format(string.replace('"', '\\"'))
+
+    return string
+
+
+def createBGA(rows=30, pitch=0.8):
+    kicad_mod = Footprint("BGA-{}".format(rows * rows))
+    kicad_mod.append(Text(type='reference', text='REF**', at=[0, -14], layer='F.SilkS'))
+    kicad_mod.append(Text(type='value', text=kicad_mod.name, at=[0, 14], layer='F.Fab'))
+    size = rows * pitch
+    kicad_mod.append(RectLine(start=[-size / 2, -size / 2], end=[size / 2, size / 2], layer='F.Fab'))
+    for row in range(rows):
+        for column in range(rows):
+            kicad_mod.append(Pad(number="{}{}".format(chr(ord('A') + row % 26), column + 1), type=Pad.TYPE_SMT,
+                                 shape=Pad.SHAPE_CIRCLE, at=[(column - (rows - 1) / 2) * pitch,
+                                                             (row - (rows - 1) / 2) * pitch],
+                                 size=[0.4, 0.4], layers=Pad.LAYERS_SMT))
+    return kicad_mod
+
+
+def createQFP(pins=100, pitch=0.5):
+    kicad_mod = Footprint("QFP-{}".format(pins))
+    kicad_mod.append(Text(type='reference', text='REF**', at=[0, -9], layer='F.SilkS'))
+    kicad_mod.append(Text(type='value', text=kicad_mod.name, at=[0, 9], layer='F.Fab'))
+    kicad_mod.append(RectLine(start=[-7, -7], end=[7, 7], layer='F.Fab'))
+    per_side = pins // 4
+    number = 1
+    for side in range(4):
+        rotation = Rotation(-90 * side)
+        for i in range(per_side):
+            rotation.append(Pad(number=number, type=Pad.TYPE_SMT, shape=Pad.SHAPE_ROUNDRECT,
+                                at=[-7.7, (i - (per_side - 1) / 2) * pitch], size=[1.5, 0.3], radius_ratio=0.25,
+                                layers=Pad.LAYERS_SMT))
+            number += 1
+        kicad_mod.append(rotation)
+    return kicad_mod
+
+
+def measureFootprintsPerSecond(kicad_mod, number=5, repeat=3):
+    file_handler = KicadFileHandler(kicad_mod)
+    best = min(timeit.repeat(lambda: file_handler.serialize(timestamp=0), number=number, repeat=repeat))
+    return number / best
+
+
+class UncachedFormatting(object):
+    # replaces the cached formatting functions in every module which imported them
+
+    REPLACEMENTS = {'formatFloat': uncachedFormatFloat, 'lispString': uncachedLispString}
+
+    def __enter__(self):
+        self.replaced = []
+        for module in list(sys.modules.values()):
+            if module is None or not module.__name__.startswith('KicadModTree'):
+                continue
+            for name, replacement in self.REPLACEMENTS.items():
+                if getattr(module, name, None) is getattr(kicad_util, name):
+                    self.replaced.append((module, name))
+        for module, name in self.replaced:
+            setattr(module, name, self.REPLACEMENTS[name])
+        return self
+
+    def __exit__(self, *args):
+        for module, name in self.replaced:
+            setattr(module, name, getattr(kicad_util, name))
+
+
+def runBenchmark(output=None):
+    r"""Serialize a large BGA and a 100 pin QFP with and without the cached formatting and print the throughput
+
+    :param output: stream the results are written to (default: sys.stderr)
+    :return: list of (name, uncached footprints per second, cached footprints per second)
+    """
+    output = sys.stderr if output is None else output
+    results = []
+    for kicad_mod in [createBGA(), createQFP()]:
+        expected = KicadFileHandler(kicad_mod).serialize(timestamp=0)
+        with UncachedFormatting():
+            if KicadFileHandler(kicad_mod).serialize(timestamp=0) != expected:
+                raise AssertionError("the uncached formatting creates a different output")
+            uncached = measureFootprintsPerSecond(kicad_mod)
+
+        cached = measureFootprintsPerSecond(kicad_mod)
+        output.write('{name:<12} {uncached:>8.1f} -> {cached:>8.1f} footprints/s ({gain:+.0%})\n'.format(
+            name=kicad_mod.name, uncached=uncached, cached=cached, gain=cached / uncached - 1))
+        results.append((kicad_mod.name, uncached, cached))
+    return results
+
+
+@unittest.skipUnless(BENCHMARK_ENABLED, "set KICADMODTREE_BENCHMARK to run the benchmarks")
+class SerializerBenchmarkTests(unittest.TestCase):
+
+    def test_benchmark(self):
+        sys.stderr.write('\n')
+        for name, uncached, cached in runBenchmark():
+            self.assertGreater(uncached, 0)
+            self.assertGreater(cached, 0)
+
+
+if __name__ == '__main__':
+    runBenchmark(sys.stdout)
@@ -0,0 +1,126 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import math
+import unittest
+import warnings
+
+from KicadModTree import *
+from KicadModTree.util import keepout_util
+from KicadModTree.util.keepout_util import KeepoutSet
+from KicadModTree.util.silkscreen_util import padKeepouts
+
+RESULT_clipSilkscreen = """(module test_silkscreen (layer F.Cu) (tedit 0)
+  (fp_arc (start 3 0) (end 2.3698 -0.776433) (angle 258.129759) (layer F.SilkS) (width 0.12))
+  (fp_line (start -2 1) (end 2 1) (layer F.SilkS) (width 0.12))
+  (fp_line (start 2 -1) (end -2 -1) (layer F.SilkS) (width 0.12))
+  (fp_line (start -3 2) (end 3 2) (layer B.SilkS) (width 0.12))
+  (fp_line (start -3 1.5) (end 3 1.5) (layer F.Fab) (width 0.1))
+  (fp_line (start -2 -1) (end -2 -0.76) (layer F.SilkS) (width 0.12))
+  (fp_line (start -2 0.76) (end -2 1) (layer F.SilkS) (width 0.12))
+  (fp_line (start 2 1) (end 2 0.86) (layer F.SilkS) (width 0.12))
+  (fp_line (start 2 -0.86) (end 2 -1) (layer F.SilkS) (width 0.12))
+  (pad 1 smd rect (at -2 0) (size 1 1) (layers F.Cu F.Mask F.Paste))
+  (pad 2 thru_hole circle (at 2 0) (size 1.2 1.2) (drill 0.8) (layers *.Cu *.Mask))
+)"""
+
+
+class SilkscreenUtilTests(unittest.TestCase):
+
+    def testClipSilkscreen(self):
+        kicad_mod = Footprint("test_silkscreen")
+        rect = RectLine(start=[-2, -1], end=[2, 1], layer='F.SilkS')
+        kicad_mod.append(rect)
+        kicad_mod.append(Circle(center=[3, 0], radius=1, layer='F.SilkS'))
+        kicad_mod.append(Line(start=[-3, 2], end=[3, 2], layer='B.SilkS'))
+        kicad_mod.append(Line(start=[-3, 1.5], end=[3, 1.5], layer='F.Fab'))
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                             at=[-2, 0], size=[1, 1], layers=Pad.LAYERS_SMT))
+        kicad_mod.append(Pad(number=2, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
+                             at=[2, 0], size=[1.2, 1.2], drill=0.8, layers=Pad.LAYERS_THT))
+
+        self.assertEqual(kicad_mod.clipSilkscreen(clearance=0.2), 3)
+        self.assertEqual(len(rect.getVirtualChilds()), 2)
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_clipSilkscreen)
+
+        # clipping again does not change anything
+        self.assertEqual(kicad_mod.clipSilkscreen(clearance=0.2), 0)
+
+    def testRotatedPad(self):
+        kicad_mod = Footprint("test_silkscreen")
+        rotation = Rotation(45)
+        rotation.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                            at=[0, 0], size=[2, 2], layers=Pad.LAYERS_SMT))
+        kicad_mod.append(rotation)
+        kicad_mod.append(Line(start=[-3, 0], end=[3, 0], layer='F.SilkS', width=0.2))
+
+        self.assertEqual(kicad_mod.clipSilkscreen(clearance=0.2), 1)
+        lines = [node for node in kicad_mod.iterNodes() if isinstance(node, Line)]
+        self.assertEqual(len(lines), 2)
+        self.assertAlmostEqual(lines[0].end_pos.x, -math.sqrt(2) - 0.3)
+        self.assertAlmostEqual(lines[1].start_pos.x, math.sqrt(2) + 0.3)
+
+    def testPolygon(self):
+        kicad_mod = Footprint("test_silkscreen")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                             at=[0, 0], size=[2, 2], layers=Pad.LAYERS_SMT))
+        kicad_mod.append(Polygon(nodes=[[0, -0.5], [3, -0.5], [3, 0.5], [0, 0.5]], layer='F.SilkS', width=0))
+
+        self.assertEqual(kicad_mod.clipSilkscreen(clearance=0.2), 1)
+        polygons = [node for node in kicad_mod.iterNodes() if isinstance(node, Polygon)]
+        self.assertEqual(len(polygons), 1)
+        self.assertAlmostEqual(min(point.x for point in polygons[0].nodes), 1.2)
+        self.assertAlmostEqual(max(point.x for point in polygons[0].nodes), 3)
+
+    def testPolygonNotClipped(self):
+        kicad_mod = Footprint("test_silkscreen")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                             at=[0, 0], size=[2, 2], layers=Pad.LAYERS_SMT))
+        kicad_mod.append(Polygon(nodes=[[0, -0.5], [3, -0.5], [3, 0.5], [0, 0.5]], layer='F.SilkS', width=0))
+
+        # the crossings of the borders can not be determined, even after moving the keepout a bit
+        polygon_crossings = keepout_util._polygonCrossings
+        keepout_util._polygonCrossings = lambda polygon, convex: None
+        self.addCleanup(setattr, keepout_util, '_polygonCrossings', polygon_crossings)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertEqual(kicad_mod.clipSilkscreen(clearance=0.2), 0)
+
+        self.assertEqual(len(caught), 1)
+        self.assertIs(caught[0].category, keepout_util.KeepoutClipWarning)
+        self.assertTrue(str(caught[0].message).startswith("test_silkscreen: polygon [(0, -0.5), (3, -0.5)"))
+
+    def testPadKeepouts(self):
+        pad = Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_OVAL, at=[1, 0], size=[1, 2], layers=Pad.LAYERS_SMT)
+        keepout = padKeepouts(pad, 0.5)[0]
+        self.assertTrue(keepout.containsPoint(1, 1.4))
+        self.assertFalse(keepout.containsPoint(1.9, 1.4))
+
+        pad = Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[0, 0], size=[2, 1], rotation=90,
+                  layers=Pad.LAYERS_SMT)
+        self.assertEqual(padKeepouts(pad, 0)[0].bounding_box, [-0.5, 0.5, -1, 1])
+
+        pad = Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_CUSTOM, at=[0, 0], size=[0.5, 0.5], layers=Pad.LAYERS_SMT,
+                  primitives=[Polygon(nodes=[[0, 0], [2, 0], [2, 1]])])
+        keepouts = KeepoutSet(padKeepouts(pad, 0.1))
+        self.assertTrue(keepouts.containsPoint(2.05, 0.5))
+        self.assertFalse(keepouts.containsPoint(0.5, 0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
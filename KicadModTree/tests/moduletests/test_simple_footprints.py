@@ -13,9 +13,15 @@
 #
 # (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import hashlib
+import io
+import os
+import shutil
+import tempfile
 import unittest
 
 from KicadModTree import *
+from KicadModTree.FileHandler import FileHandler
 
 
 RESULT_MINIMUM = """(module test (layer F.Cu) (tedit 0)
@@ -126,3 +132,78 @@ class SimpleFootprintTests(unittest.TestCase):
 
         file_handler = KicadFileHandler(kicad_mod)
         self.assertEqual(file_handler.serialize(timestamp=0), RESULT_BASIC_NODES)
+
+    def testWriteStream(self):
+        kicad_mod = Footprint("test")
+
+        kicad_mod.setDescription("A example footprint")
+        kicad_mod.setTags("example")
+
+        kicad_mod.append(Text(type='reference', text='REF**', at=[0, -3], layer='F.SilkS'))
+        kicad_mod.append(Text(type='value', text="test", at=[1.5, 3], layer='F.Fab'))
+        kicad_mod.append(RectLine(start=[-2, -2], end=[5, 2], layer='F.SilkS'))
+        kicad_mod.append(RectLine(start=[-2.25, -2.25], end=[5.25, 2.25], layer='F.CrtYd'))
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
+                             at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+        kicad_mod.append(Pad(number=2, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
+                             at=[3, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+        kicad_mod.append(Model(filename="example.3dshapes/example_footprint.wrl",
+                               at=[0, 0, 0], scale=[1, 1, 1], rotate=[0, 0, 0]))
+
+        file_handler = KicadFileHandler(kicad_mod)
+
+        stream = io.StringIO()
+        file_handler.writeStream(stream, timestamp=0)
+        self.assertEqual(stream.getvalue(), RESULT_SIMPLE_FOOTPRINT)
+
+        tokens = []
+        file_handler.writeStream(tokens, timestamp=0)
+        self.assertEqual("".join(tokens), RESULT_SIMPLE_FOOTPRINT)
+
+    def testDeterministicTimestamp(self):
+        kicad_mod = Footprint("test")
+        kicad_mod.append(Text(type='reference', text='REF**', at=[0, -3], layer='F.SilkS'))
+        file_handler = KicadFileHandler(kicad_mod)
+
+        try:
+            FileHandler.deterministic = 42
+            self.assertIn("(tedit 2A)", file_handler.serialize())
+            self.assertIn("(tedit 0)", file_handler.serialize(timestamp=0))
+
+            FileHandler.deterministic = 'content'
+            result = file_handler.serialize()
+            self.assertEqual(result, file_handler.serialize())
+
+            # the timestamp is the hash of the content with a zero timestamp
+            content_hash = hashlib.sha256(file_handler.serialize(timestamp=0).encode('utf-8')).hexdigest()
+            self.assertIn("(tedit {:X})".format(int(content_hash[:8], 16)), result)
+
+            kicad_mod.append(Text(type='value', text="test", at=[1.5, 3], layer='F.Fab'))
+            self.assertNotEqual(result.splitlines()[0], file_handler.serialize().splitlines()[0])
+
+            FileHandler.deterministic = 'invalid'
+            self.assertRaises(ValueError, file_handler.serialize)
+        finally:
+            FileHandler.deterministic = None
+
+    def testWriteFileUnchanged(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmp_dir, 'test.kicad_mod')
+            file_handler = KicadFileHandler(Footprint("test"))
+
+            file_handler.writeFile(filename, timestamp=0)
+            os.utime(filename, (0, 0))
+
+            file_handler.writeFile(filename, timestamp=0)
+            self.assertEqual(os.path.getmtime(filename), 0)
+
+            file_handler.writeFile(filename, timestamp=1)
+            self.assertNotEqual(os.path.getmtime(filename), 0)
+            with io.open(filename, 'r') as f:
+                self.assertEqual(f.read(), file_handler.serialize(timestamp=1))
+
+            # the temporary file is always removed or renamed
+            self.assertEqual(os.listdir(tmp_dir), ['test.kicad_mod'])
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,138 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree.util import yaml_util
+
+
+class YamlUtilTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.global_config = os.path.join(self.tmp_dir, 'global.yaml')
+        self.series_config = os.path.join(self.tmp_dir, 'series.yaml')
+
+        self.writeFile(self.global_config, u"silk_line_width: 0.12\nfab_line_width: 0.1\nnames: [a, b]\n")
+        self.writeFile(self.series_config, u"fab_line_width: 0.2\n")
+
+        self.setEnviron(yaml_util.CONFIG_CACHE_ENV, self.cache_dir)
+        self.addCleanup(yaml_util._memo.clear)
+        yaml_util._memo.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def setEnviron(self, name, value):
+        if name in os.environ:
+            self.addCleanup(os.environ.__setitem__, name, os.environ[name])
+        else:
+            self.addCleanup(os.environ.pop, name, None)
+        os.environ[name] = value
+
+    def countParsing(self):
+        # replaces the parser by a wrapper, which records every parsed file
+        parsed = []
+        parse_yaml = yaml_util._parseYaml
+
+        def wrapper(path):
+            parsed.append(path)
+            return parse_yaml(path)
+
+        yaml_util._parseYaml = wrapper
+        self.addCleanup(setattr, yaml_util, '_parseYaml', parse_yaml)
+        return parsed
+
+    def writeFile(self, path, content, mtime=None):
+        with io.open(path, 'w') as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def testLoadConfiguration(self):
+        configuration = yaml_util.loadConfiguration(self.global_config, self.series_config)
+        self.assertEqual(configuration, {'silk_line_width': 0.12, 'fab_line_width': 0.2, 'names': ['a', 'b']})
+
+        # every call returns a new copy
+        configuration['names'].append('c')
+        self.assertEqual(yaml_util.loadYaml(self.global_config)['names'], ['a', 'b'])
+
+    def testCache(self):
+        parsed = self.countParsing()
+
+        yaml_util.loadYaml(self.global_config)
+        yaml_util.loadYaml(self.global_config)
+        self.assertEqual(len(parsed), 1)
+
+        # another process of the same build only reads the cache directory
+        yaml_util._memo.clear()
+        self.assertEqual(yaml_util.loadYaml(self.global_config)['silk_line_width'], 0.12)
+        self.assertEqual(len(parsed), 1)
+
+        # modified files are parsed again
+        self.writeFile(self.global_config, u"silk_line_width: 0.15\n", mtime=1000000000)
+        self.assertEqual(yaml_util.loadYaml(self.global_config), {'silk_line_width': 0.15})
+        self.assertEqual(len(parsed), 2)
+
+        yaml_util._memo.clear()
+        self.assertEqual(yaml_util.loadYaml(self.global_config), {'silk_line_width': 0.15})
+        self.assertEqual(len(parsed), 2)
+
+    def testCacheDir(self):
+        self.setEnviron(yaml_util.CONFIG_CACHE_ENV, '')
+        self.setEnviron(yaml_util.BUILD_CACHE_ENV, self.tmp_dir)
+        self.assertEqual(yaml_util.getConfigCacheDir(), os.path.join(self.tmp_dir, 'config'))
+
+        os.environ[yaml_util.BUILD_CACHE_ENV] = ''
+        self.assertIsNone(yaml_util.getConfigCacheDir())
+        self.assertEqual(yaml_util.loadYaml(self.series_config), {'fab_line_width': 0.2})
+
+    def testIterYamlEntries(self):
+        path = os.path.join(self.tmp_dir, 'size_definitions.yaml')
+        self.writeFile(path, u"FileHeader:\n  library_Suffix: QFN\n"
+                             u"QFN-16: &qfn\n  num_pins_x: 4\n  body_size_x: [2.9, 3.0, 3.1]\n"
+                             u"QFN-16-1EP:\n  <<: *qfn\n  EP_size_x: 1.7\n")
+
+        entries = list(yaml_util.iterYamlEntries(path))
+        self.assertEqual([key for key, value in entries], ['FileHeader', 'QFN-16', 'QFN-16-1EP'])
+        self.assertEqual(entries[2][1], {'num_pins_x': 4, 'body_size_x': [2.9, 3.0, 3.1], 'EP_size_x': 1.7})
+        self.assertEqual(dict(entries), yaml_util._parseYaml(path))
+
+        # the first entries are available before the whole file is parsed
+        self.writeFile(path, u"QFN-16:\n  num_pins_x: 4\nQFN-20: [\n")
+        entries = yaml_util.iterYamlEntries(path)
+        self.assertEqual(next(entries), ('QFN-16', {'num_pins_x': 4}))
+        with self.assertRaises(yaml_util.yaml.YAMLError):
+            next(entries)
+
+        self.writeFile(path, u"QFN-16:\n  num_pins_x: 4\nQFN-16:\n  num_pins_x: 5\n")
+        with self.assertRaises(yaml_util.yaml.YAMLError):
+            list(yaml_util.iterYamlEntries(path))
+
+        self.writeFile(path, u"")
+        self.assertEqual(list(yaml_util.iterYamlEntries(path)), [])
+
+        self.writeFile(path, u"[1, 2]\n")
+        with self.assertRaises(yaml_util.yaml.YAMLError):
+            list(yaml_util.iterYamlEntries(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
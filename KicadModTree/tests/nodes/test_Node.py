@@ -16,6 +16,8 @@
 import unittest
 
 from KicadModTree.nodes.Node import *
+from KicadModTree.nodes.specialized.Translation import Translation
+from KicadModTree.nodes.specialized.Rotation import Rotation
 
 
 class TestChildNode(Node):
@@ -264,3 +266,100 @@ class NodeTests(unittest.TestCase):
         node.insert(insertNode)
         self.assertEqual(len(node.getNormalChilds()), 1)
         self.assertEqual(len(insertNode.getNormalChilds()), 200)
+
+    def testGetRealPosition(self):
+        node = Node()
+        childNode = Node()
+        node.append(childNode)
+
+        self.assertEqual(childNode.getRealPosition([1, 2]), Vector3D(1, 2))
+        self.assertEqual(childNode.getRealPosition([1, 2], 45), (Vector3D(1, 2), 45))
+
+        translation = Translation(1, 2)
+        node.insert(translation)
+        self.assertEqual(childNode.getRealPosition([1, 2]), Vector3D(2, 4))
+
+        rotation = Rotation(90)
+        translation.insert(rotation)
+        position, angle = childNode.getRealPosition([1, 2], 10)
+        self.assertAlmostEqual(position.x, 3)
+        self.assertAlmostEqual(position.y, 1)
+        self.assertEqual(angle, 100)
+
+        positions = childNode.getRealPositions([[1, 2], Vector2D(0, 0)])
+        self.assertEqual(len(positions), 2)
+        self.assertAlmostEqual(positions[0].x, 3)
+        self.assertAlmostEqual(positions[0].y, 1)
+        self.assertAlmostEqual(positions[1].x, 1)
+        self.assertAlmostEqual(positions[1].y, 2)
+
+        # moving nodes around has to invalidate the cached transformation
+        translation.remove(rotation)
+        position, angle = childNode.getRealPosition([1, 2], 10)
+        self.assertAlmostEqual(position.x, 2)
+        self.assertAlmostEqual(position.y, -1)
+        self.assertEqual(angle, 100)
+
+        rotation.append(Translation(0, 0))
+        rotation.insert(Translation(3, 4))
+        position = childNode.getRealPosition([1, 2])
+        self.assertAlmostEqual(position.x, 6)
+        self.assertAlmostEqual(position.y, -4)
+
+    def testIterNodes(self):
+        class VirtualChildNode(Node):
+            def __init__(self):
+                Node.__init__(self)
+                self.virtual_childs = [Node(), Node()]
+
+            def getVirtualChilds(self):
+                return self.virtual_childs
+
+        node = Node()
+        childNode1 = VirtualChildNode()
+        childNode2 = Node()
+        grandChildNode = Node()
+        node.extend([childNode1, childNode2])
+        childNode1.append(grandChildNode)
+
+        expected = [node, childNode1, grandChildNode] + childNode1.virtual_childs + [childNode2]
+        self.assertEqual(list(node.iterNodes()), expected)
+        self.assertEqual(node.serialize(), expected)
+        self.assertEqual(list(node.iterNodes(virtual=False)), [node, childNode1, grandChildNode, childNode2])
+
+        # deep trees are not limited by the recursion limit
+        deepNode = node
+        for _ in range(5000):
+            childNode = Node()
+            deepNode.append(childNode)
+            deepNode = childNode
+        self.assertEqual(len(node.serialize()), 5006)
+
+    def testVirtualChildsCache(self):
+        class GeneratorNode(Node):
+            def __init__(self):
+                Node.__init__(self)
+                self.created = 0
+
+            def _createVirtualChilds(self):
+                self.created += 1
+                child = Node()
+                child._parent = self
+                return [child]
+
+        node = GeneratorNode()
+        virtual_childs = node.getVirtualChilds()
+        self.assertIs(node.getVirtualChilds(), virtual_childs)
+        node.serialize()
+        self.assertEqual(node.created, 1)
+
+        node.invalidateVirtualChilds()
+        self.assertIsNot(node.getVirtualChilds(), virtual_childs)
+        self.assertEqual(node.created, 2)
+
+        # the transformation of cached virtual childs follows their parent
+        virtual_child = node.getVirtualChilds()[0]
+        self.assertEqual(virtual_child.getRealPosition([1, 2]), Vector3D(1, 2))
+        translation = Translation(1, 2)
+        translation.append(node)
+        self.assertEqual(virtual_child.getRealPosition([1, 2]), Vector3D(2, 4))
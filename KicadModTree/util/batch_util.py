@@ -0,0 +1,376 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r""" Batched geometry operations
+
+The functions in this module work on whole lists of points, lines and circles at once.
+If numpy is installed, batches with at least ``BATCH_THRESHOLD`` elements are processed
+as arrays, smaller batches (and every batch if numpy is missing) use plain python floats.
+Both ways return the same results in the same order.
+
+Points can be given as ``Vector2D``, ``(x, y)`` tuples or ``{'x': x, 'y': y}`` dicts,
+lines as ``geometricLine`` objects (or ``Line`` nodes) or as ``(start, end)`` pairs
+and circles as ``geometricCircle``/``geometricArc`` objects (or their nodes) or as ``(center, radius)`` pairs.
+"""
+
+from __future__ import division
+
+import math
+
+from KicadModTree.Vector import Vector2D
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+BATCH_THRESHOLD = 64
+
+
+def _useNumpy(size, use_numpy):
+    if use_numpy is None:
+        return NUMPY_AVAILABLE and size >= BATCH_THRESHOLD
+    if use_numpy and not NUMPY_AVAILABLE:
+        raise ImportError('numpy is required for use_numpy=True')
+    return use_numpy
+
+
+def _toXY(point):
+    if isinstance(point, Vector2D):
+        return point.x, point.y
+    if isinstance(point, dict):
+        return point.get('x', 0), point.get('y', 0)
+    return point[0], point[1]
+
+
+def _lineCoordinates(line):
+    if hasattr(line, 'start_pos'):
+        start, end = line.start_pos, line.end_pos
+    else:
+        start, end = line
+    return _toXY(start) + _toXY(end)
+
+
+def _circleCoordinates(circle):
+    if hasattr(circle, 'center_pos'):
+        center, radius = circle.center_pos, circle.getRadius()
+    else:
+        center, radius = circle
+    return _toXY(center) + (radius,)
+
+
+def intersectLinePair(x1, y1, x2, y2, x3, y3, x4, y4):
+    r""" Intersection point of two infinite lines given by two points each
+
+    :return: ``(x, y)`` or None for parallel lines
+    """
+    # homogeneous representation of both lines and the cross product of them
+    a1, b1, c1 = y1 - y2, x2 - x1, x1*y2 - y1*x2
+    a2, b2, c2 = y3 - y4, x4 - x3, x3*y4 - y3*x4
+
+    z = a1*b2 - b1*a2
+    if z == 0:
+        return None
+    return (b1*c2 - c1*b2)/z, (c1*a2 - a1*c2)/z
+
+
+def intersectLineCircle(x1, y1, x2, y2, cx, cy, radius):
+    r""" Intersection points of an infinite line with a circle
+
+    :return: list of zero, one or two ``(x, y)`` tuples
+    """
+    # from http://mathworld.wolfram.com/Circle-LineIntersection.html
+    # the equations are for a circle centered on (0, 0), so the line is moved relative to the center
+    x1, y1, x2, y2 = x1 - cx, y1 - cy, x2 - cx, y2 - cy
+
+    dx = x2 - x1
+    dy = y2 - y1
+    dr = math.hypot(dx, dy)
+    D = x1*y2 - x2*y1
+
+    discriminant = radius**2 * dr**2 - D**2
+    if discriminant < 0:
+        return []
+
+    root = math.sqrt(discriminant)
+    sign = math.copysign(1, dy)
+    points = [((D*dy + sign*dx*root)/dr**2 + cx, (-D*dx + abs(dy)*root)/dr**2 + cy)]
+    if discriminant == 0:
+        return points
+
+    points.append(((D*dy - sign*dx*root)/dr**2 + cx, (-D*dx - abs(dy)*root)/dr**2 + cy))
+    return points
+
+
+def intersectCirclePair(x1, y1, r1, x2, y2, r2):
+    r""" Intersection points of two circles
+
+    Concentric circles have no intersection points, even if they are identical.
+
+    :return: list of zero, one or two ``(x, y)`` tuples
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    d = math.hypot(dx, dy)
+    if d == 0 or d > r1 + r2 or d < abs(r1 - r2):
+        return []
+
+    # distance from the first center to the chord through both intersections and half of the chord length
+    a = (r1**2 - r2**2 + d**2) / (2*d)
+    h2 = r1**2 - a**2
+    mx, my = x1 + a*dx/d, y1 + a*dy/d
+    if h2 <= 0:
+        return [(mx, my)]
+
+    h = math.sqrt(h2)
+    return [(mx + h*dy/d, my - h*dx/d), (mx - h*dy/d, my + h*dx/d)]
+
+
+def transformPoints(points, matrix=(1, 0, 0, 1), offset=(0, 0), use_numpy=None):
+    r""" Apply an affine transformation to many points
+
+    Every point is mapped to ``(a*x + b*y + offset.x, c*x + d*y + offset.y)``
+
+    :params:
+        * *points* (``list(Vector2D)``) --
+          the points to transform
+        * *matrix* (``(a, b, c, d)``) --
+          linear part of the transformation. default: identity
+        * *offset* (``Vector2D``) --
+          translation applied after the linear part. default: (0, 0)
+        * *use_numpy* (``bool``) --
+          force or prevent the use of numpy. default: decide by batch size
+
+    :return: list of ``Vector2D``
+    """
+    a, b, c, d = matrix
+    tx, ty = _toXY(offset)
+    coordinates = [_toXY(p) for p in points]
+
+    if _useNumpy(len(coordinates), use_numpy):
+        xy = numpy.array(coordinates, dtype=float).reshape(-1, 2)
+        xs = a*xy[:, 0] + b*xy[:, 1] + tx
+        ys = c*xy[:, 0] + d*xy[:, 1] + ty
+        return [Vector2D(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+
+    return [Vector2D(a*x + b*y + tx, c*x + d*y + ty) for x, y in coordinates]
+
+
+def translatePoints(points, distance_vector, use_numpy=None):
+    r""" Translate many points
+
+    :params:
+        * *points* (``list(Vector2D)``) --
+          the points to translate
+        * *distance_vector* (``Vector2D``) --
+          2D vector defining by how much and in what direction to translate.
+
+    :return: list of ``Vector2D``
+    """
+    return transformPoints(points, offset=distance_vector, use_numpy=use_numpy)
+
+
+def rotatePoints(points, angle, origin=(0, 0), use_degrees=True, use_numpy=None):
+    r""" Rotate many points around given origin, like ``Vector2D.rotate`` does for a single one
+
+    :params:
+        * *points* (``list(Vector2D)``) --
+          the points to rotate
+        * *angle* (``float``) --
+          rotation angle
+        * *origin* (``Vector2D``) --
+          origin point for the rotation. default: (0, 0)
+        * *use_degrees* (``boolean``) --
+          rotation angle is given in degrees. default:True
+
+    :return: list of ``Vector2D``
+    """
+    if use_degrees:
+        angle = math.radians(angle)
+    ca, sa = math.cos(angle), math.sin(angle)
+    ox, oy = _toXY(origin)
+
+    return transformPoints(points, (ca, -sa, sa, ca), (ox - ca*ox + sa*oy, oy - sa*ox - ca*oy), use_numpy)
+
+
+def mirrorPoints(points, x_mirror=None, y_mirror=None, use_numpy=None):
+    r""" Mirror many points, like the mirror options of ``Pad``
+
+    :params:
+        * *points* (``list(Vector2D)``) --
+          the points to mirror
+        * *x_mirror* (``[int, float](mirror offset)``) --
+          mirror x direction around offset "point"
+        * *y_mirror* (``[int, float](mirror offset)``) --
+          mirror y direction around offset "point"
+
+    :return: list of ``Vector2D``
+    """
+    a, tx = (1, 0) if x_mirror is None else (-1, 2 * x_mirror)
+    d, ty = (1, 0) if y_mirror is None else (-1, 2 * y_mirror)
+    return transformPoints(points, (a, 0, 0, d), (tx, ty), use_numpy)
+
+
+def intersectLines(lines, others, use_numpy=None):
+    r""" Intersect all pairs of (infinite) lines
+
+    :params:
+        * *lines* (``list(geometricLine)``) --
+          first set of lines
+        * *others* (``list(geometricLine)``) --
+          second set of lines
+
+    :return: list of ``(i, j, Vector2D)`` for every pair of non parallel lines ``lines[i]``, ``others[j]``
+
+    :Example:
+
+    >>> from KicadModTree.util.batch_util import intersectLines
+    >>> intersectLines([((0, 0), (1, 0))], [((2, -1), (2, 1)), ((0, 1), (1, 1))])
+    [(0, 0, Vector2D (x=2.0, y=0.0))]
+    """
+    first = [_lineCoordinates(line) for line in lines]
+    second = [_lineCoordinates(line) for line in others]
+
+    if not _useNumpy(len(first) * len(second), use_numpy):
+        result = []
+        for i, line in enumerate(first):
+            for j, other in enumerate(second):
+                point = intersectLinePair(*(line + other))
+                if point is not None:
+                    result.append((i, j, Vector2D(point)))
+        return result
+
+    if not first or not second:
+        return []
+    x1, y1, x2, y2 = (v[:, None] for v in numpy.array(first, dtype=float).T)
+    x3, y3, x4, y4 = (v[None, :] for v in numpy.array(second, dtype=float).T)
+
+    a1, b1, c1 = y1 - y2, x2 - x1, x1*y2 - y1*x2
+    a2, b2, c2 = y3 - y4, x4 - x3, x3*y4 - y3*x4
+    z = a1*b2 - b1*a2
+    rows, columns = numpy.nonzero(z)
+    z = z[rows, columns]
+    xs = (b1*c2 - c1*b2)[rows, columns] / z
+    ys = (c1*a2 - a1*c2)[rows, columns] / z
+
+    return [(i, j, Vector2D(x, y)) for i, j, x, y in zip(rows.tolist(), columns.tolist(), xs.tolist(), ys.tolist())]
+
+
+def intersectLinesWithCircles(lines, circles, use_numpy=None):
+    r""" Intersect all (infinite) lines with all circles
+
+    :params:
+        * *lines* (``list(geometricLine)``) --
+          the lines
+        * *circles* (``list(geometricCircle)``) --
+          the circles. Arcs are handled as their full circle.
+
+    :return: list of ``(i, j, Vector2D)`` for every intersection of ``lines[i]`` with ``circles[j]``.
+             A secant gives two entries for the same pair.
+    """
+    first = [_lineCoordinates(line) for line in lines]
+    second = [_circleCoordinates(circle) for circle in circles]
+
+    if not _useNumpy(len(first) * len(second), use_numpy):
+        result = []
+        for i, line in enumerate(first):
+            for j, circle in enumerate(second):
+                for point in intersectLineCircle(*(line + circle)):
+                    result.append((i, j, Vector2D(point)))
+        return result
+
+    if not first or not second:
+        return []
+    x1, y1, x2, y2 = (v[:, None] for v in numpy.array(first, dtype=float).T)
+    cx, cy, radius = (v[None, :] for v in numpy.array(second, dtype=float).T)
+
+    x1, y1, x2, y2 = x1 - cx, y1 - cy, x2 - cx, y2 - cy
+    dx = x2 - x1
+    dy = y2 - y1
+    dr2 = numpy.hypot(dx, dy)**2
+    D = x1*y2 - x2*y1
+    discriminant = radius**2 * dr2 - D**2
+
+    rows, columns = numpy.nonzero(discriminant >= 0)
+    root = numpy.sqrt(discriminant[rows, columns])
+    D, dx, dy, dr2, cx, cy = (v[rows, columns] for v in numpy.broadcast_arrays(D, dx, dy, dr2, cx, cy))
+    sign = numpy.copysign(1, dy)
+
+    px1 = ((D*dy + sign*dx*root)/dr2 + cx).tolist()
+    py1 = ((-D*dx + numpy.abs(dy)*root)/dr2 + cy).tolist()
+    px2 = ((D*dy - sign*dx*root)/dr2 + cx).tolist()
+    py2 = ((-D*dx - numpy.abs(dy)*root)/dr2 + cy).tolist()
+
+    result = []
+    for k, (i, j) in enumerate(zip(rows.tolist(), columns.tolist())):
+        result.append((i, j, Vector2D(px1[k], py1[k])))
+        if root[k] != 0:
+            result.append((i, j, Vector2D(px2[k], py2[k])))
+    return result
+
+
+def intersectCircles(circles, others, use_numpy=None):
+    r""" Intersect all pairs of circles
+
+    :params:
+        * *circles* (``list(geometricCircle)``) --
+          first set of circles. Arcs are handled as their full circle.
+        * *others* (``list(geometricCircle)``) --
+          second set of circles
+
+    :return: list of ``(i, j, Vector2D)`` for every intersection of ``circles[i]`` with ``others[j]``.
+             Two intersecting circles give two entries for the same pair.
+    """
+    first = [_circleCoordinates(circle) for circle in circles]
+    second = [_circleCoordinates(circle) for circle in others]
+
+    if not _useNumpy(len(first) * len(second), use_numpy):
+        result = []
+        for i, circle in enumerate(first):
+            for j, other in enumerate(second):
+                for point in intersectCirclePair(*(circle + other)):
+                    result.append((i, j, Vector2D(point)))
+        return result
+
+    if not first or not second:
+        return []
+    x1, y1, r1 = (v[:, None] for v in numpy.array(first, dtype=float).T)
+    x2, y2, r2 = (v[None, :] for v in numpy.array(second, dtype=float).T)
+
+    dx = x2 - x1
+    dy = y2 - y1
+    d = numpy.hypot(dx, dy)
+    rows, columns = numpy.nonzero((d != 0) & (d <= r1 + r2) & (d >= numpy.abs(r1 - r2)))
+    x1, y1, r1, r2, dx, dy, d = (v[rows, columns] for v in numpy.broadcast_arrays(x1, y1, r1, r2, dx, dy, d))
+
+    a = (r1**2 - r2**2 + d**2) / (2*d)
+    h2 = r1**2 - a**2
+    h = numpy.sqrt(numpy.maximum(h2, 0))
+    mx, my = x1 + a*dx/d, y1 + a*dy/d
+
+    px1 = (mx + h*dy/d).tolist()
+    py1 = (my - h*dx/d).tolist()
+    px2 = (mx - h*dy/d).tolist()
+    py2 = (my + h*dx/d).tolist()
+
+    result = []
+    for k, (i, j) in enumerate(zip(rows.tolist(), columns.tolist())):
+        if h2[k] <= 0:
+            result.append((i, j, Vector2D(mx[k], my[k])))
+            continue
+        result.append((i, j, Vector2D(px1[k], py1[k])))
+        result.append((i, j, Vector2D(px2[k], py2[k])))
+    return result
@@ -0,0 +1,161 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from bisect import bisect_left
+import math
+
+from KicadModTree.nodes.base.Line import Line
+from KicadModTree.nodes.base.Pad import Pad
+
+
+# courtyard line width required by the KLC
+DEFAULT_COURTYARD_WIDTH = 0.05
+
+# digits which are kept when coordinates are converted to grid units, to get rid of floating point noise
+GRID_DIGITS = 6
+
+
+def _toGrid(box, clearance, grid):
+    # the box grown by the clearance, rounded outwards to the grid and given in grid units
+    min_x, min_y, max_x, max_y = box
+    return (int(math.floor(round((min_x - clearance) / grid, GRID_DIGITS))),
+            int(math.floor(round((min_y - clearance) / grid, GRID_DIGITS))),
+            int(math.ceil(round((max_x + clearance) / grid, GRID_DIGITS))),
+            int(math.ceil(round((max_y + clearance) / grid, GRID_DIGITS))))
+
+
+def unionOutline(rectangles):
+    r""" outline of the union of axis aligned rectangles, holes are filled
+
+    The rectangles are given as ``(min_x, min_y, max_x, max_y)``. Best used with integer coordinates, as
+    coordinates are compared for equality. The plane is split into cells at every rectangle border, the cells
+    covered by a rectangle (or enclosed by covered ones) are marked and the borders between marked and unmarked cells
+    are joined to the longest possible straight lines.
+
+    :params:
+        * *rectangles* (``list((min_x, min_y, max_x, max_y))``) --
+          rectangles to join
+
+    :return: list of lines ``(x0, y0, x1, y1)``, horizontal lines first
+
+    :Example:
+
+    >>> from KicadModTree.util.courtyard_util import unionOutline
+    >>> unionOutline([(0, 0, 2, 1), (1, 0, 3, 1)])
+    [(0, 0, 3, 0), (0, 1, 3, 1), (0, 0, 0, 1), (3, 0, 3, 1)]
+    """
+    rectangles = [r for r in rectangles if r[0] < r[2] and r[1] < r[3]]
+    if not rectangles:
+        return []
+
+    xs = sorted(set(r[0] for r in rectangles) | set(r[2] for r in rectangles))
+    ys = sorted(set(r[1] for r in rectangles) | set(r[3] for r in rectangles))
+
+    # cell (i, j) spans xs[i-1]..xs[i] and ys[j-1]..ys[j], the cells in row/column 0 and at the end are outside of
+    # all rectangles, so the outside is connected around everything
+    columns, rows = len(xs) + 1, len(ys) + 1
+    covered = [[False] * rows for i in range(columns)]
+    for min_x, min_y, max_x, max_y in rectangles:
+        for i in range(bisect_left(xs, min_x) + 1, bisect_left(xs, max_x) + 1):
+            column = covered[i]
+            for j in range(bisect_left(ys, min_y) + 1, bisect_left(ys, max_y) + 1):
+                column[j] = True
+
+    # everything which can not be reached from the outside is inside
+    inside = [[True] * rows for i in range(columns)]
+    stack = [(0, 0)]
+    inside[0][0] = False
+    while stack:
+        i, j = stack.pop()
+        for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if 0 <= ni < columns and 0 <= nj < rows and inside[ni][nj] and not covered[ni][nj]:
+                inside[ni][nj] = False
+                stack.append((ni, nj))
+
+    lines = []
+    # horizontal borders between the cells (i, j-1) and (i, j), at ys[j-1]
+    for j in range(1, rows):
+        start = None
+        for i in range(columns):
+            border = inside[i][j] != inside[i][j - 1]
+            if border and start is None:
+                start = i
+            elif not border and start is not None:
+                lines.append((xs[start - 1], ys[j - 1], xs[i - 1], ys[j - 1]))
+                start = None
+    # vertical borders between the cells (i-1, j) and (i, j), at xs[i-1]
+    for i in range(1, columns):
+        start = None
+        for j in range(rows):
+            border = inside[i][j] != inside[i - 1][j]
+            if border and start is None:
+                start = j
+            elif not border and start is not None:
+                lines.append((xs[i - 1], ys[start - 1], xs[i - 1], ys[j - 1]))
+                start = None
+
+    return lines
+
+
+def generateCourtyard(footprint, clearance=0.25, grid=0.01, layer='F.CrtYd', width=DEFAULT_COURTYARD_WIDTH,
+                      body_layers=None):
+    r""" add a courtyard around the pads and the body of a footprint
+
+    The courtyard is the outline of the union of the bounding boxes of all pads and of the body (all nodes on the
+    *body_layers*), each grown by the clearance. The bounding boxes are taken from ``Node.calculateBoundingBox``, and
+    rounded outwards to the grid before they are joined, so the corners of the courtyard are on the grid.
+
+    :params:
+        * *footprint* (``Footprint``) --
+          footprint to which the courtyard is added
+        * *clearance* (``float``) --
+          distance between the courtyard and the pads and the body (default: 0.25)
+        * *grid* (``float``) --
+          grid of the courtyard lines (default: 0.01)
+        * *layer* (``str``) --
+          layer of the courtyard (default: 'F.CrtYd')
+        * *width* (``float``) --
+          width of the courtyard lines (default: 0.05)
+        * *body_layers* (``list(str)``) --
+          layers whose extents are the body of the part (default: ['F.Fab'])
+
+    :return: list of the added ``Line`` nodes
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> kicad_mod.append(RectLine(start=[-2, -1], end=[2, 1], layer='F.Fab'))
+    >>> len(kicad_mod.generateCourtyard(clearance=0.25))
+    4
+    """
+    if body_layers is None:
+        body_layers = ['F.Fab']
+
+    boxes = []
+    body = footprint.calculateBoundingBox(layers=body_layers)
+    if body is not None:
+        boxes.append(body)
+    for node in footprint.iterNodes():
+        if isinstance(node, Pad):
+            boxes.append(node.calculateBoundingBox())
+
+    rectangles = [_toGrid((box['min'].x, box['min'].y, box['max'].x, box['max'].y), clearance, grid) for box in boxes]
+
+    lines = [Line(start=[round(x0 * grid, GRID_DIGITS), round(y0 * grid, GRID_DIGITS)],
+                  end=[round(x1 * grid, GRID_DIGITS), round(y1 * grid, GRID_DIGITS)], layer=layer, width=width)
+             for x0, y0, x1, y1 in unionOutline(rectangles)]
+    footprint.extend(lines)
+    return lines
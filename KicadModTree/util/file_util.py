@@ -0,0 +1,40 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+
+
+def replaceFile(source, destination):
+    r"""Rename a file, and replace the destination if it already exists
+
+    Other processes either see the old or the new file, so it can be used to publish a completely written temporary
+    file. Only python2 on windows has to remove the destination first.
+
+    :param source: path of the new file
+    :param destination: path of the file which is replaced
+    """
+
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+        return
+
+    try:
+        os.rename(source, destination)
+    except OSError:
+        # python2 on windows can not rename a file to an existing path
+        if not os.path.exists(destination):
+            raise
+        os.remove(destination)
+        os.rename(source, destination)
@@ -15,6 +15,7 @@
 
 import math
 from KicadModTree.Vector import *
+from KicadModTree.util.batch_util import intersectLinePair, intersectLineCircle, intersectCirclePair
 import copy
 
 
@@ -109,9 +110,19 @@ class geometricLine():
             * *other* (``Line``, ``Circle``, ``Arc``)
                 cut the element on any intersection with the given geometric element
         """
-        ip = BaseNodeIntersection.intersectTwoNodes(self, *other)
+        return self.cutAtPoints(BaseNodeIntersection.intersectTwoNodes(self, *other))
+
+    def cutAtPoints(self, points):
+        r""" cut line at the given points
+
+        Points not on the line are ignored.
+
+        :params:
+            * *points* (``[Vector2D]``)
+                the points to cut at, e.g. intersections calculated with ``batch_util``
+        """
         cp = []
-        for p in ip:
+        for p in points:
             if self.isPointOnSelf(p):
                 cp.append(p)
 
@@ -214,25 +225,60 @@ class geometricCircle():
         return abs(self.radius - rad_p) < tolerance
 
     def sortPointsRelativeToStart(self, points):
-        r""" sort given points releative to start point
+        r""" sort given points by their polar angle, starting at 0 deg
 
         :params:
             * *points* (``[Vector2D]``)
                 itterable of points
         """
 
-        pass
+        return sorted(points, key=lambda p: Vector2D(p).to_polar(origin=self.center_pos)[1] % 360)
 
     def cut(self, *other):
-        r""" cut line with given other element
+        r""" cut circle with given other element
 
         :params:
             * *other* (``Line``, ``Circle``, ``Arc``)
                 cut the element on any intersection with the given geometric element
         """
-        raise NotImplemented("cut for circles not yet implemented")
-        # re use arc implementation with angle set to 360 deg
-        # and start point set to 0 deg (polar)
+
+        return self.cutAtPoints(BaseNodeIntersection.intersectTwoNodes(self, *other))
+
+    def cutAtPoints(self, points, tolerance=1e-7):
+        r""" cut circle at the given points
+
+        Points not on the circle are ignored. The result are arcs running counter clockwise
+        from one cut point to the next, or a copy of the circle if there is no cut point on it.
+
+        :params:
+            * *points* (``[Vector2D]``)
+                the points to cut at, e.g. intersections calculated with ``batch_util``
+            * *tolerance* (``float``)
+                tolerance used to determine if a point is on the circle
+                and if two points are the same. default: 1e-7
+        """
+
+        angles = []
+        for p in self.sortPointsRelativeToStart([p for p in points if self.isPointOnSelf(p, tolerance)]):
+            angle = Vector2D(p).to_polar(origin=self.center_pos)[1] % 360
+            if not angles or angle - angles[-1] > tolerance:
+                angles.append(angle)
+        if len(angles) > 1 and angles[0] + 360 - angles[-1] <= tolerance:
+            angles.pop()
+
+        if not angles:
+            return [geometricCircle(center=self.center_pos, radius=self.radius)]
+
+        r = []
+        for i, angle in enumerate(angles):
+            next_angle = angles[(i+1) % len(angles)]
+            r.append(geometricArc(
+                center=self.center_pos,
+                start=Vector2D.from_polar(radius=self.radius, angle=angle, origin=self.center_pos),
+                angle=(next_angle - angle) % 360 or 360
+                ))
+
+        return r
 
     def __iter__(self):
         yield self.center_pos
@@ -485,9 +531,19 @@ class geometricArc():
                 cut the element on any intersection with the given geometric element
         """
 
-        ip = BaseNodeIntersection.intersectTwoNodes(self, *other)
+        return self.cutAtPoints(BaseNodeIntersection.intersectTwoNodes(self, *other))
+
+    def cutAtPoints(self, points):
+        r""" cut arc at the given points
+
+        Points not on the arc are ignored.
+
+        :params:
+            * *points* (``[Vector2D]``)
+                the points to cut at, e.g. intersections calculated with ``batch_util``
+        """
         cp = []
-        for p in ip:
+        for p in points:
             if self.isPointOnSelf(p):
                 cp.append(p)
 
@@ -532,7 +588,6 @@ class geometricArc():
 class BaseNodeIntersection():
     @staticmethod
     def intersectTwoNodes(*nodes):
-        import KicadModTree.nodes.base.Line
         if len(nodes) < 2 or len(nodes) > 3:
             raise KeyError("intersectTwoNodes expects two node objects or a node and two vectors")
 
@@ -541,64 +596,42 @@ class BaseNodeIntersection():
         vectors = []
 
         for n in nodes:
-            if hasattr(n, 'getRadius') and hasattr(n, 'center_pos'):
+            if isinstance(n, (geometricCircle, geometricArc)):
                 circles.append(n)
-            elif hasattr(n, 'end_pos') and hasattr(n, 'start_pos'):
+            elif isinstance(n, geometricLine):
                 lines.append(n)
             else:
                 vectors.append(n)
 
         if len(vectors) == 2:
-            lines.append(Line(start=vectors[0], end=vectors[1]))
+            lines.append(geometricLine(start=vectors[0], end=vectors[1]))
 
         if len(lines) == 2:
             return BaseNodeIntersection.intersectTwoLines(*lines)
         if len(circles) == 2:
-            raise NotImplementedError('intersection between circles is not supported')
+            return BaseNodeIntersection.intersectTwoCircles(*circles)
         if len(lines) == 1 and len(circles) == 1:
             return BaseNodeIntersection.intersectLineWithCircle(lines[0], circles[0])
 
-        print(lines)
-        print(circles)
         raise NotImplementedError('unsupported combination of parameter types')
 
     @staticmethod
     def intersectTwoLines(line1, line2):
-        # we use homogeneous coordinates here.
-        l1 = line1.to_homogeneous()
-        l2 = line2.to_homogeneous()
-
-        ip = l1.cross_product(l2)
-        if ip.z == 0:
+        ip = intersectLinePair(line1.start_pos.x, line1.start_pos.y, line1.end_pos.x, line1.end_pos.y,
+                               line2.start_pos.x, line2.start_pos.y, line2.end_pos.x, line2.end_pos.y)
+        if ip is None:
             return []
 
-        return [Vector2D.from_homogeneous(ip)]
+        return [Vector2D(ip)]
 
     @staticmethod
     def intersectLineWithCircle(line, circle):
-        # from http://mathworld.wolfram.com/Circle-LineIntersection.html
-        # Equations are for circle center on (0, 0) so we translate everything
-        # to the origin (well the line anyways as we do only need the radius of the circle)
-        lt = line.copy().translate(-circle.center_pos)
-
-        d = lt.end_pos - lt.start_pos
-        dr = math.hypot(d.x, d.y)
-        D = lt.start_pos.x*lt.end_pos.y - lt.end_pos.x*lt.start_pos.y
-
-        discriminant = circle.getRadius()**2 * dr**2 - D**2
-        intersection = []
-        if discriminant < 0:
-            return intersection
-
-        def calcPoint(x):
-            return Vector2D({
-                'x': (D*d.y + x*math.copysign(1, d.y)*d.x*math.sqrt(discriminant))/dr**2,
-                'y': (-D*d.x + x*abs(d.y)*math.sqrt(discriminant))/dr**2
-                }) + circle.center_pos
-
-        intersection.append(calcPoint(1))
-        if discriminant == 0:
-            return intersection
-
-        intersection.append(calcPoint(-1))
-        return intersection
+        return [Vector2D(p) for p in intersectLineCircle(
+            line.start_pos.x, line.start_pos.y, line.end_pos.x, line.end_pos.y,
+            circle.center_pos.x, circle.center_pos.y, circle.getRadius())]
+
+    @staticmethod
+    def intersectTwoCircles(circle1, circle2):
+        return [Vector2D(p) for p in intersectCirclePair(
+            circle1.center_pos.x, circle1.center_pos.y, circle1.getRadius(),
+            circle2.center_pos.x, circle2.center_pos.y, circle2.getRadius())]
@@ -0,0 +1,849 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from __future__ import division
+
+import bisect
+import math
+import warnings
+
+
+# pieces of a clipped primitive shorter than this (in parameter space) are dropped
+CLIP_TOLERANCE = 1e-9
+
+# circles are replaced by circumscribed polygons with this many corners when they are subtracted from polygons
+CIRCLE_SEGMENTS = 32
+
+
+class KeepoutClipWarning(UserWarning):
+    r""" issued when a primitive can not be clipped against a keepout, the primitive is kept unchanged
+    """
+    pass
+
+
+def _formatPoints(points):
+    return "[{}]".format(", ".join("({:g}, {:g})".format(x, y) for x, y in points))
+
+
+def _mergeIntervals(intervals):
+    merged = []
+    for t0, t1 in sorted(intervals):
+        if merged and t0 <= merged[-1][1]:
+            if t1 > merged[-1][1]:
+                merged[-1][1] = t1
+        else:
+            merged.append([t0, t1])
+    return [(t0, t1) for t0, t1 in merged]
+
+
+def _lineCircleParameters(x0, y0, dx, dy, cx, cy, r):
+    # parameters t of the points x0 + t*dx, y0 + t*dy on the circle
+    a = dx * dx + dy * dy
+    if a == 0:
+        return []
+    fx = x0 - cx
+    fy = y0 - cy
+    b = 2 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - r * r
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        return []
+    root = math.sqrt(discriminant)
+    return [(-b - root) / (2 * a), (-b + root) / (2 * a)]
+
+
+def _polygonArea(points):
+    # signed area, positive when the points run from the x-axis towards the y-axis
+    area = 0.
+    for (xa, ya), (xb, yb) in zip(points, points[1:] + points[:1]):
+        area += xa * yb - xb * ya
+    return area / 2
+
+
+def _convexHull(points):
+    # Andrew's monotone chain
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+
+    def halfHull(points):
+        hull = []
+        for p in points:
+            while len(hull) >= 2 and ((hull[-1][0] - hull[-2][0]) * (p[1] - hull[-2][1]) -
+                                      (hull[-1][1] - hull[-2][1]) * (p[0] - hull[-2][0])) <= 0:
+                hull.pop()
+            hull.append(p)
+        return hull[:-1]
+
+    return halfHull(points) + halfHull(points[::-1])
+
+
+def _segmentCrossing(p0, p1, q0, q1):
+    # parameters (s, t) of the crossing p0 + s * (p1 - p0) = q0 + t * (q1 - q0), None for parallel segments
+    dx = p1[0] - p0[0]
+    dy = p1[1] - p0[1]
+    ex = q1[0] - q0[0]
+    ey = q1[1] - q0[1]
+    denominator = dx * ey - dy * ex
+    if denominator == 0:
+        return None
+    s = ((q0[0] - p0[0]) * ey - (q0[1] - p0[1]) * ex) / denominator
+    t = ((q0[0] - p0[0]) * dy - (q0[1] - p0[1]) * dx) / denominator
+    return s, t
+
+
+def _polygonCrossings(polygon, convex):
+    # crossings [point, polygon edge, s, convex edge, t, entering] of the borders, None if a vertex of one polygon
+    # touches the border of the other one, which can not be classified as entering or leaving
+    crossings = []
+    n = len(polygon)
+    m = len(convex)
+    for i in range(n):
+        p0 = polygon[i]
+        p1 = polygon[(i + 1) % n]
+        for k in range(m):
+            q0 = convex[k]
+            q1 = convex[(k + 1) % m]
+            parameters = _segmentCrossing(p0, p1, q0, q1)
+            if parameters is None:
+                if (p1[0] - p0[0]) * (q0[1] - p0[1]) == (p1[1] - p0[1]) * (q0[0] - p0[0]) and \
+                        max(p0[0], p1[0]) >= min(q0[0], q1[0]) and min(p0[0], p1[0]) <= max(q0[0], q1[0]) and \
+                        max(p0[1], p1[1]) >= min(q0[1], q1[1]) and min(p0[1], p1[1]) <= max(q0[1], q1[1]):
+                    return None
+                continue
+            s, t = parameters
+            if -CLIP_TOLERANCE <= s <= 1 + CLIP_TOLERANCE and -CLIP_TOLERANCE <= t <= 1 + CLIP_TOLERANCE:
+                if min(s, 1 - s, t, 1 - t) <= CLIP_TOLERANCE:
+                    return None
+                entering = (q1[0] - q0[0]) * (p1[1] - p0[1]) - (q1[1] - q0[1]) * (p1[0] - p0[0]) > 0
+                crossings.append([(p0[0] + s * (p1[0] - p0[0]), p0[1] + s * (p1[1] - p0[1])), i, s, k, t, entering])
+    return crossings
+
+
+def _subtractConvex(polygon, convex):
+    # pieces of the polygon outside of the convex polygon, both polygons have to be counter-clockwise
+    keepout = convex
+    for attempt in range(4):
+        crossings = _polygonCrossings(polygon, convex)
+        if crossings is not None:
+            break
+        # a vertex lies on the border of the other polygon: grow the convex polygon a tiny bit, and move it into an
+        # odd direction to get vertices off lines through its center as well, then try again
+        cx = sum(p[0] for p in convex) / len(convex)
+        cy = sum(p[1] for p in convex) / len(convex)
+        grow = 1e-7 * 10 ** attempt
+        convex = [(p[0] + grow * ((p[0] - cx) / math.hypot(p[0] - cx, p[1] - cy) + 0.5 * math.cos(1)),
+                   p[1] + grow * ((p[1] - cy) / math.hypot(p[0] - cx, p[1] - cy) + 0.5 * math.sin(1))) for p in convex]
+    else:
+        warnings.warn("polygon {} can not be clipped against the keepout {}, it is kept unchanged".format(
+            _formatPoints(polygon), _formatPoints(keepout)), KeepoutClipWarning)
+        return [polygon]
+
+    n = len(polygon)
+    m = len(convex)
+
+    if not crossings:
+        if KeepoutPolygon(convex).containsPoint(*polygon[0]):
+            return []
+        if not KeepoutPolygon(polygon).containsPoint(*convex[0]):
+            return [polygon]
+        # the convex polygon would be a hole, which can not be drawn: split the polygon at a vertical line through
+        # the hole, then the border of every half crosses the convex polygon
+        x = sum(p[0] for p in convex) / m
+        x0 = min(p[0] for p in polygon) - 1
+        x1 = max(p[0] for p in polygon) + 1
+        y0 = min(p[1] for p in polygon) - 1
+        y1 = max(p[1] for p in polygon) + 1
+        halves = _subtractConvex(polygon, [(x, y0), (x1, y0), (x1, y1), (x, y1)]) + \
+            _subtractConvex(polygon, [(x0, y0), (x, y0), (x, y1), (x0, y1)])
+        pieces = []
+        for half in halves:
+            pieces += _subtractConvex(half, convex)
+        return pieces
+
+    # the border of the difference runs forward along the polygon outside of the convex polygon, and backward along
+    # the convex polygon inside of the polygon
+    along_polygon = sorted(range(len(crossings)), key=lambda c: (crossings[c][1], crossings[c][2]))
+    along_convex = sorted(range(len(crossings)), key=lambda c: (crossings[c][3], crossings[c][4]))
+    next_on_polygon = dict(zip(along_polygon, along_polygon[1:] + along_polygon[:1]))
+    previous_on_convex = dict(zip(along_convex, along_convex[-1:] + along_convex[:-1]))
+
+    pieces = []
+    visited = set()
+    for start in along_polygon:
+        if crossings[start][5] or start in visited:
+            continue
+        piece = []
+        current = start
+        while current not in visited:
+            visited.add(current)
+            point, i, s, _, _, _ = crossings[current]
+            entry = next_on_polygon[current]
+            _, j, s_entry, k, t, _ = crossings[entry]
+            if j == i:
+                count = 0 if s_entry > s else n
+            else:
+                count = (j - i) % n
+            piece += [point] + [polygon[(i + 1 + c) % n] for c in range(count)]
+
+            visited.add(entry)
+            current = previous_on_convex[entry]
+            _, _, _, k_exit, t_exit, _ = crossings[current]
+            if k == k_exit:
+                count = 0 if t_exit < t else m
+            else:
+                count = (k - k_exit) % m
+            piece += [crossings[entry][0]] + [convex[(k - c) % m] for c in range(count)]
+        pieces.append(piece)
+    return [piece for piece in pieces if abs(_polygonArea(piece)) > CLIP_TOLERANCE]
+
+
+class KeepoutShape(object):
+    r""" Base class of all keepout areas
+
+    A keepout is a closed area silkscreen (or any other drawing) is not allowed to enter. Every keepout knows its
+    bounding box, can tell if a point lies inside and calculates where segments and circles cross its border. Clipping
+    a primitive against a set of keepouts only has to look at those crossings, instead of sampling the primitive.
+
+    :Attributes:
+        * *bounding_box* (``list``) --
+          [x0, x1, y0, y1] of the keepout, with x0 <= x1 and y0 <= y1
+    """
+
+    bounding_box = None
+
+    def containsPoint(self, x, y):
+        r""" is the point (x, y) inside the keepout (border included)
+        """
+        raise NotImplementedError()
+
+    def segmentIntervals(self, x0, y0, x1, y1):
+        r""" sorted, disjoint parameter intervals (t0, t1) of the segment (x0, y0)-(x1, y1) inside the keepout
+
+        t=0 is the start point and t=1 the end point of the segment
+        """
+        raise NotImplementedError()
+
+    def circleCrossings(self, cx, cy, r):
+        r""" angles (radians, counted from the x-axis towards the y-axis) where the circle crosses the border
+
+        Additional angles are allowed, they only split the circle into more pieces which are classified afterwards.
+        """
+        raise NotImplementedError()
+
+    def convexParts(self):
+        r""" convex polygons (lists of (x, y) points) which together cover at least the keepout
+
+        Used to subtract the keepout from filled polygons, curved borders are replaced by polygons around them.
+        """
+        raise NotImplementedError()
+
+    def axisIntervals(self, xi, y):
+        r""" coordinate intervals (lo, hi) inside the keepout along an axis parallel line
+
+        :params:
+            * *xi* (``int``) --
+              0 for a horizontal line at y=*y*, 2 for a vertical line at x=*y*
+            * *y* (``float``) --
+              position of the line
+        """
+        lo, hi = self.bounding_box[xi], self.bounding_box[xi + 1]
+        if xi == 0:
+            intervals = self.segmentIntervals(lo, y, hi, y)
+        else:
+            intervals = self.segmentIntervals(y, lo, y, hi)
+        return [(lo + t0 * (hi - lo), lo + t1 * (hi - lo)) for t0, t1 in intervals]
+
+
+class KeepoutRect(KeepoutShape):
+    r""" Axis aligned rectangular keepout
+
+    :params:
+        * *x0*, *x1*, *y0*, *y1* (``float``) --
+          borders of the rectangle, in any order
+
+    :Example:
+
+    >>> from KicadModTree.util.keepout_util import KeepoutRect
+    >>> KeepoutRect(-1, 1, -0.5, 0.5).containsPoint(0, 0)
+    True
+    """
+
+    def __init__(self, x0, x1, y0, y1):
+        self.bounding_box = [min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)]
+
+    def containsPoint(self, x, y):
+        bb = self.bounding_box
+        return bb[0] <= x <= bb[1] and bb[2] <= y <= bb[3]
+
+    def segmentIntervals(self, x0, y0, x1, y1):
+        # Liang-Barsky clipping
+        bb = self.bounding_box
+        t0, t1 = 0., 1.
+        for d, lo, hi, p in ((x1 - x0, bb[0], bb[1], x0), (y1 - y0, bb[2], bb[3], y0)):
+            if d == 0:
+                if p < lo or p > hi:
+                    return []
+                continue
+            ta = (lo - p) / d
+            tb = (hi - p) / d
+            if ta > tb:
+                ta, tb = tb, ta
+            t0 = max(t0, ta)
+            t1 = min(t1, tb)
+            if t0 > t1:
+                return []
+        return [(t0, t1)]
+
+    def circleCrossings(self, cx, cy, r):
+        angles = []
+        for x in self.bounding_box[0:2]:
+            if abs(x - cx) <= r:
+                a = math.acos((x - cx) / r)
+                angles += [a, -a]
+        for y in self.bounding_box[2:4]:
+            if abs(y - cy) <= r:
+                a = math.asin((y - cy) / r)
+                angles += [a, math.pi - a]
+        return angles
+
+    def convexParts(self):
+        x0, x1, y0, y1 = self.bounding_box
+        return [[(x0, y0), (x1, y0), (x1, y1), (x0, y1)]]
+
+    def axisIntervals(self, xi, y):
+        bb = self.bounding_box
+        yi = 2 - xi
+        if bb[yi] <= y <= bb[yi + 1]:
+            return [(bb[xi], bb[xi + 1])]
+        return []
+
+
+class KeepoutCircle(KeepoutShape):
+    r""" Circular keepout, for example around a round pad
+
+    :params:
+        * *x*, *y* (``float``) --
+          center of the circle
+        * *radius* (``float``) --
+          radius of the circle
+
+    :Example:
+
+    >>> from KicadModTree.util.keepout_util import KeepoutCircle
+    >>> KeepoutCircle(0, 0, 1).segmentIntervals(-2, 0, 2, 0)
+    [(0.25, 0.75)]
+    """
+
+    def __init__(self, x, y, radius):
+        self.x = x
+        self.y = y
+        self.radius = abs(radius)
+        self.bounding_box = [x - self.radius, x + self.radius, y - self.radius, y + self.radius]
+
+    def containsPoint(self, x, y):
+        dx = x - self.x
+        dy = y - self.y
+        return dx * dx + dy * dy <= self.radius * self.radius
+
+    def segmentIntervals(self, x0, y0, x1, y1):
+        if x0 == x1 and y0 == y1:
+            return [(0., 1.)] if self.containsPoint(x0, y0) else []
+        params = _lineCircleParameters(x0, y0, x1 - x0, y1 - y0, self.x, self.y, self.radius)
+        if not params or params[0] > 1 or params[1] < 0:
+            return []
+        return [(max(params[0], 0.), min(params[1], 1.))]
+
+    def circleCrossings(self, cx, cy, r):
+        d = math.hypot(self.x - cx, self.y - cy)
+        if d == 0 or r == 0 or d > r + self.radius or d < abs(r - self.radius):
+            return []
+        base = math.atan2(self.y - cy, self.x - cx)
+        alpha = math.acos(max(-1., min(1., (r * r + d * d - self.radius * self.radius) / (2 * r * d))))
+        return [base - alpha, base + alpha]
+
+    def convexParts(self):
+        # the edges touch the circle at the angles 0, 90, 180 and 270 degrees, to match the sides of rectangles
+        r = self.radius / math.cos(math.pi / CIRCLE_SEGMENTS)
+        return [[(self.x + r * math.cos(math.pi * (2 * i + 1) / CIRCLE_SEGMENTS),
+                  self.y + r * math.sin(math.pi * (2 * i + 1) / CIRCLE_SEGMENTS)) for i in range(CIRCLE_SEGMENTS)]]
+
+
+class KeepoutUnion(KeepoutShape):
+    r""" Keepout made from several other keepouts
+
+    :params:
+        * *parts* (``list(KeepoutShape)``) --
+          keepouts covered by this keepout
+    """
+
+    # set by shapes whose parts always form a convex area
+    convex = False
+
+    def __init__(self, parts):
+        self.parts = list(parts)
+        self.bounding_box = [min(p.bounding_box[0] for p in self.parts), max(p.bounding_box[1] for p in self.parts),
+                             min(p.bounding_box[2] for p in self.parts), max(p.bounding_box[3] for p in self.parts)]
+
+    def containsPoint(self, x, y):
+        return any(p.containsPoint(x, y) for p in self.parts)
+
+    def segmentIntervals(self, x0, y0, x1, y1):
+        intervals = []
+        for p in self.parts:
+            intervals += p.segmentIntervals(x0, y0, x1, y1)
+        return _mergeIntervals(intervals)
+
+    def circleCrossings(self, cx, cy, r):
+        angles = []
+        for p in self.parts:
+            angles += p.circleCrossings(cx, cy, r)
+        return angles
+
+    def convexParts(self):
+        parts = []
+        for p in self.parts:
+            parts += p.convexParts()
+        if self.convex:
+            return [_convexHull(sum(parts, []))]
+        return parts
+
+
+class KeepoutObround(KeepoutUnion):
+    r""" Obround (oval pad shaped) keepout
+
+    :params:
+        * *x*, *y* (``float``) --
+          center of the obround
+        * *w*, *h* (``float``) --
+          width and height, the shorter side is fully rounded
+    """
+
+    convex = True
+
+    def __init__(self, x, y, w, h):
+        r = min(w, h) / 2.
+        dx = w / 2. - r
+        dy = h / 2. - r
+        parts = [KeepoutCircle(x - dx, y - dy, r)]
+        if dx > 0 or dy > 0:
+            parts.append(KeepoutCircle(x + dx, y + dy, r))
+            parts.append(KeepoutRect(x - dx - (r if dy > 0 else 0), x + dx + (r if dy > 0 else 0),
+                                     y - dy - (r if dx > 0 else 0), y + dy + (r if dx > 0 else 0)))
+        KeepoutUnion.__init__(self, parts)
+
+
+class KeepoutRoundRect(KeepoutUnion):
+    r""" Rectangular keepout with rounded corners
+
+    :params:
+        * *x*, *y* (``float``) --
+          center of the rectangle
+        * *w*, *h* (``float``) --
+          width and height
+        * *radius* (``float``) --
+          corner radius, limited to half of the shorter side
+    """
+
+    convex = True
+
+    def __init__(self, x, y, w, h, radius):
+        r = max(0., min(radius, w / 2., h / 2.))
+        self.radius = r
+        dx = w / 2. - r
+        dy = h / 2. - r
+        parts = [KeepoutRect(x - w / 2., x + w / 2., y - dy, y + dy),
+                 KeepoutRect(x - dx, x + dx, y - h / 2., y + h / 2.)]
+        if r > 0:
+            parts += [KeepoutCircle(x + sx * dx, y + sy * dy, r) for sx in (-1, 1) for sy in (-1, 1)]
+        KeepoutUnion.__init__(self, parts)
+
+
+class KeepoutCapsule(KeepoutUnion):
+    r""" Keepout of all points closer than *radius* to a segment, for example around a line of some width
+
+    :params:
+        * *x0*, *y0*, *x1*, *y1* (``float``) --
+          start and end point of the segment
+        * *radius* (``float``) --
+          distance around the segment
+    """
+
+    convex = True
+
+    def __init__(self, x0, y0, x1, y1, radius):
+        parts = [KeepoutCircle(x0, y0, radius)]
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length > 0:
+            nx = (y0 - y1) / length * radius
+            ny = (x1 - x0) / length * radius
+            parts.append(KeepoutCircle(x1, y1, radius))
+            if radius > 0:
+                parts.append(KeepoutPolygon([(x0 + nx, y0 + ny), (x1 + nx, y1 + ny),
+                                             (x1 - nx, y1 - ny), (x0 - nx, y0 - ny)]))
+        KeepoutUnion.__init__(self, parts)
+
+
+class KeepoutPolygon(KeepoutShape):
+    r""" Polygonal keepout, the polygon is closed automatically and may be concave
+
+    :params:
+        * *points* (``list``) --
+          corners of the polygon as (x, y) pairs
+    """
+
+    def __init__(self, points):
+        self.points = [(float(p[0]), float(p[1])) for p in points]
+        self.edges = [(self.points[i - 1], self.points[i]) for i in range(len(self.points))]
+        xs = [p[0] for p in self.points]
+        ys = [p[1] for p in self.points]
+        self.bounding_box = [min(xs), max(xs), min(ys), max(ys)]
+
+    def containsPoint(self, x, y):
+        inside = False
+        for (xa, ya), (xb, yb) in self.edges:
+            if (ya > y) != (yb > y):
+                xc = xa + (y - ya) * (xb - xa) / (yb - ya)
+                if x == xc:
+                    return True
+                if x < xc:
+                    inside = not inside
+            elif ya == yb == y and min(xa, xb) <= x <= max(xa, xb):
+                return True
+        return inside
+
+    def segmentIntervals(self, x0, y0, x1, y1):
+        dx = x1 - x0
+        dy = y1 - y0
+        params = [0., 1.]
+        for (xa, ya), (xb, yb) in self.edges:
+            ex = xb - xa
+            ey = yb - ya
+            denominator = dx * ey - dy * ex
+            if denominator == 0:
+                continue
+            t = ((xa - x0) * ey - (ya - y0) * ex) / denominator
+            s = ((xa - x0) * dy - (ya - y0) * dx) / denominator
+            if 0 < t < 1 and 0 <= s <= 1:
+                params.append(t)
+        params.sort()
+        intervals = []
+        for t0, t1 in zip(params, params[1:]):
+            tm = (t0 + t1) / 2
+            if self.containsPoint(x0 + tm * dx, y0 + tm * dy):
+                intervals.append((t0, t1))
+        return _mergeIntervals(intervals)
+
+    def circleCrossings(self, cx, cy, r):
+        angles = []
+        for (xa, ya), (xb, yb) in self.edges:
+            for s in _lineCircleParameters(xa, ya, xb - xa, yb - ya, cx, cy, r):
+                if 0 <= s <= 1:
+                    angles.append(math.atan2(ya + s * (yb - ya) - cy, xa + s * (xb - xa) - cx))
+        return angles
+
+    def convexParts(self):
+        # concave polygons are covered by their convex hull
+        hull = _convexHull(self.points)
+        if abs(_polygonArea(hull) - abs(_polygonArea(self.points))) <= CLIP_TOLERANCE:
+            return [self.points]
+        return [hull]
+
+
+def toKeepout(keepout):
+    r""" convert a keepout given as [x0, x1, y0, y1] list into a ``KeepoutRect``, keepout shapes are returned as is
+    """
+    if isinstance(keepout, KeepoutShape):
+        return keepout
+    return KeepoutRect(*keepout)
+
+
+def clipSegment(x0, y0, x1, y1, keepouts):
+    r""" parameter intervals (t0, t1) of the segment (x0, y0)-(x1, y1) which are outside of all keepouts
+
+    :params:
+        * *x0*, *y0*, *x1*, *y1* (``float``) --
+          start and end point of the segment
+        * *keepouts* (``list(KeepoutShape)``) --
+          keepouts to avoid
+
+    :Example:
+
+    >>> from KicadModTree.util.keepout_util import clipSegment, KeepoutCircle
+    >>> clipSegment(-2, 0, 2, 0, [KeepoutCircle(0, 0, 1)])
+    [(0.0, 0.25), (0.75, 1.0)]
+    """
+    inside = []
+    for ko in keepouts:
+        inside += ko.segmentIntervals(x0, y0, x1, y1)
+
+    outside = []
+    t = 0.
+    for t0, t1 in _mergeIntervals(inside):
+        if t1 - t0 <= CLIP_TOLERANCE:
+            # the segment only touches the keepout
+            continue
+        if t0 - t > CLIP_TOLERANCE:
+            outside.append((t, t0))
+        t = max(t, t1)
+    if 1. - t > CLIP_TOLERANCE:
+        outside.append((t, 1.))
+    return outside
+
+
+def clipArc(cx, cy, radius, start_angle, angle, keepouts):
+    r""" pieces of an arc which are outside of all keepouts
+
+    The arc starts at *start_angle* and covers *angle*, both in radians, counted from the x-axis towards the y-axis.
+    Every piece is returned as (start_angle, angle) with the sign of *angle* kept. A full circle (abs(angle) >= 2*pi)
+    is split only where it enters a keepout, so a piece may run over the start point.
+
+    :params:
+        * *cx*, *cy* (``float``) --
+          center of the arc
+        * *radius* (``float``) --
+          radius of the arc
+        * *start_angle* (``float``) --
+          angle of the start point
+        * *angle* (``float``) --
+          angle covered by the arc, negative values run from the y-axis towards the x-axis
+        * *keepouts* (``list(KeepoutShape)``) --
+          keepouts to avoid
+    """
+    if angle == 0:
+        return []
+    full_circle = abs(angle) >= 2 * math.pi
+    if full_circle:
+        angle = math.copysign(2 * math.pi, angle)
+
+    crossings = []
+    for ko in keepouts:
+        for a in ko.circleCrossings(cx, cy, radius):
+            u = ((a - start_angle) * math.copysign(1, angle)) % (2 * math.pi) / abs(angle)
+            if CLIP_TOLERANCE < u < 1 - CLIP_TOLERANCE:
+                crossings.append(u)
+    params = [0.]
+    for u in sorted(crossings):
+        if u - params[-1] > CLIP_TOLERANCE:
+            params.append(u)
+    params.append(1.)
+
+    pieces = []
+    for u0, u1 in zip(params, params[1:]):
+        a = start_angle + (u0 + u1) / 2 * angle
+        x = cx + radius * math.cos(a)
+        y = cy + radius * math.sin(a)
+        if any(ko.containsPoint(x, y) for ko in keepouts):
+            continue
+        if pieces and pieces[-1][1] == u0:
+            pieces[-1][1] = u1
+        else:
+            pieces.append([u0, u1])
+
+    if full_circle and len(pieces) > 1 and pieces[0][0] == 0 and pieces[-1][1] == 1:
+        last = pieces.pop()
+        pieces[0] = [last[0], pieces[0][1] + 1]
+
+    return [(start_angle + u0 * angle, (u1 - u0) * angle) for u0, u1 in pieces]
+
+
+def subtractPolygon(points, keepouts):
+    r""" pieces of a filled polygon which are outside of all keepouts
+
+    The keepouts are subtracted as their convex parts (see ``KeepoutShape.convexParts()``). For every part, the new
+    border is traced from the crossings of both borders: forward along the polygon while it is outside of the part, and
+    backward along the part while it is inside of the polygon. Polygons with holes can not be drawn, so a polygon is
+    split in two halves when a part lies completely inside of it.
+    A polygon which is not touched by any keepout is returned unchanged. When the crossings can not be determined (for
+    example because the polygon runs exactly along the border of a keepout), the polygon is not clipped against this
+    keepout and a ``KeepoutClipWarning`` is issued.
+
+    :params:
+        * *points* (``list``) --
+          corners of the polygon as (x, y) pairs, it is closed automatically
+        * *keepouts* (``list(KeepoutShape)``) --
+          keepouts to avoid
+
+    :return: list of polygons, each given as a list of (x, y) tuples
+
+    :Example:
+
+    >>> from KicadModTree.util.keepout_util import subtractPolygon, KeepoutRect
+    >>> subtractPolygon([(0, 0), (2, 0), (2, 1), (0, 1)], [KeepoutRect(1, 3, -1, 2)])
+    [[(1.0, 1.0), (0.0, 1.0), (0.0, 0.0), (1.0, 0.0)]]
+    """
+    polygon = [(float(p[0]), float(p[1])) for p in points]
+    if len(polygon) > 1 and polygon[0] == polygon[-1]:
+        polygon.pop()
+    clockwise = _polygonArea(polygon) < 0
+    pieces = [polygon[::-1] if clockwise else polygon]
+
+    for ko in keepouts:
+        for part in ko.convexParts():
+            if _polygonArea(part) < 0:
+                part = part[::-1]
+            x0 = min(p[0] for p in part)
+            x1 = max(p[0] for p in part)
+            y0 = min(p[1] for p in part)
+            y1 = max(p[1] for p in part)
+            remaining_pieces = []
+            for piece in pieces:
+                if max(p[0] for p in piece) < x0 or min(p[0] for p in piece) > x1 or \
+                        max(p[1] for p in piece) < y0 or min(p[1] for p in piece) > y1:
+                    remaining_pieces.append(piece)
+                else:
+                    remaining_pieces += _subtractConvex(piece, part)
+            pieces = remaining_pieces
+
+    return [piece[::-1] for piece in pieces] if clockwise else pieces
+
+
+class KeepoutSet(object):
+    r""" A set of keepouts with a spatial index, used to clip lines and arcs against all keepouts at once
+
+    The keepouts are kept sorted by the lower bound of their bounding box along each axis. A keepout can only overlap
+    the range [a, b] when its lower bound lies within [a - longest keepout, b], so finding the keepouts near a primitive
+    is a bisection followed by a scan over this short window. Queries return the keepouts in the order they were added,
+    which keeps the clipping results independent of the index.
+
+    :params:
+        * *keepouts* (``list``) --
+          keepout shapes or [x0, x1, y0, y1] lists (default: [])
+
+    :Example:
+
+    >>> from KicadModTree.util.keepout_util import KeepoutSet, KeepoutCircle
+    >>> keepouts = KeepoutSet([KeepoutCircle(0, 0, 1)])
+    >>> keepouts.clipLine(-2, 0, 2, 0)
+    [[-2, 0, -1.0, 0.0], [1.0, 0.0, 2, 0]]
+    """
+
+    def __init__(self, keepouts=None):
+        self.keepouts = []
+        self._axes = None
+        if keepouts is not None:
+            self.extend(keepouts)
+
+    def append(self, keepout):
+        self.keepouts.append(toKeepout(keepout))
+        self._axes = None
+
+    def extend(self, keepouts):
+        self.keepouts.extend(toKeepout(ko) for ko in keepouts)
+        self._axes = None
+
+    def __len__(self):
+        return len(self.keepouts)
+
+    def __iter__(self):
+        return iter(self.keepouts)
+
+    def _buildIndex(self):
+        boxes = [ko.bounding_box for ko in self.keepouts]
+        self._axes = {}
+        for axis in (0, 2):
+            order = sorted(range(len(boxes)), key=lambda i: boxes[i][axis])
+            lows = [boxes[i][axis] for i in order]
+            longest = max([bb[axis + 1] - bb[axis] for bb in boxes] or [0])
+            self._axes[axis] = (order, lows, longest)
+
+    def queryAxis(self, axis, a, b):
+        r""" keepouts whose bounding box overlaps [a, b] along the axis (0 for x, 2 for y)
+        """
+        if self._axes is None:
+            self._buildIndex()
+        order, lows, longest = self._axes[axis]
+        first = bisect.bisect_left(lows, a - longest - CLIP_TOLERANCE)
+        last = bisect.bisect_right(lows, b)
+        hits = sorted([i for i in order[first:last] if self.keepouts[i].bounding_box[axis + 1] >= a])
+        return [self.keepouts[i] for i in hits]
+
+    def query(self, x0, x1, y0, y1):
+        r""" keepouts whose bounding box overlaps the box [x0, x1] x [y0, y1]
+        """
+        y_min = min(y0, y1)
+        y_max = max(y0, y1)
+        return [ko for ko in self.queryAxis(0, min(x0, x1), max(x0, x1))
+                if ko.bounding_box[2] <= y_max and ko.bounding_box[3] >= y_min]
+
+    def containsPoint(self, x, y):
+        r""" is the point (x, y) inside any keepout
+        """
+        return any(ko.containsPoint(x, y) for ko in self.query(x, x, y, y))
+
+    def clipAxisLines(self, lines, y, xi):
+        r""" remove the parts of axis parallel lines which are inside the keepouts
+
+        :params:
+            * *lines* (``list``) --
+              [start, end] pairs of the lines along the axis, with start <= end. The list is modified in place.
+            * *y* (``float``) --
+              position of the lines on the other axis
+            * *xi* (``int``) --
+              0 for horizontal lines, 2 for vertical lines
+
+        :return: *lines*
+        """
+        for ko in self.queryAxis(2 - xi, y, y):
+            for ko_min, ko_max in ko.axisIntervals(xi, y):
+                for li in reversed(range(len(lines))):
+                    line = lines[li]
+                    if line[0] > ko_max or line[1] < ko_min:
+                        continue
+                    lines.pop(li)
+                    if line[0] < ko_min:
+                        lines.append([line[0], ko_min])
+                    if line[1] > ko_max:
+                        lines.append([ko_max, line[1]])
+        return lines
+
+    def clipLine(self, x0, y0, x1, y1):
+        r""" pieces [x0, y0, x1, y1] of the line which are outside of all keepouts, in the direction of the line
+        """
+        pieces = []
+        for t0, t1 in clipSegment(x0, y0, x1, y1, self.query(x0, x1, y0, y1)):
+            start = [x0 + t0 * (x1 - x0), y0 + t0 * (y1 - y0)] if t0 > 0 else [x0, y0]
+            end = [x0 + t1 * (x1 - x0), y0 + t1 * (y1 - y0)] if t1 < 1 else [x1, y1]
+            pieces.append(start + end)
+        return pieces
+
+    def clipArc(self, cx, cy, radius, start_angle, angle):
+        r""" pieces (start_angle, angle) of the arc which are outside of all keepouts, see ``clipArc()``
+        """
+        radius = abs(radius)
+        return clipArc(cx, cy, radius, start_angle, angle,
+                       self.query(cx - radius, cx + radius, cy - radius, cy + radius))
+
+    def clipPolygon(self, points):
+        r""" pieces of the filled polygon which are outside of all keepouts, see ``subtractPolygon()``
+        """
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        return subtractPolygon(points, self.query(min(xs), max(xs), min(ys), max(ys)))
+
+
+def asKeepoutSet(keepouts):
+    r""" get a ``KeepoutSet`` for a list of keepouts
+
+    Building the set sorts the keepouts, so callers which use the same keepouts many times should collect them in a
+    ``KeepoutSet`` right away and pass that one.
+
+    :params:
+        * *keepouts* (``list`` or ``KeepoutSet``) --
+          keepout shapes or [x0, x1, y0, y1] lists, a ``KeepoutSet`` is returned as it is
+    """
+    if isinstance(keepouts, KeepoutSet):
+        return keepouts
+    return KeepoutSet(keepouts)
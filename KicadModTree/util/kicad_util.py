@@ -13,10 +13,44 @@
 #
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import functools
+import io
+import sys
 import time
 import re
 
 
+# number of different values which are remembered by formatFloat and lispString. Footprints repeat the same widths,
+# sizes and layer names over and over
+FORMAT_CACHE_SIZE = 4096
+
+_WHITESPACE_REGEX = re.compile(r'\s')
+
+# python2 returns unicode strings when a file is read as text, they are serialized like str
+_STRING_TYPES = (str, type(u''))
+
+
+def _memoize(function):
+    '''
+    remember the results of a function with a single argument (functools.lru_cache is not available on python2)
+
+    The cache is cleared when it holds FORMAT_CACHE_SIZE values, which keeps the lookup as cheap as possible.
+    '''
+    cache = {}
+
+    @functools.wraps(function)
+    def wrapper(value):
+        result = cache.get(value)
+        if result is None:
+            if len(cache) >= FORMAT_CACHE_SIZE:
+                cache.clear()
+            result = cache[value] = function(value)
+        return result
+
+    return wrapper
+
+
+@_memoize
 def formatFloat(val):
     '''
     return well formated float
@@ -27,90 +61,82 @@ def formatFloat(val):
     return result
 
 
-def lispString(string):
-    '''
-    add quotation marks to string, when it include a white space or is empty
-    '''
-    if type(string) is not str:
-        string = str(string)
-
-    if len(string) == 0 or re.match(".*\s.*", string):
+@_memoize
+def _lispString(string):
+    if len(string) == 0 or _WHITESPACE_REGEX.search(string):
         return '"{}"'.format(string.replace('"', '\\"'))  # escape text
 
     return string
 
 
-def lispTokenizer(input):
+def lispString(string):
     '''
-    Convert a string of characters into a list of tokens.
+    add quotation marks to string, when it include a white space or is empty
     '''
-    input = input.replace('(', ' ( ').replace(')', ' ) ')
+    if type(string) not in _STRING_TYPES:
+        string = str(string)
 
-    # split input, including whitespaces
-    base_tokens = re.split(r'(\s+)', input)
+    return _lispString(string)
 
-    tokens = []
-    in_string = False
 
-    for token in base_tokens:
-        if not in_string and token.isspace():
-            continue
+# single token of a sexpr: bracket, quoted string, unquoted atom or a stray quotation mark
+_LISP_TOKEN_REGEX = re.compile(r'[()]|"(?:[^"\\]|\\.)*"|[^\s()"]+|"')
+_LISP_ESCAPE_REGEX = re.compile(r'\\(["\\])')
 
-        if len(token) == 0:
-            continue
 
-        if token[0] == '"':
-            if in_string:
-                tokens[-1] += token[1:]
-                in_string = False
-            else:
-                tokens.append(token[1:])
-                in_string = True
+def _lispTokens(input):
+    '''
+    Split the input in a single pass. Quoted strings keep their quotation marks, so they can be told apart from
+    brackets and atoms.
+    '''
+    tokens = _LISP_TOKEN_REGEX.findall(input)
+    if '"' in tokens:
+        raise RuntimeError("missing closing quotation mark")
+    return tokens
 
-        elif token[-1] == '"':
-            if in_string:
-                tokens[-1] += token[:-1]
-                in_string = False
-            else:
-                tokens.append(token[:-1])
-                in_string = True
 
-        else:
-            if in_string:
-                tokens[-1] += token
-            else:
-                tokens.append(token)
-
-    if in_string:
-        raise RuntimeError("missing closing quotation mark")
+def _lispUnquote(token):
+    token = token[1:-1]
+    if '\\' in token:
+        token = _LISP_ESCAPE_REGEX.sub(r'\1', token)
+    return token
 
-    # TOOD: remove invalid spaces from quotation (when having brackets inside)
 
-    return tokens
+def lispTokenizer(input):
+    '''
+    Convert a string of characters into a list of tokens.
+    '''
+    return [_lispUnquote(token) if token[0] == '"' else token for token in _lispTokens(input)]
 
 
 def parseLispString(input):
+    '''
+    Convert a sexpr string into nested lists of strings
+    '''
     syntax_tree = []
     current_node = syntax_tree
-    scope = [syntax_tree]
+    parent_nodes = []
 
-    for token in lispTokenizer(input):
+    for token in _lispTokens(input):
         if token == "(":
-            scope.append([])
-            current_node.append(scope[-1])
-            current_node = scope[-1]
+            child_node = []
+            current_node.append(child_node)
+            parent_nodes.append(current_node)
+            current_node = child_node
 
         elif token == ")":
-            if len(scope) <= 1:
+            if not parent_nodes:
                 raise RuntimeError("missing opening brackets")
 
-            scope.pop()
-            current_node = scope[-1]
+            current_node = parent_nodes.pop()
+
+        elif token[0] == '"':
+            current_node.append(_lispUnquote(token))
 
         else:
             current_node.append(token)
 
-    if len(scope) > 1:
+    if parent_nodes:
         raise RuntimeError("missing closing brackets")
 
     if len(syntax_tree) == 1:
@@ -122,10 +148,16 @@ def parseLispString(input):
 class SexprSerializer(object):
     '''
     Converts a nested python list into a sexpr syntax which can be parsed by KiCad
+
+    The serializer works in a single pass over the nested list. Tokens are written directly into a
+    stream (any object with a ``write`` method) or a list buffer, and the indentation is tracked as
+    state instead of rewriting already rendered strings.
     '''
 
     NEW_LINE = object
 
+    _END_OF_LIST = object()
+
     def __init__(self, sexpr):
         '''
         :param sexpr: A list of lists and primitive values representing the file
@@ -138,52 +170,100 @@ class SexprSerializer(object):
             return str(primitive)
         elif pType is float:
             return formatFloat(primitive)
-        elif pType is str:
+        elif pType in _STRING_TYPES:
             return lispString(primitive)
         else:
             raise RuntimeError("unexpected type: {}".format(pType))
 
-    def sexpr_to_string(self, sexpr, prefix=None):
-        if prefix is None:
-            prefix = ""
-
-        serial_string = "("
-
-        # see: https://stackoverflow.com/questions/3190706/nonlocal-keyword-in-python-2-x
-        loop_ctrl = {'first': True, 'indentation': False}
+    def write_sexpr(self, write, sexpr, indent=0):
+        '''
+        write the serialized sexpr token by token
 
-        def get_separator():
-            if loop_ctrl['first']:
-                loop_ctrl['first'] = False
-                return_str = ""
+        :param write: callable which receives every token (for example ``stream.write`` or ``list.append``)
+        :param sexpr: A list of lists and primitive values
+        :param indent: number of spaces a new line inside the outermost list is indented by
+        '''
+        end_of_list = SexprSerializer._END_OF_LIST
+        new_line = SexprSerializer.NEW_LINE
+        primitive_to_string = self.primitive_to_string
+
+        stack = []
+        items = iter(sexpr)
+        first = True
+        indentation = False
+
+        write("(")
+        while True:
+            attr = next(items, end_of_list)
+
+            if attr is end_of_list:
+                write(")")
+                if not stack:
+                    return
+
+                # the separator was already written before the child list was entered
+                items, indent = stack.pop()
+                first = False
+                indentation = False
+                continue
+
+            if attr is new_line:
+                write("\n")
+                write(" " * indent)
+                indentation = True
+                continue
+
+            if first:
+                first = False
             else:
-                return_str = " "
+                write(" ")
 
-            if loop_ctrl['indentation']:
-                return_str += " "
-                loop_ctrl['indentation'] = False
+            if isinstance(attr, (tuple, list)):
+                # a list which starts after a new line is indented by one additional space
+                child_indent = indent + (2 if indentation else 1)
+                if indentation:
+                    write(" ")
+
+                stack.append((items, indent))
+                items = iter(attr)
+                indent = child_indent
+                first = True
+                indentation = False
+
+                write("(")
+            else:
+                if indentation:
+                    write(" ")
+                    indentation = False
+                write(primitive_to_string(attr))
 
-            return return_str
+    def write(self, stream):
+        '''
+        write the serialized sexpr into a stream or list buffer
 
-        for attr in sexpr:
-            if isinstance(attr, (tuple, list)):
-                return_string = self.sexpr_to_string(attr, prefix + " ")
+        :param stream: file like object with a ``write`` method, or a list to which all tokens are appended
+        '''
+        self.write_sexpr(SexprSerializer.getWriter(stream), self.sexpr)
 
-                if loop_ctrl['indentation']:
-                    return_string = return_string.replace('\n', '\n ')
-                serial_string += get_separator()
+    @staticmethod
+    def getWriter(stream):
+        '''
+        get the function which writes a single token into a stream or list buffer
 
-                serial_string += return_string
-            elif attr == SexprSerializer.NEW_LINE:
-                serial_string += "\n"
-                serial_string += prefix
-                loop_ctrl['indentation'] = True
-            else:
-                serial_string += get_separator()
-                serial_string += self.primitive_to_string(attr)
+        :param stream: file like object with a ``write`` method, or a list to which all tokens are appended
+        '''
+        if isinstance(stream, list):
+            return stream.append
+        elif sys.version_info[0] == 2 and isinstance(stream, io.TextIOBase):
+            # text streams of python2 only accept unicode
+            return lambda token: stream.write(token.decode('utf-8'))
+        else:
+            return stream.write
 
-        serial_string += ")"
-        return serial_string
+    def sexpr_to_string(self, sexpr, prefix=None):
+        buffer = []
+        self.write_sexpr(buffer.append, sexpr, len(prefix) if prefix else 0)
+        return "".join(buffer)
 
     def __str__(self):
         '''
@@ -193,8 +273,7 @@ class SexprSerializer(object):
 
 
 def parseTimestamp(timestamp):
-    raise NotImplemented()
-    return time.time()  # TOOD
+    return int(timestamp, 16)
 
 
 def formatTimestamp(timestamp=None):
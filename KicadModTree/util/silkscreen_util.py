@@ -0,0 +1,288 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import math
+import warnings
+
+from KicadModTree.Vector import Vector2D
+from KicadModTree.util.keepout_util import *
+from KicadModTree.nodes.base.Pad import Pad
+from KicadModTree.nodes.base.Arc import Arc
+from KicadModTree.nodes.base.Circle import Circle
+from KicadModTree.nodes.base.Line import Line
+from KicadModTree.nodes.base.Polygon import Polygon
+
+
+# silkscreen layer and the copper layers whose pads it has to avoid
+SILKSCREEN_COPPER_LAYERS = {'F.SilkS': ('F.Cu', '*.Cu', 'F&B.Cu'),
+                            'B.SilkS': ('B.Cu', '*.Cu', 'F&B.Cu')}
+
+# width of silkscreen lines without an explicit width, the same default as in the KicadFileHandler
+DEFAULT_SILKSCREEN_WIDTH = 0.12
+
+# straight segments used per full circle when the arc primitive of a custom pad is turned into a keepout
+ARC_PRIMITIVE_SEGMENTS = 32
+
+
+def _transformation(position, rotation):
+    # maps a point of the pad into the footprint, uses the same rotation direction as the Rotation node
+    phi = math.radians(rotation or 0)
+    cos_phi = math.cos(phi)
+    sin_phi = math.sin(phi)
+
+    def transform(x, y):
+        return (position.x + cos_phi * x + sin_phi * y, position.y - sin_phi * x + cos_phi * y)
+
+    return transform
+
+
+def _roundedRectKeepout(transform, rotation, w, h, radius):
+    cx, cy = transform(0, 0)
+    if (rotation or 0) % 90 == 0:
+        if (rotation or 0) % 180 != 0:
+            w, h = h, w
+        return KeepoutRoundRect(cx, cy, w, h, radius)
+
+    # rotated by an arbitrary angle: a cross of two rectangles plus circles in the corners
+    radius = max(0., min(radius, w / 2., h / 2.))
+    dx = w / 2. - radius
+    dy = h / 2. - radius
+    parts = [KeepoutPolygon([transform(sx * w / 2., sy * dy) for sx, sy in ((-1, -1), (1, -1), (1, 1), (-1, 1))])]
+    if radius > 0:
+        parts.append(KeepoutPolygon([transform(sx * dx, sy * h / 2.)
+                                     for sx, sy in ((-1, -1), (1, -1), (1, 1), (-1, 1))]))
+        parts += [KeepoutCircle(*(transform(sx * dx, sy * dy) + (radius,))) for sx in (-1, 1) for sy in (-1, 1)]
+    return KeepoutUnion(parts)
+
+
+def _primitiveKeepouts(primitive, transform, expansion):
+    width = primitive.width or 0
+    r = width / 2. + expansion
+    if isinstance(primitive, Polygon):
+        points = [transform(p.x, p.y) for p in primitive.nodes]
+        keepouts = [KeepoutPolygon(points)]
+        if r > 0:
+            keepouts += [KeepoutCapsule(a[0], a[1], b[0], b[1], r) for a, b in zip(points, points[1:] + points[:1])]
+        return keepouts
+    if isinstance(primitive, Line):
+        start = transform(primitive.start_pos.x, primitive.start_pos.y)
+        end = transform(primitive.end_pos.x, primitive.end_pos.y)
+        return [KeepoutCapsule(start[0], start[1], end[0], end[1], r)]
+    if isinstance(primitive, Arc):
+        # chords of the arc, widened by the sagitta so the keepout covers the arc itself
+        cx, cy = primitive.center_pos.x, primitive.center_pos.y
+        radius = math.hypot(primitive.start_pos.x - cx, primitive.start_pos.y - cy)
+        start_angle = math.atan2(primitive.start_pos.y - cy, primitive.start_pos.x - cx)
+        angle = math.radians(primitive.angle)
+        count = max(1, int(math.ceil(abs(angle) / (2 * math.pi) * ARC_PRIMITIVE_SEGMENTS)))
+        sagitta = radius * (1 - math.cos(angle / count / 2.))
+        points = [transform(cx + radius * math.cos(start_angle + angle * i / count),
+                            cy + radius * math.sin(start_angle + angle * i / count)) for i in range(count + 1)]
+        return [KeepoutCapsule(a[0], a[1], b[0], b[1], r + sagitta) for a, b in zip(points, points[1:])]
+    if isinstance(primitive, Circle):
+        # circles of custom pads are treated as filled, which is the safe side for rings as well
+        center = transform(primitive.center_pos.x, primitive.center_pos.y)
+        return [KeepoutCircle(center[0], center[1], primitive.radius + r)]
+    return []
+
+
+def padKeepouts(pad, expansion):
+    r""" keepout shapes covering the copper of a pad, grown by *expansion*
+
+    Growing a shape by a distance keeps its corners round, so a rectangular pad becomes a rounded rectangle with the
+    radius *expansion*. The position and rotation of the pad in the footprint are taken from the render tree.
+
+    :params:
+        * *pad* (``Pad``) --
+          pad to cover
+        * *expansion* (``float``) --
+          distance added around the copper of the pad
+
+    :return: list of ``KeepoutShape``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> from KicadModTree.util.silkscreen_util import padKeepouts
+    >>> pad = Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[0, 0], size=[1, 2], layers=Pad.LAYERS_SMT)
+    >>> padKeepouts(pad, 0.2)[0].bounding_box
+    [-0.7, 0.7, -1.2, 1.2]
+    """
+    position, rotation = pad.getRealPosition(pad.at, pad.rotation)
+    transform = _transformation(position, rotation)
+    if pad.offset.x or pad.offset.y:
+        # the copper is moved by the offset, relative to the drill and in the direction of the pad
+        transform = _transformation(Vector2D(transform(pad.offset.x, pad.offset.y)), rotation)
+    w, h = pad.size.x, pad.size.y
+
+    if pad.shape == Pad.SHAPE_CIRCLE:
+        cx, cy = transform(0, 0)
+        return [KeepoutCircle(cx, cy, w / 2. + expansion)]
+    if pad.shape == Pad.SHAPE_OVAL:
+        return [_roundedRectKeepout(transform, rotation, w + 2 * expansion, h + 2 * expansion,
+                                    min(w, h) / 2. + expansion)]
+    if pad.shape == Pad.SHAPE_ROUNDRECT:
+        return [_roundedRectKeepout(transform, rotation, w + 2 * expansion, h + 2 * expansion,
+                                    pad.getRoundRadius() + expansion)]
+    if pad.shape == Pad.SHAPE_CUSTOM:
+        if pad.anchor_shape == Pad.ANCHOR_CIRCLE:
+            cx, cy = transform(0, 0)
+            keepouts = [KeepoutCircle(cx, cy, w / 2. + expansion)]
+        else:
+            keepouts = [_roundedRectKeepout(transform, rotation, w + 2 * expansion, h + 2 * expansion, expansion)]
+        for primitive in pad.primitives:
+            keepouts += _primitiveKeepouts(primitive, transform, expansion)
+        return keepouts
+
+    # rectangular pads, trapezoids are covered by their bounding rectangle
+    return [_roundedRectKeepout(transform, rotation, w + 2 * expansion, h + 2 * expansion, expansion)]
+
+
+def _iterNodesWithContainer(root):
+    # like Node.iterNodes, but also returns the list which holds the node, which is the list of normal childs of its
+    # parent or the cached list of virtual childs of the node which created it
+    stack = [(root, None, None)]
+    while stack:
+        node, container, parent = stack.pop()
+        yield node, container, parent
+
+        virtual_childs = node.getVirtualChilds()
+        if virtual_childs:
+            stack.extend((child, virtual_childs, None) for child in reversed(virtual_childs))
+
+        normal_childs = node.getNormalChilds()
+        if normal_childs:
+            stack.extend((child, normal_childs, node) for child in reversed(normal_childs))
+
+
+def _clipNode(node, keepouts):
+    # returns None when the node is not touched by the keepouts, otherwise the nodes replacing it
+    if isinstance(node, Line):
+        start = node.getRealPosition(node.start_pos)
+        end = node.getRealPosition(node.end_pos)
+        pieces = keepouts.clipLine(start.x, start.y, end.x, end.y)
+        if pieces == [[start.x, start.y, end.x, end.y]]:
+            return None
+        return [Line(start=piece[0:2], end=piece[2:4], layer=node.layer, width=node.width) for piece in pieces]
+
+    if isinstance(node, (Arc, Circle)):
+        center = node.getRealPosition(node.center_pos)
+        if isinstance(node, Arc):
+            start = node.getRealPosition(node.start_pos)
+            radius = math.hypot(start.x - center.x, start.y - center.y)
+            start_angle = math.atan2(start.y - center.y, start.x - center.x)
+            # a mirroring transformation turns the direction of the arc around
+            a, b, c, d = node.getRealTransformation()[0:4]
+            angle = math.radians(node.angle) if a * d - b * c > 0 else -math.radians(node.angle)
+        else:
+            radius = node.radius
+            start_angle = 0.
+            angle = 2 * math.pi
+        pieces = keepouts.clipArc(center.x, center.y, radius, start_angle, angle)
+        if pieces == [(start_angle, angle)]:
+            return None
+        return [Arc(center=[center.x, center.y],
+                    start=[center.x + radius * math.cos(piece_start), center.y + radius * math.sin(piece_start)],
+                    angle=math.degrees(piece_angle), layer=node.layer, width=node.width)
+                for piece_start, piece_angle in pieces]
+
+    if isinstance(node, Polygon):
+        points = [(float(p.x), float(p.y)) for p in node.getRealPositions(node.nodes)]
+        if len(points) > 1 and points[0] == points[-1]:
+            points.pop()
+        pieces = keepouts.clipPolygon(points)
+        if pieces == [points]:
+            return None
+        return [Polygon(nodes=piece, layer=node.layer, width=node.width) for piece in pieces]
+
+    return None
+
+
+def clipSilkscreen(footprint, clearance=0.2, layers=None):
+    r""" remove all silkscreen which is closer than *clearance* to the copper of a pad
+
+    This is a post-processing step for a finished footprint. All pads are collected once and turned into keepouts
+    (see ``padKeepouts()``), which are grown by the clearance plus half of the width of the silkscreen line. Every
+    line, arc, circle and filled polygon on the silkscreen layers is then clipped against the keepouts of the pads on
+    the same side of the board, using the spatial index of ``KeepoutSet``. Clipped nodes are removed from the tree and
+    the remaining pieces are added to *footprint* as base nodes, nodes which are not touched stay where they are.
+
+    Nodes created by specialized nodes (like the lines of a ``RectLine``) are removed from the cached virtual childs of
+    that node, so this should be the last change to the footprint before it is written.
+
+    :params:
+        * *footprint* (``Footprint``) --
+          footprint to modify
+        * *clearance* (``float``) --
+          distance between the edge of the silkscreen lines and the copper (default: 0.2)
+        * *layers* (``list(str)``) --
+          silkscreen layers to clip (default: ['F.SilkS', 'B.SilkS'])
+
+    :return: number of clipped nodes
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> kicad_mod.append(RectLine(start=[-2, -2], end=[5, 2], layer='F.SilkS'))
+    >>> kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
+    ...                      at=[0, -2], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+    >>> kicad_mod.clipSilkscreen(clearance=0.2)
+    1
+    """
+    if layers is None:
+        layers = ['F.SilkS', 'B.SilkS']
+
+    pads = []
+    drawings = []
+    for node, container, parent in _iterNodesWithContainer(footprint):
+        if isinstance(node, Pad):
+            pads.append(node)
+        elif isinstance(node, (Line, Arc, Circle, Polygon)) and node.layer in layers and container is not None:
+            drawings.append((node, container, parent))
+
+    keepout_sets = {}
+    clipped = 0
+    for node, container, parent in drawings:
+        width = DEFAULT_SILKSCREEN_WIDTH if node.width is None else node.width
+        key = (node.layer, width)
+        keepouts = keepout_sets.get(key)
+        if keepouts is None:
+            copper_layers = SILKSCREEN_COPPER_LAYERS.get(node.layer, ('*.Cu',))
+            keepouts = keepout_sets[key] = KeepoutSet()
+            for pad in pads:
+                if any(layer in copper_layers for layer in pad.layers):
+                    keepouts.extend(padKeepouts(pad, clearance + width / 2.))
+
+        if isinstance(node, Polygon):
+            # the name of the footprint is added to the warnings about polygons which could not be clipped
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always', KeepoutClipWarning)
+                pieces = _clipNode(node, keepouts)
+            for warning in caught:
+                warnings.warn("{}: {}".format(footprint.name, warning.message), warning.category)
+        else:
+            pieces = _clipNode(node, keepouts)
+        if pieces is None:
+            continue
+
+        clipped += 1
+        if parent is not None:
+            parent.remove(node)
+        else:
+            del container[next(i for i, child in enumerate(container) if child is node)]
+        footprint.extend(pieces)
+
+    return clipped
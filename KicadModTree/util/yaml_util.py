@@ -0,0 +1,239 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import hashlib
+import io
+import os
+import pickle
+
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import ConstructorError, SafeConstructor
+from yaml.events import MappingEndEvent, MappingStartEvent, StreamEndEvent
+from yaml.resolver import Resolver
+
+from KicadModTree.util.file_util import replaceFile
+
+# the loader of libyaml is much faster, but is not available in every installation of pyyaml
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+# directory of the parsed configuration files, shared between all scripts of a build
+CONFIG_CACHE_ENV = 'KICADMODTREE_CONFIG_CACHE'
+
+# used when CONFIG_CACHE_ENV is not set, the configuration is stored inside the build cache
+BUILD_CACHE_ENV = 'KICADMODTREE_BUILD_CACHE'
+
+# increment when the format of the cache files changes
+CONFIG_CACHE_VERSION = 1
+
+# parsed files of this process: absolute path -> (mtime, size, pickled content)
+_memo = {}
+
+
+def getConfigCacheDir(environ=None):
+    r"""Get the directory of the on-disk cache for parsed yaml files
+
+    :param environ: environment variables which are used instead of ``os.environ``
+    :return: directory as ``str``, or None if only the in-process cache is used
+    """
+
+    if environ is None:
+        environ = os.environ
+
+    cache_dir = environ.get(CONFIG_CACHE_ENV)
+    if cache_dir:
+        return cache_dir
+
+    build_cache_dir = environ.get(BUILD_CACHE_ENV)
+    if build_cache_dir:
+        return os.path.join(build_cache_dir, 'config')
+
+    return None
+
+
+def _parseYaml(path):
+    with io.open(path, 'r', encoding='utf-8') as stream:
+        return yaml.load(stream, Loader=SafeLoader)
+
+
+def _getCachePath(cache_dir, path):
+    return os.path.join(cache_dir, hashlib.sha256(path.encode('utf-8')).hexdigest() + '.pickle')
+
+
+def _readCacheFile(cache_path, header):
+    try:
+        with io.open(cache_path, 'rb') as f:
+            if pickle.load(f) != header:
+                return None
+            return f.read()
+    except (IOError, OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def _writeCacheFile(cache_path, header, content):
+    try:
+        if not os.path.isdir(os.path.dirname(cache_path)):
+            os.makedirs(os.path.dirname(cache_path))
+    except OSError:
+        # another process created it in the meantime
+        pass
+
+    # write to a temporary file first, so parallel builds never see incomplete files
+    temporary_path = "{}.{}.tmp".format(cache_path, os.getpid())
+    try:
+        with io.open(temporary_path, 'wb') as f:
+            pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+            f.write(content)
+        replaceFile(temporary_path, cache_path)
+    except (IOError, OSError):
+        # the cache is only an optimization, the build continues without it
+        pass
+
+
+def loadYaml(path):
+    r"""Load a yaml file, which is parsed only once per build
+
+    The parsed content is cached in memory, and in the directory given by ``KICADMODTREE_CONFIG_CACHE`` (or the
+    ``config`` directory of the build cache), so the other scripts of a build do not need to parse it again. Both
+    caches are validated with the modification time and size of the file. Every call returns a new copy of the
+    content, so the caller is free to modify it.
+
+    :param path: path of the yaml file
+    :type path: ``str``
+    :return: the parsed content of the file
+
+    :Example:
+
+    >>> from KicadModTree.util.yaml_util import loadYaml
+    >>> ipc_definitions = loadYaml('../ipc_definitions.yaml')
+    """
+
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    header = (CONFIG_CACHE_VERSION, path, stat.st_mtime, stat.st_size)
+
+    cached = _memo.get(path)
+    if cached is not None and cached[0] == header:
+        return pickle.loads(cached[1])
+
+    cache_dir = getConfigCacheDir()
+    cache_path = _getCachePath(cache_dir, path) if cache_dir else None
+
+    content = _readCacheFile(cache_path, header) if cache_path else None
+    if content is None:
+        content = pickle.dumps(_parseYaml(path), pickle.HIGHEST_PROTOCOL)
+        if cache_path:
+            _writeCacheFile(cache_path, header, content)
+
+    _memo[path] = (header, content)
+    return pickle.loads(content)
+
+
+def loadConfiguration(*paths):
+    r"""Load and merge configuration files, like the global KLC configuration and the configuration of a series
+
+    The files are loaded with ``loadYaml``, and keys of later files overwrite the keys of earlier files.
+
+    :param paths: paths of the yaml files
+    :return: ``dict`` holding the merged configuration
+
+    :Example:
+
+    >>> from KicadModTree.util.yaml_util import loadConfiguration
+    >>> configuration = loadConfiguration('../../tools/global_config_files/config_KLCv3.0.yaml',
+    ...                                   '../conn_config_KLCv3.yaml')
+    """
+
+    configuration = {}
+    for path in paths:
+        configuration.update(loadYaml(path) or {})
+    return configuration
+
+
+class _EntryLoader(Composer, SafeConstructor, Resolver):
+    # composes and constructs single nodes from the events of the parser, which may be the one of libyaml
+
+    def __init__(self, parser):
+        self._parser = parser
+        Composer.__init__(self)
+        SafeConstructor.__init__(self)
+        Resolver.__init__(self)
+
+    def check_event(self, *choices):
+        return self._parser.check_event(*choices)
+
+    def peek_event(self):
+        return self._parser.peek_event()
+
+    def get_event(self):
+        return self._parser.get_event()
+
+    def loadNode(self):
+        node = self.compose_node(None, None)
+        data = self.construct_object(node, deep=True)
+
+        # only the anchors are kept until the end of the document, everything else can be freed
+        self.constructed_objects = {}
+        self.recursive_objects = {}
+        return data
+
+
+def iterYamlEntries(path):
+    r"""Iterate over the entries of the top level mapping of a yaml file, like the packages of a size definition file
+
+    Only one entry is loaded at a time, so the caller can start working before the whole file is parsed, and large files
+    do not need to fit into memory. Anchors can still be referenced in later entries. An empty file has no entries, and
+    duplicate keys are reported as error.
+
+    :param path: path of the yaml file
+    :type path: ``str``
+    :return: generator of ``(key, value)`` tuples in the order of the file
+
+    :Example:
+
+    >>> from KicadModTree.util.yaml_util import iterYamlEntries
+    >>> for name, parameters in iterYamlEntries('size_definitions/qfn.yaml'):
+    ...     print(name)
+    """
+
+    with io.open(path, 'r', encoding='utf-8') as stream:
+        parser = SafeLoader(stream)
+        try:
+            loader = _EntryLoader(parser)
+            loader.get_event()  # StreamStartEvent
+            if loader.check_event(StreamEndEvent):
+                return
+
+            loader.get_event()  # DocumentStartEvent
+            if not loader.check_event(MappingStartEvent):
+                if loader.loadNode() is None:
+                    return
+                raise yaml.YAMLError("{}: expected a mapping as root node".format(path))
+
+            loader.get_event()  # MappingStartEvent
+            keys = set()
+            while not loader.check_event(MappingEndEvent):
+                mark = loader.peek_event().start_mark
+                key = loader.loadNode()
+                if key in keys:
+                    # the earlier entry was already returned, so it can not be replaced like yaml.safe_load does
+                    raise ConstructorError("while iterating over the entries of a mapping", None,
+                                           "found duplicate key {!r}".format(key), mark)
+                keys.add(key)
+
+                yield key, loader.loadNode()
+        finally:
+            parser.dispose()
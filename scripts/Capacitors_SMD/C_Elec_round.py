@@ -8,6 +8,7 @@ import math
 
 sys.path.append(os.path.join(sys.path[0], "..", ".."))  # load parent path of KicadModTree
 from KicadModTree import *  # NOQA
+from KicadModTree.util.yaml_util import loadConfiguration, loadYaml
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
 
 sys.path.append(os.path.join(sys.path[0], "..", "tools"))  # load parent path of tools
@@ -240,7 +241,11 @@ def create_footprint(name, configuration, **kwargs):
     # write file
     output_dir = '{lib_name:s}.pretty/'.format(lib_name=lib_name)
     if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-        os.makedirs(output_dir)
+        try:
+            os.makedirs(output_dir)
+        except OSError:
+            if not os.path.isdir(output_dir):
+                raise
 
     filename = '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=name)
     file_handler = KicadFileHandler(kicad_mod)
@@ -259,24 +264,10 @@ if __name__ == "__main__":
     # TODO: allow writing into sub file
     
     args = parser.parse_args()
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    configuration = loadConfiguration(args.global_config, args.series_config)
     
     ipc_doc = args.ipc_definition
-    with open(ipc_doc, 'r') as ipc_stream:
-        try:
-            ipc_defintions = yaml.safe_load(ipc_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
+    ipc_defintions = loadYaml(ipc_doc)
 
     configuration['ipc_density'] = args.ipc_density
     configuration['force_rectangle_pads'] = args.force_rectangle_pads
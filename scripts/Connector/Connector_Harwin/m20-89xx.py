@@ -8,8 +8,8 @@ sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent p
 
 from footprint_text_fields import addTextFields
 import argparse
-import yaml
 from KicadModTree import *
+from KicadModTree.util.yaml_util import loadConfiguration
 
 series = 'M20-890'
 series_long = 'Male Horizontal Surface Mount Single Row 2.54mm (0.1 inch) Pitch PCB Connector'
@@ -181,7 +181,11 @@ def gen_footprint(pinnum, manpart, configuration):
     # Output
     output_dir = '{lib_name:s}.pretty/'.format(lib_name=lib_name)
     if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-        os.makedirs(output_dir)
+        try:
+            os.makedirs(output_dir)
+        except OSError:
+            if not os.path.isdir(output_dir):
+                raise
     filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=footprint_name)
 
     file_handler = KicadFileHandler(kicad_mod)
@@ -197,16 +201,6 @@ if __name__ == "__main__":
 	parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../conn_config_KLCv3.yaml')
 	args = parser.parse_args()
 
-	with open(args.global_config, 'r') as config_stream:
-		try:
-			configuration = yaml.safe_load(config_stream)
-		except yaml.YAMLError as exc:
-			print(exc)
-
-	with open(args.series_config, 'r') as config_stream:
-		try:
-			configuration.update(yaml.safe_load(config_stream))
-		except yaml.YAMLError as exc:
-			print(exc)
+	configuration = loadConfiguration(args.global_config, args.series_config)
 
 	gen_family(configuration)
\ No newline at end of file
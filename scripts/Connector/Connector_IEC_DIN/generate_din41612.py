@@ -210,7 +210,11 @@ def BFemale(size, pin_cb, more_description):
 
 	output_dir = '{lib_name:s}.pretty/'.format(lib_name=LIBRARY_NAME)
 	if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-		os.makedirs(output_dir)
+		try:
+			os.makedirs(output_dir)
+		except OSError:
+			if not os.path.isdir(output_dir):
+				raise
 	filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=footprint_name)
 
 	file_handler.writeFile(filename)
@@ -396,7 +400,11 @@ def BMale(size, pin_cb, more_description):
 
 	output_dir = '{lib_name:s}.pretty/'.format(lib_name=LIBRARY_NAME)
 	if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-		os.makedirs(output_dir)
+		try:
+			os.makedirs(output_dir)
+		except OSError:
+			if not os.path.isdir(output_dir):
+				raise
 	filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=footprint_name)
 
 	file_handler.writeFile(filename)
@@ -27,7 +27,11 @@ from KicadModTree import *
 output_dir = "Connector_Stocko.pretty"
 
 if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-    os.makedirs(output_dir)
+    try:
+        os.makedirs(output_dir)
+    except OSError:
+        if not os.path.isdir(output_dir):
+            raise
 
 #connector constraints
 pad_span = 2.5
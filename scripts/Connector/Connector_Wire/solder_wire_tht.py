@@ -290,7 +290,11 @@ def make_fp(wire_def, fp_type, pincount, configuration):
     output_dir = '{lib_name:s}.pretty/'.format(lib_name=lib_name)
     if not os.path.isdir(output_dir):
         #returns false if path does not yet exist!! (Does not check path validity)
-        os.makedirs(output_dir)
+        try:
+            os.makedirs(output_dir)
+        except OSError:
+            if not os.path.isdir(output_dir):
+                raise
 
     filename = '{outdir:s}{fp_name:s}.kicad_mod'\
             .format(outdir=output_dir, fp_name=fp_name)
@@ -68,7 +68,7 @@ def ptc_fuse_tht(args):
     yTopCrtYd = yTop - crtYd
     yBottomCrtYd = yBottom + crtYd
 
-    keepout = []
+    keepout = KeepoutSet()
     ko_diameter = p[0] + 2 * clearance
 
     # Pads
@@ -76,8 +76,8 @@ def ptc_fuse_tht(args):
     for coord in [[xPin1, yPin1], [xPin2, yPin2]]:
         f.append(Pad(number=str(pin), type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
                  at=coord, size=p, layers=Pad.LAYERS_THT, drill=d))
-        keepout = keepout + addKeepoutRound(coord[0], coord[1],
-                                            ko_diameter, ko_diameter)
+        keepout.extend(addKeepoutRound(coord[0], coord[1],
+                                       ko_diameter, ko_diameter))
         pin = pin + 1
 
     # Text
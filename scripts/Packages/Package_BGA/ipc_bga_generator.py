@@ -4,12 +4,12 @@ import math
 import os
 import sys
 import argparse
-import yaml
 
 # load parent path of KicadModTree
 sys.path.append(os.path.join(sys.path[0], "..", "..", ".."))
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.yaml_util import iterYamlEntries, loadConfiguration  # NOQA
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 
@@ -217,7 +217,11 @@ def __createFootprintVariant(config, fpParams, fpId):
 
     outputDir = 'Package_{lib_name:s}.pretty/'.format(lib_name=packageType)
     if not os.path.isdir(outputDir): #returns false if path does not yet exist!! (Does not check path validity)
-        os.makedirs(outputDir)
+        try:
+            os.makedirs(outputDir)
+        except OSError:
+            if not os.path.isdir(outputDir):
+                raise
     filename = '{outdir:s}{fpId:s}.kicad_mod'.format(outdir=outputDir, fpId=fpId)
     
     file_handler = KicadFileHandler(f)
@@ -241,34 +245,14 @@ if __name__ == '__main__':
     if args.verbose:
         DEBUG_LEVEL = args.verbose
     
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    # with open(args.series_config, 'r') as config_stream:
-        # try:
-            # configuration.update(yaml.safe_load(config_stream))
-        # except yaml.YAMLError as exc:
-            # print(exc)
-    
-    with open(args.ipc_doc, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    # the series config is not used, the pad sizes are defined by the IPC document
+    configuration = loadConfiguration(args.global_config, args.ipc_doc)
 
     # generate dict of A, B .. Y, Z, AA, AB .. CY less easily-confused letters
     rowNamesList = [x for x in ascii_uppercase if x not in ["I", "O", "Q", "S", "X", "Z"]]
     configuration.update({'row_names': list(itertools.islice(rowNameGenerator(rowNamesList), 80))})
 
     for filepath in args.files:
-        with open(filepath, 'r') as command_stream:
-            try:
-                cmd_file = yaml.safe_load(command_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
-        for pkg in cmd_file:
+        for pkg, params in iterYamlEntries(filepath):
             print("generating part for parameter set {}".format(pkg))
-            generateFootprint(configuration, cmd_file[pkg], pkg)
+            generateFootprint(configuration, params, pkg)
@@ -3,12 +3,12 @@
 import sys
 import os
 import argparse
-import yaml
 import math
 
 sys.path.append(os.path.join(sys.path[0], "..", "..", ".."))  # load parent path of KicadModTree
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.yaml_util import iterYamlEntries, loadConfiguration, loadYaml
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
@@ -32,21 +32,16 @@ def roundToBase(value, base):
 class Gullwing():
     def __init__(self, configuration):
         self.configuration = configuration
-        with open(ipc_doc_file, 'r') as ipc_stream:
-            try:
-                self.ipc_defintions = yaml.safe_load(ipc_stream)
-
-                self.configuration['min_ep_to_pad_clearance'] = 0.2
+        self.ipc_defintions = loadYaml(ipc_doc_file)
 
-                #ToDo: find a settings file that can contain these.
-                self.configuration['paste_radius_ratio'] = 0.25
-                self.configuration['paste_maximum_radius'] = 0.25
+        self.configuration['min_ep_to_pad_clearance'] = 0.2
 
-                if 'ipc_generic_rules' in self.ipc_defintions:
-                    self.configuration['min_ep_to_pad_clearance'] = self.ipc_defintions['ipc_generic_rules'].get('min_ep_to_pad_clearance', 0.2)
+        #ToDo: find a settings file that can contain these.
+        self.configuration['paste_radius_ratio'] = 0.25
+        self.configuration['paste_maximum_radius'] = 0.25
 
-            except yaml.YAMLError as exc:
-                print(exc)
+        if 'ipc_generic_rules' in self.ipc_defintions:
+            self.configuration['min_ep_to_pad_clearance'] = self.ipc_defintions['ipc_generic_rules'].get('min_ep_to_pad_clearance', 0.2)
 
     def calcPadDetails(self, device_dimensions, EP_size, ipc_data, ipc_round_base):
         # Zmax = Lmin + 2JT + √(CL^2 + F^2 + P^2)
@@ -588,7 +583,11 @@ class Gullwing():
 
         output_dir = '{lib_name:s}.pretty/'.format(lib_name=lib_name)
         if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-            os.makedirs(output_dir)
+            try:
+                os.makedirs(output_dir)
+            except OSError:
+                if not os.path.isdir(output_dir):
+                    raise
         filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=fp_name)
 
         file_handler = KicadFileHandler(kicad_mod)
@@ -604,6 +603,7 @@ if __name__ == "__main__":
     parser.add_argument('--ipc_doc', type=str, nargs='?', help='IPC definition document', default='../ipc_definitions.yaml')
     parser.add_argument('--force_rectangle_pads', action='store_true', help='Force the generation of rectangle pads instead of rounded rectangle')
     parser.add_argument('--kicad4_compatible', action='store_true', help='Create footprints compatible with version 4 (avoids round-rect and custom pads).')
+    parser.add_argument('-v', '--verbose', action='store_true', help='show statistics of the IPC land pattern cache')
     args = parser.parse_args()
 
     if args.density == 'L':
@@ -613,17 +613,7 @@ if __name__ == "__main__":
 
     ipc_doc_file = args.ipc_doc
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    configuration = loadConfiguration(args.global_config, args.series_config)
 
     if args.force_rectangle_pads or args.kicad4_compatible:
         configuration['round_rect_max_radius'] = None
@@ -631,16 +621,25 @@ if __name__ == "__main__":
 
     configuration['kicad4_compatible'] = args.kicad4_compatible
 
+    build_cache = BuildCache(dependencies=[configuration, ipc_density], dependency_files=[ipc_doc_file])
+
     for filepath in args.files:
         gw = Gullwing(configuration)
 
-        with open(filepath, 'r') as command_stream:
-            try:
-                cmd_file = yaml.safe_load(command_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
-        header = cmd_file.pop('FileHeader')
+        # the packages are generated while the file is read, so the header has to come first
+        packages = iterYamlEntries(filepath)
+        header_key, header = next(packages, (None, None))
+        if header_key != 'FileHeader':
+            raise ValueError("{}: FileHeader has to be the first entry".format(filepath))
+
+        for pkg, params in packages:
+            cache_key = build_cache.getKey(header, pkg, params)
+            if build_cache.isUpToDate(cache_key):
+                continue
 
-        for pkg in cmd_file:
             print("generating part for parameter set {}".format(pkg))
-            gw.generateFootprint(cmd_file[pkg], header)
+            with build_cache.record(cache_key):
+                gw.generateFootprint(params, header)
+
+    if args.verbose:
+        print(ipc_cache_info())
@@ -3,7 +3,6 @@
 import sys
 import os
 import argparse
-import yaml
 import math
 from math import sqrt
 import warnings
@@ -11,6 +10,7 @@ import warnings
 sys.path.append(os.path.join(sys.path[0], "..", "..", ".."))  # load parent path of KicadModTree
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.yaml_util import iterYamlEntries, loadConfiguration, loadYaml
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
@@ -39,21 +39,16 @@ def roundToBase(value, base):
 class NoLead():
     def __init__(self, configuration):
         self.configuration = configuration
-        with open(ipc_doc_file, 'r') as ipc_stream:
-            try:
-                self.ipc_defintions = yaml.safe_load(ipc_stream)
-
-                self.configuration['min_ep_to_pad_clearance'] = 0.2
+        self.ipc_defintions = loadYaml(ipc_doc_file)
 
-                #ToDo: find a settings file that can contain these.
-                self.configuration['paste_radius_ratio'] = 0.25
-                self.configuration['paste_maximum_radius'] = 0.25
+        self.configuration['min_ep_to_pad_clearance'] = 0.2
 
-                if 'ipc_generic_rules' in self.ipc_defintions:
-                    self.configuration['min_ep_to_pad_clearance'] = self.ipc_defintions['ipc_generic_rules'].get('min_ep_to_pad_clearance', 0.2)
+        #ToDo: find a settings file that can contain these.
+        self.configuration['paste_radius_ratio'] = 0.25
+        self.configuration['paste_maximum_radius'] = 0.25
 
-            except yaml.YAMLError as exc:
-                print(exc)
+        if 'ipc_generic_rules' in self.ipc_defintions:
+            self.configuration['min_ep_to_pad_clearance'] = self.ipc_defintions['ipc_generic_rules'].get('min_ep_to_pad_clearance', 0.2)
 
     def calcPadDetails(self, device_dimensions, EP_size, ipc_data, ipc_round_base):
         # Zmax = Lmin + 2JT + √(CL^2 + F^2 + P^2)
@@ -518,7 +513,11 @@ class NoLead():
 
         output_dir = '{lib_name:s}.pretty/'.format(lib_name=lib_name)
         if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-            os.makedirs(output_dir)
+            try:
+                os.makedirs(output_dir)
+            except OSError:
+                if not os.path.isdir(output_dir):
+                    raise
         filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=fp_name)
 
         file_handler = KicadFileHandler(kicad_mod)
@@ -547,17 +546,7 @@ if __name__ == "__main__":
 
     ipc_doc_file = args.ipc_doc
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    configuration = loadConfiguration(args.global_config, args.series_config)
 
     if args.force_rectangle_pads or args.kicad4_compatible:
         configuration['round_rect_max_radius'] = None
@@ -565,13 +554,18 @@ if __name__ == "__main__":
 
     configuration['kicad4_compatible'] = args.kicad4_compatible
 
+    build_cache = BuildCache(dependencies=[configuration, ipc_density], dependency_files=[ipc_doc_file])
+
     for filepath in args.files:
         no_lead = NoLead(configuration)
 
-        with open(filepath, 'r') as command_stream:
-            try:
-                cmd_file = yaml.safe_load(command_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
-        for pkg in cmd_file:
-            no_lead.generateFootprint(cmd_file[pkg], pkg)
+        for pkg, params in iterYamlEntries(filepath):
+            cache_key = build_cache.getKey(pkg, params)
+            if build_cache.isUpToDate(cache_key):
+                continue
+
+            with build_cache.record(cache_key):
+                no_lead.generateFootprint(params, pkg)
+
+    if args.verbose:
+        print(ipc_cache_info())
@@ -3,12 +3,12 @@
 import sys
 import os
 import argparse
-import yaml
 import math
 
 sys.path.append(os.path.join(sys.path[0], "..", "..", ".."))  # load parent path of KicadModTree
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.yaml_util import iterYamlEntries, loadConfiguration, loadYaml
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
 sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
@@ -28,11 +28,7 @@ def params_inch_to_metric(device_params):
 class QFP():
     def __init__(self, configuration):
         self.configuration = configuration
-        with open(ipc_doc_file, 'r') as ipc_stream:
-            try:
-                self.ipc_defintions = yaml.safe_load(ipc_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+        self.ipc_defintions = loadYaml(ipc_doc_file)
 
 
 
@@ -441,7 +437,11 @@ class QFP():
 
         output_dir = '{lib_name:s}.pretty/'.format(lib_name=lib_name)
         if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-            os.makedirs(output_dir)
+            try:
+                os.makedirs(output_dir)
+            except OSError:
+                if not os.path.isdir(output_dir):
+                    raise
         filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=fp_name)
 
         file_handler = KicadFileHandler(kicad_mod)
@@ -465,17 +465,7 @@ if __name__ == "__main__":
 
     ipc_doc_file = args.ipc_doc
 
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    configuration = loadConfiguration(args.global_config, args.series_config)
 
     if args.force_rectangle_pads:
         configuration['round_rect_max_radius'] = None
@@ -484,12 +474,7 @@ if __name__ == "__main__":
     for filepath in args.files:
         qfp = QFP(configuration)
 
-        with open(filepath, 'r') as command_stream:
-            try:
-                cmd_file = yaml.safe_load(command_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
-        for pkg in cmd_file:
-            if cmd_file[pkg].get('units', 'mm') == 'inches':
-                params_inch_to_metric(cmd_file[pkg])
-            qfp.generateFootprint(cmd_file[pkg])
+        for pkg, params in iterYamlEntries(filepath):
+            if params.get('units', 'mm') == 'inches':
+                params_inch_to_metric(params)
+            qfp.generateFootprint(params)
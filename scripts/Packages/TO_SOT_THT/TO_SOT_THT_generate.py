@@ -156,12 +156,12 @@ def makeVERT(lib_name, pck, has3d=False, x_3d=[0, 0, 0], s_3d=[1,1,1], lptext="_
             kicad_modt.append(Line(start=[pads[p][0], yl1], end=[pads[p][0], yl2], layer='F.Fab', width=lw_fab))
 
     # create SILKSCREEN-layer
-    keepouts = []
+    keepouts = KeepoutSet()
     for p in range(0,len(pads)):
         if p==0:
-            keepouts=keepouts+addKeepoutRect(pads[p][0],pads[p][1],padsize[0]+2*slk_dist,padsize[1]+2*slk_dist)
+            keepouts.extend(addKeepoutRect(pads[p][0],pads[p][1],padsize[0]+2*slk_dist,padsize[1]+2*slk_dist))
         else:
-            keepouts=keepouts+addKeepoutRound(pads[p][0],pads[p][1],padsize[0]+2*slk_dist,padsize[1]+2*slk_dist)
+            keepouts.extend(addKeepoutRound(pads[p][0],pads[p][1],padsize[0]+2*slk_dist,padsize[1]+2*slk_dist))
 
     #for ko in keepouts:
     #    kicad_modt.append(
@@ -378,12 +378,12 @@ def makeHOR(lib_name, pck, has3d=False, x_3d=[0, 0, 0], s_3d=[1,1,1], lptext="_L
         kicad_modt.append(Line(start=[pads[p][0], t_fabp], end=[pads[p][0], pads[p][1]], layer='F.Fab', width=lw_fab))
 
     # create SILKSCREEN-layer
-    keepouts = []
+    keepouts = KeepoutSet()
     for p in range(0,len(pads)):
         if p==0:
-            keepouts=keepouts+addKeepoutRect(pads[p][0],pads[p][1],padsize[0]+2*slk_dist,padsize[1]+2*slk_dist)
+            keepouts.extend(addKeepoutRect(pads[p][0],pads[p][1],padsize[0]+2*slk_dist,padsize[1]+2*slk_dist))
         else:
-            keepouts=keepouts+addKeepoutRound(pads[p][0],pads[p][1],padsize[0]+2*slk_dist,padsize[1]+2*slk_dist)
+            keepouts.extend(addKeepoutRound(pads[p][0],pads[p][1],padsize[0]+2*slk_dist,padsize[1]+2*slk_dist))
 
     if len(pck.additional_pin_pad_size) > 0:
         keepouts.append([addpadx - pck.additional_pin_pad_size[0] / 2 - slk_dist,
@@ -542,14 +542,14 @@ def makeVERTLS(lib_name, pck, has3d=False, x_3d=[0, 0, 0], s_3d=[1,1,1], lptext=
                                    width=lw_fab))
 
     # create SILKSCREEN-layer
-    keepouts = []
+    keepouts = KeepoutSet()
     x = pinwid
 
     for p in range(1, pck.pins + 1):
         if p == 1:
-            keepouts = keepouts + addKeepoutRect(x, 0, pck.pad[0] + 2 * slk_dist, pck.pad[1] + 2 * slk_dist)
+            keepouts.extend(addKeepoutRect(x, 0, pck.pad[0] + 2 * slk_dist, pck.pad[1] + 2 * slk_dist))
         else:
-            keepouts = keepouts + addKeepoutRound(x, 0, pck.pad[0] + 2 * slk_dist, pck.pad[1] + 2 * slk_dist)
+            keepouts.extend(addKeepoutRound(x, 0, pck.pad[0] + 2 * slk_dist, pck.pad[1] + 2 * slk_dist))
         if len(pck.rm_list)>0 and p<=len(pck.rm_list):
             x = x - pck.rm_list[p-1]
         else:
@@ -743,13 +743,13 @@ def makeHORLS(lib_name, pck, has3d=False, x_3d=[0, 0, 0], s_3d=[1,1,1], lptext="
 
 
     # create SILKSCREEN-layer
-    keepouts = []
+    keepouts = KeepoutSet()
     x = 0
     for p in range(1, pck.pins + 1):
         if p == 1:
-            keepouts = keepouts + addKeepoutRect(x, 0, pck.pad[0] + 2 * slk_dist, pck.pad[1] + 2 * slk_dist)
+            keepouts.extend(addKeepoutRect(x, 0, pck.pad[0] + 2 * slk_dist, pck.pad[1] + 2 * slk_dist))
         else:
-            keepouts = keepouts + addKeepoutRound(x, 0, pck.pad[0] + 2 * slk_dist, pck.pad[1] + 2 * slk_dist)
+            keepouts.extend(addKeepoutRound(x, 0, pck.pad[0] + 2 * slk_dist, pck.pad[1] + 2 * slk_dist))
         if len(pck.rm_list)>0 and p<=len(pck.rm_list):
             x = x + pck.rm_list[p-1]
         else:
@@ -925,13 +925,13 @@ def makeHORREV(lib_name, pck, has3d=False, x_3d=[0, 0, 0], s_3d=[1 ,1,1], lptext
 
 
     # create SILKSCREEN-layer
-    keepouts = []
+    keepouts = KeepoutSet()
     x = 0
     for p in range(1, pck.pins + 1):
         if p==1:
-            keepouts=keepouts+addKeepoutRect(x,0,pck.pad[0]+2*slk_dist,pck.pad[1]+2*slk_dist)
+            keepouts.extend(addKeepoutRect(x,0,pck.pad[0]+2*slk_dist,pck.pad[1]+2*slk_dist))
         else:
-            keepouts=keepouts+addKeepoutRound(x,0,pck.pad[0]+2*slk_dist,pck.pad[1]+2*slk_dist)
+            keepouts.extend(addKeepoutRound(x,0,pck.pad[0]+2*slk_dist,pck.pad[1]+2*slk_dist))
         x = x + pck.rm
 
     addHLineWithKeepout(kicad_mod, l_slkp, l_slkp + w_slkp, t_slkp, 'F.SilkS', lw_slk, keepouts)
@@ -12,6 +12,7 @@ sys.path.append(os.path.join(sys.path[0],"..","..","..","kicad_mod")) # load kic
 sys.path.append(os.path.join(sys.path[0],"..","..","..")) # load kicad_mod path
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.keepout_util import KeepoutCircle, KeepoutObround, KeepoutSet, asKeepoutSet
 
 
 # round for grid g
@@ -42,66 +43,23 @@ def addKeepoutRect(x, y, w, h):
   return [[x - w / 2, x + w / 2, y - h / 2, y + h / 2]]
 
 
-# returns a series of rectangle that lie around the circular pad around (x,y) with radius w=h
-# if w!=h, addKeepoutRect() is called
+# round keepouts are grown by this margin on every side, so silkscreen keeps its clearance to the pad
+# (the rectangles which approximated round keepouts before were up to this much larger than the exact shape)
+KEEPOUT_ROUND_MARGIN=0.05
+
+# returns a keepout for the circular pad around (x,y) with diameter w=h
+# if w!=h, the keepout is an obround (oval pad) of width w and height h
 def addKeepoutRound(x,y, w,h):
     if w!=h:
-        return addKeepoutRect(x,y,w,h)
+        return [KeepoutObround(x,y,w+2*KEEPOUT_ROUND_MARGIN,h+2*KEEPOUT_ROUND_MARGIN)]
     else:
-        res=[]
-        Nrects=4
-        r=max(h,w)/2
-        yysum=0
-        for ya in frange(0,r,r/Nrects):
-            a=math.fabs(math.asin(ya/r)/math.pi*180)
-            yy=math.fabs(r*math.sin(a/180.0*math.pi))
-            xx=math.fabs(r*math.cos(a/180.0*math.pi))
-            if (xx>0):
-                res.append([x - xx-0.015, x + xx+0.015, y-yy-r/Nrects-0.015, y-yy+.015])
-                res.append([x - xx-0.015, x + xx+0.015, y+yy-0.015, y+yy+r/Nrects+0.015])
-            yysum=yysum+yy
-        return res
+        return [KeepoutCircle(x,y,w/2+KEEPOUT_ROUND_MARGIN)]
 
 
 
 def applyKeepouts(lines_in, y, xi, yi, keepouts):
     #print("  applyKeepouts(\n  lines_in=", lines_in, "  \n  y=", y, "   \n  xi=", xi, "   yi=", yi, "   \n  keepouts=", keepouts, ")")
-    lines=lines_in
-    changes = True
-    while (changes):
-        changes = False
-        for ko in keepouts:
-            ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-            if (ko[yi+0] <= y) and (y <= ko[yi+1]):
-                #print("    INY: koy=", [ko[yi + 0], ko[yi + 1]], "  y=", y, "):             kox=", [ko[xi + 0], ko[xi + 1]])
-                for li in reversed(range(0, len(lines))):
-                    l = lines[li]
-                    if (l[0] >= ko[xi+0]) and (l[0] <= ko[xi+1]) and (l[1] >= ko[xi+0]) and (l[1] <= ko[xi+1]):  # Line completely inside -> remove
-                        lines.pop(li)
-                        #print("      H1: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, ")")
-                        changes = True
-                    elif (l[0] >= ko[xi+0]) and (l[0] <= ko[xi+1]) and (l[1] > ko[xi+1]):  # Line starts inside, but ends outside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([ko[xi+1], l[1]])
-                        #print("      H2: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [ko[xi+1], l[1]])
-                        changes = True
-                    elif (l[0] < ko[xi+0]) and (l[1] <= ko[xi+1]) and (l[1] >= ko[xi+0]):  # Line starts outside, but ends inside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi+0]])
-                        #print("      H3: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]])
-                        changes = True
-                    elif (l[0] < ko[xi+0]) and (l[1] > ko[xi+1]):  # Line starts outside, and ends outside -> remove and add 2 shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi+0]])
-                        lines.append([ko[xi+1], l[1]])
-                        #print("      H4: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]], [ko[xi+1], l[1]])
-                        changes = True
-                    #else:
-                        #print("      USE: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ")
-        if changes:
-            break
-
-    return lines
+    return asKeepoutSet(keepouts).clipAxisLines(lines_in, y, xi)
 
 
 
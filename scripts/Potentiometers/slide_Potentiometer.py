@@ -87,7 +87,7 @@ def slide_pot(args):
     xLeftTravel = xCenter - hTravel
     xRightTravel = xCenter + hTravel
 
-    keepouts = []
+    keepouts = KeepoutSet()
 
     # Pins
     for pin in [["1", [xPin1, yPin1], Pad.SHAPE_RECT],
@@ -99,15 +99,15 @@ def slide_pot(args):
         y = pin[1][1]
         d = pPin[0] + 2 * silk_ko
         if pin[0] == "1":
-            keepouts = keepouts + addKeepoutRect(x, y, d, d)
+            keepouts.extend(addKeepoutRect(x, y, d, d))
         else:
-            keepouts = keepouts + addKeepoutRound(x, y, d, d)
+            keepouts.extend(addKeepoutRound(x, y, d, d))
 
     for mp in mountingPins:
         f.append(Pad(number="MP", type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
                      at=mp, size=pMP, layers=Pad.LAYERS_THT, drill=dMP))
         d = pMP[0] + 2 * silk_ko
-        keepouts = keepouts + addKeepoutRound(mp[0], mp[1], d, d)
+        keepouts.extend(addKeepoutRound(mp[0], mp[1], d, d))
 
     # Text
     f.append(Text(type="reference", text="REF**", at=[xCenter, yRef], layer="F.SilkS", size=s, thickness=t))
@@ -12,6 +12,7 @@ sys.path.append(os.path.join(sys.path[0], "..", "..", "kicad_mod"))  # load kica
 sys.path.append(os.path.join(sys.path[0], "..", ".."))  # load kicad_mod path
 
 from KicadModTree import *  # NOQA
+from KicadModTree.util.keepout_util import *
 from footprint_global_properties import *
 
 # tool function for generating 3D-scripts
@@ -55,90 +56,62 @@ def addKeepoutRect(x, y, w, h):
     return [[x - w / 2, x + w / 2, y - h / 2, y + h / 2]]
 
 
-# returns a series of rectangle that lie around the circular pad around (x,y) with radius w=h
-# if w!=h, addKeepoutRect() is called
+# round keepouts are grown by this margin on every side. The callers size them as pad + 2 * (line width + offset),
+# which only keeps the required silkscreen clearance together with the margin. The rectangles which approximated round
+# keepouts before were up to this much larger than the exact shape
+KEEPOUT_ROUND_MARGIN = 0.05
+
+# the drawing functions accept a keepout list or a KeepoutSet. Scripts which draw many primitives with the same
+# keepouts collect them in a KeepoutSet, so its spatial index is only built once
+
+
+# returns a keepout for the circular pad around (x,y) with diameter w=h
+# if w!=h, the keepout is an obround (oval pad) of width w and height h
 def addKeepoutRound(x, y, w, h):
     if w != h:
-        return addKeepoutRect(x, y, w, h)
+        return [KeepoutObround(x, y, w + 2 * KEEPOUT_ROUND_MARGIN, h + 2 * KEEPOUT_ROUND_MARGIN)]
     else:
-        res = []
-        Nrects = 16
-        r = max(h, w) / 2
-        yysum = 0
-        for ya in frange(0, r, r / Nrects):
-            a = math.fabs(math.asin(ya / r) / math.pi * 180)
-            yy = math.fabs(r * math.sin(a / 180.0 * math.pi))
-            xx = math.fabs(r * math.cos(a / 180.0 * math.pi))
-            if (xx > 0):
-                res.append([x - xx - 0.015, x + xx + 0.015, y - yy - r / Nrects - 0.015, y - yy + .015])
-                res.append([x - xx - 0.015, x + xx + 0.015, y + yy - 0.015, y + yy + r / Nrects + 0.015])
-            yysum = yysum + yy
-        return res
+        return [KeepoutCircle(x, y, w / 2 + KEEPOUT_ROUND_MARGIN)]
+
+# returns a keepout for a rectangle around x,y with width and height w and h and rounded corners of radius r
+def addKeepoutRoundRect(x, y, w, h, r):
+    return [KeepoutRoundRect(x, y, w, h, r)]
+
+# returns a keepout for the polygon [[x0,y0], [x1,y1], ...]
+def addKeepoutPolygon(points):
+    return [KeepoutPolygon(points)]
 
 # internal method for keepout-processing
 def applyKeepouts(lines_in, y, xi, yi, keepouts):
     # print("  applyKeepouts(\n  lines_in=", lines_in, "  \n  y=", y, "   \n  xi=", xi, "   yi=", yi, "   \n  keepouts=", keepouts, ")")
-    lines = lines_in
-    changes = True
-    while (changes):
-        changes = False
-        for ko in keepouts:
-            ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-            if (ko[yi + 0] <= y) and (y <= ko[yi + 1]):
-                # print("    INY: koy=", [ko[yi + 0], ko[yi + 1]], "  y=", y, "):             kox=", [ko[xi + 0], ko[xi + 1]])
-                for li in reversed(range(0, len(lines))):
-                    l = lines[li]
-                    if (l[0] >= ko[xi + 0]) and (l[0] <= ko[xi + 1]) and (l[1] >= ko[xi + 0]) and (
-                                l[1] <= ko[xi + 1]):  # Line completely inside -> remove
-                        lines.pop(li)
-                        # print("      H1: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, ")")
-                        changes = True
-                    elif (l[0] >= ko[xi + 0]) and (l[0] <= ko[xi + 1]) and (
-                                l[1] > ko[
-                                    xi + 1]):  # Line starts inside, but ends outside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([ko[xi + 1], l[1]])
-                        # print("      H2: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [ko[xi+1], l[1]])
-                        changes = True
-                    elif (l[0] < ko[xi + 0]) and (l[1] <= ko[xi + 1]) and (
-                                l[1] >= ko[
-                                    xi + 0]):  # Line starts outside, but ends inside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi + 0]])
-                        # print("      H3: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]])
-                        changes = True
-                    elif (l[0] < ko[xi + 0]) and (
-                                l[1] > ko[
-                                    xi + 1]):  # Line starts outside, and ends outside -> remove and add 2 shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi + 0]])
-                        lines.append([ko[xi + 1], l[1]])
-                        # print("      H4: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]], [ko[xi+1], l[1]])
-                        changes = True
-                        # else:
-                        # print("      USE: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ")
-        if changes:
-            break
-
-    return lines
+    return asKeepoutSet(keepouts).clipAxisLines(lines_in, y, xi)
 
 # gives True if the given point (x,y) is contained in any keepout
 def containedInAnyKeepout(x,y, keepouts):
-    for ko in keepouts:
-        ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-        if x>=ko[0] and x<=ko[1] and y>=ko[2] and y<=ko[3]:
-            #print("HIT!")
-            return True
-    #print("NO HIT ",x,y)
-    return False
-
-# draws the keepouts
+    return asKeepoutSet(keepouts).containsPoint(x, y)
+
+# draws the bounding boxes of the keepouts
 def debug_draw_keepouts(kicad_modg, keepouts):
-    for ko in keepouts:
-        kicad_modg.append(RectLine(start=[ko[0],ko[2]],
-                                  end=[ko[1],ko[3]],
+    for ko in asKeepoutSet(keepouts):
+        kicad_modg.append(RectLine(start=[ko.bounding_box[0],ko.bounding_box[2]],
+                                  end=[ko.bounding_box[1],ko.bounding_box[3]],
                                   layer='F.Mask', width=0.01))
 
+# draws the pieces of an arc around (x,y) returned by clipArc(), a full circle is drawn as Circle
+# pieces beginning at start_angle use the given start point, so unclipped arcs keep their exact start
+def _addClippedArcs(kicad_mod, x, y, radius, pieces, layer, width, roun, start_angle=None, startx=None, starty=None):
+    for start, angle in pieces:
+        if abs(angle) >= 2 * math.pi:
+            kicad_mod.append(
+                Circle(center=[roundG(x, roun), roundG(y, roun)], radius=radius, layer=layer, width=width))
+        else:
+            if start != start_angle:
+                startx = x + radius * math.cos(start)
+                starty = y + radius * math.sin(start)
+            kicad_mod.append(Arc(center=[roundG(x, roun), roundG(y, roun)],
+                                 start=[roundG(startx, roun), roundG(starty, roun)],
+                                 angle=math.degrees(angle), layer=layer, width=width))
+
 # split a horizontal line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addHLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts=[], roun=0.001, dashed=False):
     if dashed:
@@ -152,32 +125,8 @@ def addHLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts=[], roun=0.
 
 # draw a circle minding the keepouts
 def addCircleWithKeepout(kicad_mod, x, y, radius, layer, width, keepouts=[], roun=0.001):
-    dalpha = 2 * 3.1415 / (360)
-    a = 0
-    start=0
-    startx=x + radius * math.sin(0)
-    starty=y + radius * math.cos(0)
-    hasToDraw=False
-    noneUsed=True
-    while a < 2 * 3.1415:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-
-        if containedInAnyKeepout(x1,y1, keepouts):
-            if hasToDraw and math.fabs(a-start)>0:
-                kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
-            hasToDraw = False
-            startx=x1; starty=y1; start=a
-            noneUsed = False
-        else:
-            hasToDraw = True
-
-        a = a + dalpha
-    if noneUsed:
-        kicad_mod.append(
-            Circle(center=[roundG(x, roun), roundG(y, roun)], radius=radius, layer=layer, width=width))
-    elif hasToDraw and math.fabs(a - start) > 0:
-        kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
+    pieces = asKeepoutSet(keepouts).clipArc(x, y, radius, 0, 2 * math.pi)
+    _addClippedArcs(kicad_mod, x, y, radius, pieces, layer, width, roun)
 
 # draw an arc
 def addArcByAngles(kicad_mod, x, y, radius, angle_start, angle_end, layer, width, roun=0.001):
@@ -193,39 +142,10 @@ def addArcByAnglesWithKeepout(kicad_mod, x, y, radius, angle_start, angle_end, l
 
 # draw an arc minding the keepouts
 def addArcWithKeepout(kicad_mod, x, y, startx, starty, angle, layer, width, keepouts=[], roun=0.001):
-    dalpha = angle/180*3.1415 / (360)
     radius=math.sqrt(sqr(x-startx)+sqr(y-starty));
-    a = math.asin((startx-x)/radius)
-    if starty<0:
-        a=a+3.1415/2
-    astart=a;
-    aend=astart+angle/180*3.1415
-    start=astart
-    #print(radius, astart/3.1415*180, aend/3.1415*180)
-    istartx=x + radius * math.sin(a)
-    istarty=y + radius * math.cos(a)
-    hasToDraw=False
-    noneUsed=True
-    while a < aend:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-
-        if containedInAnyKeepout(x1,y1, keepouts):
-            if hasToDraw and math.fabs(a-start)>0:
-                #print('DRAW ',x1,y1)
-                kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(istartx, roun), roundG(istarty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
-            hasToDraw = False
-            istartx=x1; istarty=y1; start=a
-            noneUsed = False
-        else:
-            hasToDraw = True
-        #print(a, dalpha, hasToDraw, noneUsed)
-        a = a + dalpha
-    if noneUsed:
-        kicad_mod.append(
-            Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=angle, layer=layer, width=width))
-    elif hasToDraw and math.fabs(a - start) > 0:
-        kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(istartx, roun), roundG(istarty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
+    start_angle = math.atan2(starty - y, startx - x)
+    pieces = asKeepoutSet(keepouts).clipArc(x, y, radius, start_angle, math.radians(angle))
+    _addClippedArcs(kicad_mod, x, y, radius, pieces, layer, width, roun, start_angle, startx, starty)
 
 # draw an ellipse with one axis along x-axis and one axis along y-axis and given width/height
 def addEllipse(kicad_mod, x, y, w, h, layer, width, roun=0.001):
@@ -245,6 +165,7 @@ def addEllipseWithKeepout(kicad_mod, x, y, w, h, layer, width, keepouts=[], roun
 
 # split a circle so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addDCircleWithKeepout(kicad_mod, x, y, radius, layer, width, keepouts=[], roun=0.001):
+    keepouts = asKeepoutSet(keepouts)
     dalpha = 2 * 3.1415 / (2 * 3.1415 * radius / (6 * width))
     a = 0
     while a < 2 * 3.1415:
@@ -252,38 +173,16 @@ def addDCircleWithKeepout(kicad_mod, x, y, radius, layer, width, keepouts=[], ro
         y1 = y + radius * math.cos(a)
         x2 = x + radius * math.sin(a + dalpha / 2)
         y2 = y + radius * math.cos(a + dalpha / 2)
-        ok=True
-        aa=a
-        while aa<a+dalpha and ok:
-            xx = x + radius * math.sin(aa)
-            yy = y + radius * math.cos(aa)
-            if containedInAnyKeepout(xx, yy, keepouts):
-                ok=False
-            aa=aa+dalpha/20
+        ok = keepouts.clipArc(x, y, radius, math.pi / 2 - a, -dalpha) == [(math.pi / 2 - a, -dalpha)]
         if ok: kicad_mod.append(Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(x1, roun), roundG(y1, roun)],
                              angle=-1*dalpha / 2 / 3.1415 * 180, layer=layer, width=width))
         a = a + dalpha
 
 # split an arbitrary line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addLineWithKeepout(kicad_mod, x1, y1, x2,y2, layer, width, keepouts=[], roun=0.001):
-    dx=(x2-x1)/200
-    dy=(y2-y1)/200
-    x=x1; y=y1
-    xs=x1; ys=y1;
-    hasToDraw=not containedInAnyKeepout(x, y, keepouts)
-    didDrawAny=False
-    for n in range(0,200):
-        if containedInAnyKeepout(x+dx, y+dy, keepouts):
-            if hasToDraw:
-                didDrawAny=True
-                kicad_mod.append(Line(start=[roundG(xs, roun), roundG(ys, roun)], end=[roundG(x, roun), roundG(y, roun)], layer=layer, width=width))
-            xs=x+2*dx; ys=y+2*dy; hasToDraw=False
-        else:
-            hasToDraw = True
-
-        x=x+dx; y=y+dy
-    if hasToDraw and ((xs!=x2 or ys!=y2) or (not didDrawAny)):
-        kicad_mod.append(Line(start=[roundG(xs, roun), roundG(ys, roun)], end=[roundG(x2, roun), roundG(y2, roun)], layer=layer, width=width))
+    for l in asKeepoutSet(keepouts).clipLine(x1, y1, x2, y2):
+        kicad_mod.append(Line(start=[roundG(l[0], roun), roundG(l[1], roun)], end=[roundG(l[2], roun), roundG(l[3], roun)],
+                              layer=layer, width=width))
 
 
 # split an arbitrary line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
@@ -329,30 +329,33 @@ def makeDIPSwitch(pins, rm, pinrow_distance, package_width, overlen_top, overlen
     p2 = int(pins / 2 + 1)
     x2 = pinrow_distance
     y2 = (pins / 2 - 1) * rm
-    keepouts=[];
+    keepouts = KeepoutSet()
     
     if smd_pads:
         pad_type = Pad.TYPE_SMT
         pad_shape1 = Pad.SHAPE_RECT
         pad_shapeother = Pad.SHAPE_RECT
         pad_layers = ['F.Cu', 'F.Mask', 'F.Paste']
+        # the corners of rectangular pads are not covered by a round keepout
+        addKeepoutOther = addKeepoutRect
     else:
         pad_type = Pad.TYPE_THT
         pad_shape1 = Pad.SHAPE_RECT
         pad_shapeother = Pad.SHAPE_OVAL
         pad_layers = ['*.Cu', '*.Mask']
+        addKeepoutOther = addKeepoutRound
     
     keepout_addsize=4*max(slk_offset, lw_slk)
     for p in range(1, int(pins / 2 + 1)):
         if p == 1:
             kicad_modg.append(Pad(number=p1, type=pad_type, shape=pad_shape1, at=[x1, y1], size=pad, drill=ddrill, layers=pad_layers))
-            keepouts=keepouts+addKeepoutRect(x1, y1, pad[0]+keepout_addsize, pad[1]+keepout_addsize)
+            keepouts.extend(addKeepoutRect(x1, y1, pad[0]+keepout_addsize, pad[1]+keepout_addsize))
         else:
             kicad_modg.append(Pad(number=p1, type=pad_type, shape=pad_shapeother, at=[x1, y1], size=pad, drill=ddrill, layers=pad_layers))
-            keepouts=keepouts+addKeepoutRound(x1, y1, pad[0]+keepout_addsize, pad[1]+keepout_addsize)
+            keepouts.extend(addKeepoutOther(x1, y1, pad[0]+keepout_addsize, pad[1]+keepout_addsize))
         
         kicad_modg.append(Pad(number=p2, type=pad_type, shape=pad_shapeother, at=[x2, y2], size=pad, drill=ddrill, layers=pad_layers))
-        keepouts=keepouts+addKeepoutRound(x2, y2, pad[0]+keepout_addsize, pad[1]+keepout_addsize)
+        keepouts.extend(addKeepoutOther(x2, y2, pad[0]+keepout_addsize, pad[1]+keepout_addsize))
         
         p1 = p1 + 1
         p2 = p2 + 1
@@ -363,19 +366,19 @@ def makeDIPSwitch(pins, rm, pinrow_distance, package_width, overlen_top, overlen
         kicad_modg.append(Pad(number=pins + 1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
                               at=[l_fab + cornerPadOffsetX, t_fab + cornerPadOffsetY], size=cornerPads, drill=0,
                               layers=pad_layers))
-        keepouts=keepouts+addKeepoutRect(l_fab + cornerPadOffsetX, t_fab + cornerPadOffsetY, cornerPads[0]+keepout_addsize, cornerPads[1]+keepout_addsize)                              
+        keepouts.extend(addKeepoutRect(l_fab + cornerPadOffsetX, t_fab + cornerPadOffsetY, cornerPads[0]+keepout_addsize, cornerPads[1]+keepout_addsize))                              
         kicad_modg.append(Pad(number=pins + 1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
                               at=[l_fab + w_fab - cornerPadOffsetX, t_fab + cornerPadOffsetY], size=cornerPads, drill=0,
                               layers=pad_layers))
-        keepouts=keepouts+addKeepoutRect(l_fab + w_fab - cornerPadOffsetX, t_fab + cornerPadOffsetY, cornerPads[0]+keepout_addsize, cornerPads[1]+keepout_addsize)                              
+        keepouts.extend(addKeepoutRect(l_fab + w_fab - cornerPadOffsetX, t_fab + cornerPadOffsetY, cornerPads[0]+keepout_addsize, cornerPads[1]+keepout_addsize))                              
         kicad_modg.append(Pad(number=pins + 1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
                               at=[l_fab + cornerPadOffsetX, t_fab + h_fab - cornerPadOffsetY], size=cornerPads, drill=0,
                               layers=pad_layers))
-        keepouts=keepouts+addKeepoutRect(l_fab + cornerPadOffsetX, t_fab + h_fab - cornerPadOffsetY, cornerPads[0]+keepout_addsize, cornerPads[1]+keepout_addsize)                              
+        keepouts.extend(addKeepoutRect(l_fab + cornerPadOffsetX, t_fab + h_fab - cornerPadOffsetY, cornerPads[0]+keepout_addsize, cornerPads[1]+keepout_addsize))                              
         kicad_modg.append(Pad(number=pins + 1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
                               at=[l_fab + w_fab - cornerPadOffsetX, t_fab + h_fab - cornerPadOffsetY], size=cornerPads,
                               drill=0, layers=pad_layers))        
-        keepouts=keepouts+addKeepoutRect(l_fab + w_fab - cornerPadOffsetX, t_fab + h_fab - cornerPadOffsetY, cornerPads[0]+keepout_addsize, cornerPads[1]+keepout_addsize)                              
+        keepouts.extend(addKeepoutRect(l_fab + w_fab - cornerPadOffsetX, t_fab + h_fab - cornerPadOffsetY, cornerPads[0]+keepout_addsize, cornerPads[1]+keepout_addsize))                              
         
         
 
@@ -217,14 +217,14 @@ def makeLEDRadial(rm, w, h, ddrill, win=0, rin=0, pins=2, type="round", x_3d=[0,
         kicad_modg.append(Arc(center=[0, ycenter], start=[-xstart, -ystart], angle=-alpha, layer='F.Fab', width=lw_fab))
     
     # build keepeout for SilkScreen
-    keepouts = []
+    keepouts = KeepoutSet()
     for p in padpos:
         if p[0] == 1:
-            keepouts = keepouts + addKeepoutRect(p[1], p[2], p[4] + 2 * lw_slk + 2 * slk_offset,
-                                                 p[5] + 2 * lw_slk + 2 * slk_offset)
+            keepouts.extend(addKeepoutRect(p[1], p[2], p[4] + 2 * lw_slk + 2 * slk_offset,
+                                           p[5] + 2 * lw_slk + 2 * slk_offset))
         else:
-            keepouts = keepouts + addKeepoutRound(p[1], p[2], p[4] + 2 * lw_slk + 2 * slk_offset,
-                                                  p[5] + 2 * lw_slk + 2 * slk_offset)
+            keepouts.extend(addKeepoutRound(p[1], p[2], p[4] + 2 * lw_slk + 2 * slk_offset,
+                                            p[5] + 2 * lw_slk + 2 * slk_offset))
     
     # create SILKSCREEN-layer
     if type == "box":
@@ -503,14 +503,14 @@ def makeLEDHorizontal(pins=2,rm=2.544,dled=5,dledout=5.8,offsetled=2.54,wled=8.6
             RectLine(start=[p[1],p[2]], end=[p[1],offsetled], layer='F.Fab', width=lw_fab))
     
     # build keepeout for SilkScreen
-    keepouts = []
+    keepouts = KeepoutSet()
     for p in padpos:
         if p[0] == 1:
-            keepouts = keepouts + addKeepoutRect(p[1], p[2], p[4] + 2 * lw_slk + 2 * slk_offset,
-                                                 p[5] + 2 * lw_slk + 2 * slk_offset)
+            keepouts.extend(addKeepoutRect(p[1], p[2], p[4] + 2 * lw_slk + 2 * slk_offset,
+                                           p[5] + 2 * lw_slk + 2 * slk_offset))
         else:
-            keepouts = keepouts + addKeepoutRound(p[1], p[2], p[4] + 2 * lw_slk + 2 * slk_offset,
-                                                  p[5] + 2 * lw_slk + 2 * slk_offset)
+            keepouts.extend(addKeepoutRound(p[1], p[2], p[4] + 2 * lw_slk + 2 * slk_offset,
+                                            p[5] + 2 * lw_slk + 2 * slk_offset))
     
     # create SILKSCREEN-layer
     if type == "round":
@@ -935,12 +935,12 @@ def makeResistorRadial(seriesname, rm, w, h, ddrill, R_POW, innerw=0,innerh=0,rm
 
 
     # build keepeout for SilkScreen
-    keepouts=[]
+    keepouts = KeepoutSet()
     for p in padpos:
         if deco=="elco":
-            keepouts=keepouts+addKeepoutRect(p[1],p[2],p[4]+2*lw_slk+2*slk_offset,p[5]+2*lw_slk+2*slk_offset)
+            keepouts.extend(addKeepoutRect(p[1],p[2],p[4]+2*lw_slk+2*slk_offset,p[5]+2*lw_slk+2*slk_offset))
         else:
-            keepouts=keepouts+addKeepoutRound(p[1],p[2],p[4]+2*lw_slk+2*slk_offset,p[5]+2*lw_slk+2*slk_offset)
+            keepouts.extend(addKeepoutRound(p[1],p[2],p[4]+2*lw_slk+2*slk_offset,p[5]+2*lw_slk+2*slk_offset))
 
     # create SILKSCREEN-layer
     if type=="round" or type=="concentric":
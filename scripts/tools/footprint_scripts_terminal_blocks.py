@@ -128,14 +128,14 @@ def makeTerminalBlockStd(footprint_name, pins, rm, package_height, leftbottom_of
         pad_shape_extra = Pad.SHAPE_OVAL
 
     pad_layers = Pad.LAYERS_THT
-    keepouts=[];
+    keepouts = KeepoutSet()
     for p in range(1, pins + 1):
         pextra=0
         if secondDrillPad[0]>0:
             pextra=p
         if p == 1:
             kicad_modg.append(Pad(number=p, type=pad_type, shape=pad_shape1, at=[x1, y1], size=pad, drill=ddrill, layers=pad_layers))
-            keepouts=keepouts+addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset)
+            keepouts.extend(addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset))
             if secondDrillDiameter>0:
                 if extradrill1_type == Pad.TYPE_NPTH:
                     num = ""
@@ -144,20 +144,20 @@ def makeTerminalBlockStd(footprint_name, pins, rm, package_height, leftbottom_of
                     num = p
                     extra_shape = Pad.SHAPE_RECT
                 kicad_modg.append(Pad(number=num, type=extradrill1_type, shape=extra_shape, at=[x1+secondDrillOffset[0], y1+secondDrillOffset[1]], size=secondDrillPad, drill=secondDrillDiameter, layers=pad_layers))
-                keepouts=keepouts+addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset)
+                keepouts.extend(addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset))
         else:
             kicad_modg.append(Pad(number=p, type=pad_type, shape=pad_shapeother, at=[x1, y1], size=pad, drill=ddrill, layers=pad_layers))
             if secondDrillPad[0]!=secondDrillPad[1]:
-                keepouts=keepouts+addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset)
+                keepouts.extend(addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset))
             else:
-                keepouts=keepouts+addKeepoutRound(x1, y1, pad[0]+8*slk_offset, pad[0]+8*slk_offset)
+                keepouts.extend(addKeepoutRound(x1, y1, pad[0]+8*slk_offset, pad[0]+8*slk_offset))
             if secondDrillDiameter>0:
                 if extradrill1_type == Pad.TYPE_NPTH:
                     num = ""
                 else:
                     num = p
                 kicad_modg.append(Pad(number=num, type=extradrill1_type, shape=pad_shape_extra, at=[x1+secondDrillOffset[0], y1+secondDrillOffset[1]], size=secondDrillPad, drill=secondDrillDiameter, layers=pad_layers))
-                keepouts=keepouts+addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset)
+                keepouts.extend(addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset))
 
         x1=x1+rm
 
@@ -232,7 +232,11 @@ def makeTerminalBlockStd(footprint_name, pins, rm, package_height, leftbottom_of
 
     output_dir = fp_lib_name + '.pretty' + os.sep
     if not os.path.isdir(output_dir):
-        os.makedirs(output_dir)
+        try:
+            os.makedirs(output_dir)
+        except OSError:
+            if not os.path.isdir(output_dir):
+                raise
 
     file_handler = KicadFileHandler(kicad_mod)
     file_handler.writeFile(output_dir + footprint_name + '.kicad_mod')
@@ -349,13 +353,13 @@ def makeTerminalBlockVertical(footprint_name, pins, rm, package_height, leftbott
         pad_shape_extra = Pad.SHAPE_OVAL
 
     pad_layers = Pad.LAYERS_THT
-    keepouts=[];
+    keepouts = KeepoutSet()
 
     for p in range(1, pins + 1):
 
         if p == 1:
             kicad_modg.append(Pad(number=p, type=pad_type, shape=pad_shape1, at=[x1, y1], size=pad, drill=ddrill, layers=pad_layers))
-            keepouts=keepouts+addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset)
+            keepouts.extend(addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset))
             if secondDrillDiameter>0:
                 if extradrill1_type == Pad.TYPE_NPTH:
                     num = ""
@@ -364,13 +368,13 @@ def makeTerminalBlockVertical(footprint_name, pins, rm, package_height, leftbott
                     num = p
                     extra_shape = Pad.SHAPE_RECT
                 kicad_modg.append(Pad(number=num, type=extradrill1_type, shape=extra_shape, at=[x1+secondDrillOffset[0], y1+secondDrillOffset[1]], size=secondDrillPad, drill=secondDrillDiameter, layers=pad_layers))
-                keepouts=keepouts+addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset)
+                keepouts.extend(addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset))
         else:
             kicad_modg.append(Pad(number=p, type=pad_type, shape=pad_shapeother, at=[x1, y1], size=pad, drill=ddrill, layers=pad_layers))
             if pad[0]!=pad[1]:
-                keepouts=keepouts+addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset)
+                keepouts.extend(addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset))
             else:
-                keepouts=keepouts+addKeepoutRound(x1, y1, pad[0]+8*slk_offset, pad[0]+8*slk_offset)
+                keepouts.extend(addKeepoutRound(x1, y1, pad[0]+8*slk_offset, pad[0]+8*slk_offset))
             if secondDrillDiameter>0:
                 if extradrill1_type == Pad.TYPE_NPTH:
                     num = ""
@@ -378,9 +382,9 @@ def makeTerminalBlockVertical(footprint_name, pins, rm, package_height, leftbott
                     num = p
                 kicad_modg.append(Pad(number=num, type=extradrill1_type, shape=pad_shape_extra, at=[x1+secondDrillOffset[0], y1+secondDrillOffset[1]], size=secondDrillPad, drill=secondDrillDiameter, layers=pad_layers))
                 if secondDrillPad[0]!=secondDrillPad[1]:
-                    keepouts=keepouts+addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset)
+                    keepouts.extend(addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset))
                 else:
-                    keepouts=keepouts+addKeepoutRound(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset)
+                    keepouts.extend(addKeepoutRound(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset))
 
         x1=x1+rm
 
@@ -450,7 +454,11 @@ def makeTerminalBlockVertical(footprint_name, pins, rm, package_height, leftbott
 
     output_dir = fp_lib_name + '.pretty' + os.sep
     if not os.path.isdir(output_dir):
-        os.makedirs(output_dir)
+        try:
+            os.makedirs(output_dir)
+        except OSError:
+            if not os.path.isdir(output_dir):
+                raise
 
     file_handler = KicadFileHandler(kicad_mod)
     file_handler.writeFile(output_dir + footprint_name + '.kicad_mod')
@@ -572,7 +580,7 @@ def makeTerminalBlock45Degree(footprint_name, pins, rm, package_height, leftbott
         pad_shape_extra = Pad.SHAPE_OVAL
 
     pad_layers = Pad.LAYERS_THT
-    keepouts=[];
+    keepouts = KeepoutSet()
 
     for p in range(1, pins + 1):
         pextra=0
@@ -580,7 +588,7 @@ def makeTerminalBlock45Degree(footprint_name, pins, rm, package_height, leftbott
             pextra=p
         if p == 1:
             kicad_modg.append(Pad(number=p, type=pad_type, shape=pad_shape1, at=[x1, y1], size=pad, drill=ddrill, layers=pad_layers))
-            keepouts=keepouts+addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset)
+            keepouts.extend(addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset))
             if secondDrillDiameter>0:
                 if extradrill1_type == Pad.TYPE_NPTH:
                     num = ""
@@ -589,20 +597,20 @@ def makeTerminalBlock45Degree(footprint_name, pins, rm, package_height, leftbott
                     num = p
                     extra_shape = Pad.SHAPE_RECT
                 kicad_modg.append(Pad(number=num, type=extradrill1_type, shape=extra_shape, at=[x1+secondDrillOffset[0], y1+secondDrillOffset[1]], size=secondDrillPad, drill=secondDrillDiameter, layers=pad_layers))
-                keepouts=keepouts+addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[1],secondDrillDiameter)+8*slk_offset)
+                keepouts.extend(addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[1],secondDrillDiameter)+8*slk_offset))
         else:
             kicad_modg.append(Pad(number=p, type=pad_type, shape=pad_shapeother, at=[x1, y1], size=pad, drill=ddrill, layers=pad_layers))
             if pad[0]!=pad[1]:
-                keepouts=keepouts+addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset)
+                keepouts.extend(addKeepoutRect(x1, y1, pad[0]+8*slk_offset, pad[1]+8*slk_offset))
             else:
-                keepouts=keepouts+addKeepoutRound(x1, y1, pad[0]+8*slk_offset, pad[0]+8*slk_offset)
+                keepouts.extend(addKeepoutRound(x1, y1, pad[0]+8*slk_offset, pad[0]+8*slk_offset))
             if secondDrillDiameter>0:
                 if extradrill1_type == Pad.TYPE_NPTH:
                     num = ""
                 else:
                     num = p
                 kicad_modg.append(Pad(number=num, type=extradrill1_type, shape=pad_shape_extra, at=[x1+secondDrillOffset[0], y1+secondDrillOffset[1]], size=secondDrillPad, drill=secondDrillDiameter, layers=pad_layers))
-                keepouts=keepouts+addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[1],secondDrillDiameter)+8*slk_offset)
+                keepouts.extend(addKeepoutRect(x1+secondDrillOffset[0], y1+secondDrillOffset[1], max(secondDrillPad[0],secondDrillDiameter)+8*slk_offset, max(secondDrillPad[1],secondDrillDiameter)+8*slk_offset))
 
         x1=x1+rm
 
@@ -694,7 +702,11 @@ def makeTerminalBlock45Degree(footprint_name, pins, rm, package_height, leftbott
 
     output_dir = fp_lib_name + '.pretty' + os.sep
     if not os.path.isdir(output_dir):
-        os.makedirs(output_dir)
+        try:
+            os.makedirs(output_dir)
+        except OSError:
+            if not os.path.isdir(output_dir):
+                raise
 
     file_handler = KicadFileHandler(kicad_mod)
     file_handler.writeFile(output_dir + footprint_name + '.kicad_mod')
@@ -784,15 +796,15 @@ def makeScrewTerminalSingleStd(footprint_name, block_size, block_offset, pins, d
     pad_type = Pad.TYPE_THT
     pad_shapeother = Pad.SHAPE_CIRCLE
     pad_layers = Pad.LAYERS_THT
-    keepouts=[];
+    keepouts = KeepoutSet()
     for p in pins:
         kicad_modg.append(Pad(number=1, type=pad_type, shape=pad_shapeother, at=p, size=pad, drill=ddrill, layers=pad_layers))
-        keepouts=keepouts+addKeepoutRound(p[0], p[1], pad[0]+8*slk_offset, pad[0]+8*slk_offset)
+        keepouts.extend(addKeepoutRound(p[0], p[1], pad[0]+8*slk_offset, pad[0]+8*slk_offset))
 
     # screw
-    keepouts_screw=[];
+    keepouts_screw = KeepoutSet()
     if screw_diameter>0:
-        keepouts_screw=keepouts_screw+addKeepoutRound(screw_offset[0], screw_offset[1], screw_diameter, screw_diameter)
+        keepouts_screw.extend(addKeepoutRound(screw_offset[0], screw_offset[1], screw_diameter, screw_diameter))
         if slit_screw:
             addSlitScrew(kicad_modg, screw_offset[0], screw_offset[1], screw_diameter/2, 'F.Fab', lw_fab)
             addSlitScrewWithKeepouts(kicad_modg, screw_offset[0], screw_offset[1], screw_diameter/2+1*slk_offset, 'F.SilkS', lw_slk, keepouts)
@@ -802,7 +814,8 @@ def makeScrewTerminalSingleStd(footprint_name, block_size, block_offset, pins, d
 
     # create Body
     addRectWithKeepout(kicad_modg, l_fab, t_fab, w_fab, h_fab, layer='F.Fab', width=lw_fab, keepouts=keepouts_screw)
-    addRectWithKeepout(kicad_modg, l_slk, t_slk, w_slk, h_slk, layer='F.SilkS', width=lw_slk, keepouts=keepouts+keepouts_screw)
+    keepouts.extend(keepouts_screw)
+    addRectWithKeepout(kicad_modg, l_slk, t_slk, w_slk, h_slk, layer='F.SilkS', width=lw_slk, keepouts=keepouts)
 
     # create courtyard
     kicad_mod.append(RectLine(start=[roundCrt(l_crt + offset[0]), roundCrt(t_crt + offset[1])],
@@ -824,7 +837,11 @@ def makeScrewTerminalSingleStd(footprint_name, block_size, block_offset, pins, d
 
     output_dir = fp_lib_name + '.pretty' + os.sep
     if not os.path.isdir(output_dir):
-        os.makedirs(output_dir)
+        try:
+            os.makedirs(output_dir)
+        except OSError:
+            if not os.path.isdir(output_dir):
+                raise
 
     file_handler = KicadFileHandler(kicad_mod)
     file_handler.writeFile(output_dir + footprint_name + '.kicad_mod')
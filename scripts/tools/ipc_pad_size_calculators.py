@@ -1,6 +1,19 @@
 from __future__ import division
+import functools
 import math
 import re
+from collections import OrderedDict, namedtuple
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+IPC_DENSITIES = ('least', 'nominal', 'most')
+
+# number of land pattern results which are remembered by the ipc_* functions
+IPC_CACHE_SIZE = 1024
 
 def roundToBase(value, base):
     return round(value/base) * base
@@ -208,9 +221,60 @@ class TolerancedSize():
         else:
             return TolerancedSize.fromString(yaml, unit)
 
+    def cacheKey(self):
+        return (self.minimum, self.nominal, self.maximum, self.ipc_tol, self.ipc_tol_RMS, self.minimum_RMS, self.maximum_RMS)
+
     def __str__(self):
         return 'nom: {}, min: {}, max: {}  | min_rms: {}, max_rms: {}'.format(self.nominal, self.minimum, self.maximum, self.minimum_RMS, self.maximum_RMS)
 
+class IpcCacheInfo(namedtuple('IpcCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])):
+    def __str__(self):
+        calls = self.hits + self.misses
+        return 'IPC land pattern cache: {} hits, {} misses ({:.0%} hit rate), {}/{} entries'.format(
+            self.hits, self.misses, self.hits/calls if calls else 0, self.currsize, self.maxsize)
+
+_ipc_cache = OrderedDict()
+_ipc_cache_stats = {'hits': 0, 'misses': 0}
+
+def ipc_cache_info():
+    return IpcCacheInfo(_ipc_cache_stats['hits'], _ipc_cache_stats['misses'], IPC_CACHE_SIZE, len(_ipc_cache))
+
+def ipc_cache_clear():
+    _ipc_cache.clear()
+    _ipc_cache_stats['hits'] = 0
+    _ipc_cache_stats['misses'] = 0
+
+def _ipc_cache_key(value):
+    if isinstance(value, TolerancedSize):
+        return value.cacheKey()
+    return value
+
+def _memoize_ipc(function):
+    # packages often share their dimensions, and every footprint variant calculates its pads again
+    @functools.wraps(function)
+    def wrapper(ipc_data, ipc_round_base, manf_tol, *args, **kwargs):
+        F = manf_tol.get('manufacturing_tolerance', 0.1)
+        P = manf_tol.get('placement_tolerance', 0.05)
+        key = (function, frozenset(ipc_data.items()), frozenset(ipc_round_base.items()), F, P,
+               tuple(map(_ipc_cache_key, args)),
+               frozenset((name, _ipc_cache_key(value)) for name, value in kwargs.items()))
+
+        result = _ipc_cache.get(key)
+        if result is not None:
+            # re-inserted as most recently used entry (OrderedDict.move_to_end is not available on python2)
+            del _ipc_cache[key]
+            _ipc_cache[key] = result
+            _ipc_cache_stats['hits'] += 1
+            return result
+
+        _ipc_cache_stats['misses'] += 1
+        result = function(ipc_data, ipc_round_base, manf_tol, *args, **kwargs)
+        _ipc_cache[key] = result
+        if len(_ipc_cache) > IPC_CACHE_SIZE:
+            _ipc_cache.popitem(last=False)
+        return result
+    return wrapper
+
 def ipc_body_edge_inside(ipc_data, ipc_round_base, manf_tol, body_size, lead_width,
         lead_len=None, lead_inside=None, heel_reduction=0):
     pull_back = TolerancedSize(nominal=0)
@@ -221,6 +285,7 @@ def ipc_body_edge_inside(ipc_data, ipc_round_base, manf_tol, body_size, lead_wid
                 heel_reduction=heel_reduction
                 )
 
+@_memoize_ipc
 def ipc_body_edge_inside_pull_back(ipc_data, ipc_round_base, manf_tol, body_size, lead_width,
         lead_len=None, lead_inside=None, body_to_inside_lead_edge=None, pull_back=None, lead_outside=None, heel_reduction=0):
     # Zmax = Lmin + 2JT + √(CL^2 + F^2 + P^2)
@@ -261,6 +326,7 @@ def ipc_body_edge_inside_pull_back(ipc_data, ipc_round_base, manf_tol, body_size
 
     return Gmin, Zmax, Xmax
 
+@_memoize_ipc
 def ipc_gull_wing(ipc_data, ipc_round_base, manf_tol, lead_width, lead_outside,
         lead_len=None, lead_inside=None, heel_reduction=0):
     # Zmax = Lmin + 2JT + √(CL^2 + F^2 + P^2)
@@ -294,6 +360,7 @@ def ipc_gull_wing(ipc_data, ipc_round_base, manf_tol, lead_width, lead_outside,
 
     return Gmin, Zmax, Xmax
 
+@_memoize_ipc
 def ipc_pad_center_plus_size(ipc_data, ipc_round_base, manf_tol,
         center_position, lead_length, lead_width):
     F = manf_tol.get('manufacturing_tolerance', 0.1)
@@ -312,3 +379,203 @@ def ipc_pad_center_plus_size(ipc_data, ipc_round_base, manf_tol,
     Xmax = roundToBase(Xmax, ipc_round_base['side'])
 
     return Gmin, Zmax, Xmax
+
+
+# The *_table functions calculate the land patterns of many devices at once, for example of all entries of a
+# size definition file. Every dimension is given as list of TolerancedSize with one entry per device, and
+# heel_reduction can be a number or a list. The optional dimensions have to be given for all devices or for none.
+# The result is {density: (Gmin, Zmax, Xmax)} with one value per device in each list, identical to the results of
+# the functions above.
+
+class TolerancedSizeArray():
+    # TolerancedSize for many devices, every operation is executed in the same order as by TolerancedSize
+    def __init__(self, minimum, maximum):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.nominal = (minimum + maximum)/2
+
+        if numpy.any(self.maximum < self.minimum):
+            raise ValueError("Maximum is smaller than minimum. Tolerance ranges given wrong or parameters confused.")
+
+        self.ipc_tol = self.maximum - self.minimum
+        self.ipc_tol_RMS = self.ipc_tol
+        self.maximum_RMS = self.maximum
+        self.minimum_RMS = self.minimum
+
+    @staticmethod
+    def fromSizes(sizes):
+        result = TolerancedSizeArray(
+            minimum = numpy.array([size.minimum for size in sizes], dtype=float),
+            maximum = numpy.array([size.maximum for size in sizes], dtype=float)
+            )
+        result.nominal = numpy.array([size.nominal for size in sizes], dtype=float)
+        result.ipc_tol_RMS = numpy.array([size.ipc_tol_RMS for size in sizes], dtype=float)
+        result.maximum_RMS = numpy.array([size.maximum_RMS for size in sizes], dtype=float)
+        result.minimum_RMS = numpy.array([size.minimum_RMS for size in sizes], dtype=float)
+        return result
+
+    def updateRMS(self, tolerances):
+        ipc_tol_RMS = 0
+        for t in tolerances:
+            ipc_tol_RMS += t**2
+
+        self.ipc_tol_RMS = numpy.sqrt(ipc_tol_RMS)
+        too_large = self.ipc_tol_RMS > self.ipc_tol
+        if numpy.any(too_large):
+            invalid = too_large & (numpy.rint(self.ipc_tol_RMS/1e-6)*1e-6 > numpy.rint(self.ipc_tol/1e-6)*1e-6)
+            if numpy.any(invalid):
+                index = numpy.flatnonzero(invalid)[0]
+                raise ValueError(
+                    "RMS tolerance larger than normal tolerance. Did you give the wrong tolerances?\ntol(RMS): {} tol: {}"\
+                    .format(self.ipc_tol_RMS[index], self.ipc_tol[index]))
+            # the discrepancy most likely comes from floating point errors. Ignore it.
+            self.ipc_tol_RMS = numpy.where(too_large, self.ipc_tol, self.ipc_tol_RMS)
+
+        self.maximum_RMS = self.maximum - (self.ipc_tol - self.ipc_tol_RMS)/2
+        self.minimum_RMS = self.minimum + (self.ipc_tol - self.ipc_tol_RMS)/2
+
+    def __add__(self, other):
+        if type(other) in [int, float]:
+            return TolerancedSizeArray(minimum = self.minimum + other, maximum = self.maximum + other)
+
+        result = TolerancedSizeArray(minimum = self.minimum + other.minimum, maximum = self.maximum + other.maximum)
+        result.updateRMS([self.ipc_tol_RMS, other.ipc_tol_RMS])
+        return result
+
+    def __sub__(self, other):
+        if type(other) in [int, float]:
+            return TolerancedSizeArray(minimum = self.minimum - other, maximum = self.maximum - other)
+
+        result = TolerancedSizeArray(minimum = self.minimum - other.maximum, maximum = self.maximum - other.minimum)
+        result.updateRMS([self.ipc_tol_RMS, other.ipc_tol_RMS])
+        return result
+
+    def __mul__(self, other):
+        if type(other) not in [int, float]:
+            raise NotImplementedError("Only multiplication with int and float is implemented right now.")
+        result = TolerancedSizeArray(minimum = self.minimum*other, maximum = self.maximum*other)
+        result.updateRMS([self.ipc_tol_RMS*math.sqrt(other)])
+        return result
+
+def _round_to_base_array(value, base):
+    # round() returns an int, which has no negative zero
+    return (numpy.rint(value/base) + 0.0) * base
+
+def _column(sizes):
+    return TolerancedSizeArray.fromSizes(sizes) if sizes is not None else None
+
+def _row(sizes, i):
+    return sizes[i] if sizes is not None else None
+
+def _ipc_table_result(ipc_spec, densities, manf_tol, S, lead_outside, lead_width, heel_reduction):
+    # all densities are calculated at once, with one row per density
+    F = manf_tol.get('manufacturing_tolerance', 0.1)
+    P = manf_tol.get('placement_tolerance', 0.05)
+
+    toe = numpy.array([[ipc_spec[density]['toe']] for density in densities], dtype=float)
+    heel = numpy.array([[ipc_spec[density]['heel']] for density in densities], dtype=float)
+    side = numpy.array([[ipc_spec[density]['side']] for density in densities], dtype=float)
+    if heel_reduction is None:
+        Gmin = S.maximum_RMS - 2*heel - numpy.sqrt(S.ipc_tol_RMS**2 + F**2 + P**2)
+    else:
+        if type(heel_reduction) not in [int, float]:
+            heel_reduction = numpy.array(heel_reduction, dtype=float)
+        Gmin = S.maximum_RMS - 2*heel + 2*heel_reduction - numpy.sqrt(S.ipc_tol_RMS**2 + F**2 + P**2)
+
+    Zmax = lead_outside.minimum_RMS + 2*toe + numpy.sqrt(lead_outside.ipc_tol_RMS**2 + F**2 + P**2)
+    Xmax = lead_width.minimum_RMS + 2*side + numpy.sqrt(lead_width.ipc_tol_RMS**2 + F**2 + P**2)
+
+    round_base = ipc_spec['round_base']
+    Zmax = _round_to_base_array(Zmax, round_base['toe'])
+    Gmin = _round_to_base_array(Gmin, round_base['heel'])
+    Xmax = _round_to_base_array(Xmax, round_base['side'])
+
+    return {density: (Gmin[i].tolist(), Zmax[i].tolist(), Xmax[i].tolist()) for i, density in enumerate(densities)}
+
+def _ipc_scalar_table(function, ipc_spec, densities, rows):
+    # fallback without numpy, rows is a list of keyword arguments for function
+    result = {}
+    for density in densities:
+        values = [function(ipc_spec[density], ipc_spec['round_base'], **row) for row in rows]
+        result[density] = tuple(list(column) for column in zip(*values)) if values else ([], [], [])
+    return result
+
+def _heel_reduction_row(heel_reduction, i):
+    return heel_reduction if type(heel_reduction) in [int, float] else heel_reduction[i]
+
+def ipc_gull_wing_table(ipc_spec, manf_tol, lead_width, lead_outside,
+        lead_len=None, lead_inside=None, heel_reduction=0, densities=IPC_DENSITIES):
+    if lead_inside is None and lead_len is None:
+        raise KeyError("either lead inside distance or lead lenght must be given")
+
+    if not NUMPY_AVAILABLE:
+        rows = [dict(manf_tol=manf_tol, lead_width=lead_width[i], lead_outside=lead_outside[i],
+                     lead_len=_row(lead_len, i), lead_inside=_row(lead_inside, i),
+                     heel_reduction=_heel_reduction_row(heel_reduction, i))
+                for i in range(len(lead_width))]
+        return _ipc_scalar_table(ipc_gull_wing, ipc_spec, densities, rows)
+
+    lead_outside = _column(lead_outside)
+    if lead_inside is not None:
+        S = _column(lead_inside)
+    else:
+        S = lead_outside - _column(lead_len)*2
+
+    return _ipc_table_result(ipc_spec, densities, manf_tol, S, lead_outside, _column(lead_width), heel_reduction)
+
+def ipc_body_edge_inside_table(ipc_spec, manf_tol, body_size, lead_width,
+        lead_len=None, lead_inside=None, heel_reduction=0, densities=IPC_DENSITIES):
+    pull_back = [TolerancedSize(nominal=0)] * len(body_size)
+
+    return ipc_body_edge_inside_pull_back_table(
+                ipc_spec, manf_tol, body_size, lead_width,
+                lead_len=lead_len, lead_inside=lead_inside, pull_back=pull_back,
+                heel_reduction=heel_reduction, densities=densities
+                )
+
+def ipc_body_edge_inside_pull_back_table(ipc_spec, manf_tol, body_size, lead_width,
+        lead_len=None, lead_inside=None, body_to_inside_lead_edge=None, pull_back=None, lead_outside=None,
+        heel_reduction=0, densities=IPC_DENSITIES):
+    if lead_outside is None and pull_back is None:
+        raise KeyError("Either lead outside or pull back distance must be given")
+    if lead_inside is None and lead_len is None and body_to_inside_lead_edge is None:
+        raise KeyError("either lead inside distance, lead to body edge or lead lenght must be given")
+
+    if not NUMPY_AVAILABLE:
+        rows = [dict(manf_tol=manf_tol, body_size=body_size[i], lead_width=lead_width[i],
+                     lead_len=_row(lead_len, i), lead_inside=_row(lead_inside, i),
+                     body_to_inside_lead_edge=_row(body_to_inside_lead_edge, i), pull_back=_row(pull_back, i),
+                     lead_outside=_row(lead_outside, i), heel_reduction=_heel_reduction_row(heel_reduction, i))
+                for i in range(len(lead_width))]
+        return _ipc_scalar_table(ipc_body_edge_inside_pull_back, ipc_spec, densities, rows)
+
+    body_size = _column(body_size)
+    if lead_outside is None:
+        lead_outside = body_size - _column(pull_back)*2
+    else:
+        lead_outside = _column(lead_outside)
+
+    if lead_inside is not None:
+        S = _column(lead_inside)
+    elif lead_len is not None:
+        S = lead_outside - _column(lead_len)*2
+    else:
+        S = body_size - _column(body_to_inside_lead_edge)*2
+
+    return _ipc_table_result(ipc_spec, densities, manf_tol, S, lead_outside, _column(lead_width), heel_reduction)
+
+def ipc_pad_center_plus_size_table(ipc_spec, manf_tol, center_position, lead_length, lead_width,
+        densities=IPC_DENSITIES):
+    if not NUMPY_AVAILABLE:
+        rows = [dict(manf_tol=manf_tol, center_position=center_position[i], lead_length=lead_length[i],
+                     lead_width=lead_width[i])
+                for i in range(len(lead_width))]
+        return _ipc_scalar_table(ipc_pad_center_plus_size, ipc_spec, densities, rows)
+
+    center_position = _column(center_position)
+    lead_length = _column(lead_length)
+
+    S = center_position*2 - lead_length
+    lead_outside = center_position*2 + lead_length
+
+    return _ipc_table_result(ipc_spec, densities, manf_tol, S, lead_outside, _column(lead_width), None)
@@ -35,6 +35,12 @@ setup(
     },
     packages=find_packages('.', exclude=["*tests*", "*examples*"]),
     test_suite='tests',
+    entry_points={
+        'console_scripts': [
+            'kicadmodtree-build = KicadModTree.LibraryBuilder:main',
+            'kicadmodtree-diff = KicadModTree.LibraryDiff:main',
+        ],
+    },
 
     classifiers=[
         'Development Status :: 5 - Production/Stable',